@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Měření paměti entit - kolik paměti zůstává alokováno na jednu entitu po extrakci údajů (get_data) a jaká je
+špička alokované paměti při extrakci (tracemalloc), pro jednotlivé typy entit.
+
+Poznámky:
+- spouštět z kořenového adresáře projektu: python3 -m benchmarks.entity_memory DUMP [POČET_OPAKOVÁNÍ]
+- stránky dumpu jsou určeny funkcí ent_registry.classify; každá stránka entity je zpracována POČET_OPAKOVÁNÍ krát
+  (výchozí 50), entity jsou drženy v paměti až do konce měření
+- první průchod se neměří (kompilace regulárních výrazů, naplnění mezipamětí LRUCache apod.)
+"""
+
+import gc
+import io
+import sys
+import tracemalloc
+from collections import defaultdict
+from contextlib import redirect_stderr
+
+from ent_person import EntPerson
+from ent_registry import classify
+from libs.PageReader import PageReader
+from wiki_cs_extract import PERSON_INFOBOXES_FILE
+
+
+def load_pages(dump_fpath):
+    pages = []
+    for page in PageReader(dump_fpath, namespaces={0}, skip_redirects=True):
+        classified = classify(page.title, page.text or "")
+        if classified:
+            pages.append((classified, page.title, page.text))
+    return pages
+
+
+def build(pages, repeat):
+    entities = []
+    for (ent_type, _, id_subtype), title, content in pages * repeat:
+        entity = ent_type.ent_class(title, ent_type.name, "", [], dict())
+        if ent_type.subtyped:
+            entity.set_entity_subtype(id_subtype)
+        entity.get_data(content)
+        entities.append(entity)
+    return entities
+
+
+def measure(pages, repeat):
+    gc.collect()
+    tracemalloc.start()
+    entities = build(pages, repeat)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return entities, retained, peak
+
+
+if __name__ == "__main__":
+    dump_fpath = sys.argv[1]
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    EntPerson.load_infobox_types(PERSON_INFOBOXES_FILE)
+    with redirect_stderr(io.StringIO()):
+        pages_by_type = defaultdict(list)
+        for page in load_pages(dump_fpath):
+            pages_by_type[page[0][0].name].append(page)
+
+        results = []
+        for name, pages in sorted(pages_by_type.items()):
+            build(pages, 1)
+            entities, retained, peak = measure(pages, repeat)
+            results.append((name, len(entities), retained, peak, hasattr(entities[0], "__dict__")))
+            del entities
+
+    for name, n_entities, retained, peak, has_dict in results:
+        print(
+            "{}: {} entities, retained {:.0f} B/entity, peak {:.0f} B/entity, instance __dict__: {}".format(
+                name, n_entities, retained / n_entities, peak / n_entities, has_dict
+            )
+        )
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Měření paměťových alokací určení typu a extrakce údajů podle typů entit - špička alokované paměti (tracemalloc)
+v násobcích velikosti stránky, tj. kolik kopií stránky je drženo současně nad rámec samotné stránky
+(předzpracování obsahu - EntCore.data_preprocess, úpravy obsahu při určení typu apod.).
+
+Poznámky:
+- spouštět z kořenového adresáře projektu:
+  python3 -m benchmarks.preprocess_allocations DUMP [POČET_STRÁNEK] [MINIMÁLNÍ_VELIKOST_STRÁNKY]
+- měří se jen stránky o velikosti alespoň MINIMÁLNÍ_VELIKOST_STRÁNKY bajtů (výchozí 10000), nejvýše POČET_STRÁNEK
+  (výchozí 1000) stránek
+- první volání se neměří (kompilace regulárních výrazů apod.)
+"""
+
+import io
+import sys
+import tracemalloc
+from collections import defaultdict
+from contextlib import redirect_stderr
+
+from ent_person import EntPerson
+from ent_registry import classify
+from libs.PageReader import PageReader
+from wiki_cs_extract import PERSON_INFOBOXES_FILE
+
+
+def measure(func, *args):
+    func(*args)
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def extract(ent_type, id_level, id_subtype, title, content):
+    entity = ent_type.ent_class(title, ent_type.name, "", [], dict())
+    if ent_type.subtyped:
+        entity.set_entity_subtype(id_subtype)
+    entity.get_data(content)
+
+
+if __name__ == "__main__":
+    dump_fpath = sys.argv[1]
+    n_pages = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    min_size = int(sys.argv[3]) if len(sys.argv) > 3 else 10000
+
+    EntPerson.load_infobox_types(PERSON_INFOBOXES_FILE)
+    # počet stránek, součty špiček určení typu a extrakce (v násobcích velikosti stránky)
+    stats = defaultdict(lambda: [0, 0.0, 0.0])
+    n_processed = 0
+    for page in PageReader(dump_fpath, namespaces={0}, skip_redirects=True):
+        page_size = len(page.text.encode("utf-8")) if page.text else 0
+        if page_size < min_size:
+            continue
+        with redirect_stderr(io.StringIO()):
+            classified, peak_classify = measure(classify, page.title, page.text)
+            peak_extract = 0
+            if classified:
+                _, peak_extract = measure(extract, *classified, page.title, page.text)
+        type_stats = stats[classified[0].name if classified else "(none)"]
+        type_stats[0] += 1
+        type_stats[1] += peak_classify / page_size
+        type_stats[2] += peak_extract / page_size
+        n_processed += 1
+        if n_processed >= n_pages:
+            break
+
+    for name, (n_type_pages, sum_classify, sum_extract) in sorted(stats.items()):
+        print(
+            "{}: {} pages, allocation peak of classification {:.2f}, of extraction {:.2f} x page size".format(
+                name, n_type_pages, sum_classify / n_type_pages, sum_extract / n_type_pages
+            )
+        )
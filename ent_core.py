@@ -13,15 +13,15 @@ Soubor obsahuje třídu 'EntCore', jež je rodičovskou třídou pro podtřídy
 
 import re
 import regex
-import requests
 import sys
 from abc import ABCMeta, abstractmethod
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 from hashlib import md5, sha224
 from libs.DictOfUniqueDict import *
+from libs.LRUCache import lru_cache
 from libs.UniqueDict import KEY_LANG, LANG_ORIG, LANG_UNKNOWN
-from typing import Optional
+from typing import Optional, Tuple
 
 
 TAG_BRACES_OPENING = "{{"
@@ -33,14 +33,9 @@ ALIASES_SEPARATOR = re.escape(", ")
 DASHES = "-–—­"
 RE_DASHES_VARIANTS = r"[%s]" % regex.escape(DASHES)
 
-WIKI_API_URL = "https://cs.wikipedia.org/w/api.php"
-WIKI_API_PARAMS_BASE = {
-    "action": "query",
-    "format": "json",
-}
-WIKI_API_ATTEMPTS = 10
-WIKI_API_DELAY_MIN = 1
-WIKI_API_DELAY_MAX = 2
+# origin of extracted values (phase of page processing) - used for inconsistence reports
+ORIGIN_INFOBOX = "infobox"
+ORIGIN_SENTENCE = "sentence"
 
 
 class EntCore(metaclass=ABCMeta):
@@ -54,17 +49,43 @@ class EntCore(metaclass=ABCMeta):
     link - odkaz na Wikipedii (str)
     aliases - alternativní pojmenování entity (str)
     description - stručný popis entity (str)
-    images - absolutní cesty k obrázkům Wikimedia Commons (str)
+    images - absolutní cesty k obrázkům Wikimedia Commons (list)
+    origin - původ právě získávaných údajů, tj. fáze zpracování stránky (infobox / první věta) (str)
 
     Třídní atributy:
     counter - počítadlo instanciovaných objektů z odvozených tříd
+    PREPROCESS_STEPS - kroky předzpracování obsahu stránky (funkce str -> str) uplatňované v data_preprocess
 
     Metody:
     del_redundant_text(text) - odstraňuje přebytečné části textu, ale pouze ty, které jsou společné pro všechny získávané údaje
     get_image(image) - převádí název obrázku na absolutní cestu Wikimedia Commons
     """
 
+    __slots__ = (
+        "original_title",
+        "title",
+        "prefix",
+        "eid",
+        "link",
+        "aliases",
+        "aliases_infobox",
+        "aliases_infobox_cz",
+        "aliases_infobox_orig",
+        "description",
+        "images",
+        "n_marked_czech",
+        "first_alias",
+        "redirects",
+        "langmap",
+        "infobox_type",
+        "re_infobox_kw_img",
+        "latitude",
+        "longitude",
+        "origin",
+    )
+
     counter = 0
+    PREPROCESS_STEPS = ()
     KEY_NAMETYPE = "ntype"
     LANG_CZECH = "cs"
     NTYPE_QUOTED = "quoted"
@@ -97,7 +118,7 @@ class EntCore(metaclass=ABCMeta):
         self.aliases_infobox_cz = DictOfUniqueDict()
         self.aliases_infobox_orig = DictOfUniqueDict()
         self.description = ""
-        self.images = ""
+        self.images = []
         self.n_marked_czech = 0
         self.first_alias = None
         self.redirects = redirects
@@ -106,61 +127,7 @@ class EntCore(metaclass=ABCMeta):
         self.re_infobox_kw_img = r"obrázek"
         self.latitude = ""
         self.longitude = ""
-
-    def get_wiki_api_location(self, title):
-        from getpass import getuser
-        from random import uniform
-        from time import sleep
-
-        self.latitude = ""
-        self.longitude = ""
-
-        resp = None
-        wiki_api_params = WIKI_API_PARAMS_BASE.copy()
-        wiki_api_params["prop"] = "coordinates"
-        wiki_api_params["titles"] = title
-        wiki_api_headers = {}
-        mail = ""
-        user = getuser()
-        if user != "root":
-            mail = user + "@" + ("stud." if user[0] == "x" and len(user) == 8 else "") + "fit.vut.cz"
-        if mail != "":
-            mail = f"; {mail}"
-        wiki_api_headers["user-agent"] = f"KNOT FIT BUT/0.0 (http://knot.fit.vut.cz{mail})"
-        connection_attempts = 0
-        try:
-            while True:
-                try:
-                    connection_attempts += 1
-                    if connection_attempts > WIKI_API_ATTEMPTS:
-                        print(f"[{datetime.now()}] API connection failed (reached maximum connection attempts) for page \"{title}\"", file=sys.stderr, flush=True)
-                        return
-                    resp = requests.get(WIKI_API_URL, headers=wiki_api_headers, params=wiki_api_params)
-                except requests.exceptions.ConnectionError as e:
-                    delay = uniform(connection_attempts * WIKI_API_DELAY_MIN, connection_attempts * WIKI_API_DELAY_MAX)
-                    print(f"[{datetime.now()}] API error for attempt no. {connection_attempts} of page \"{title}\": {e} ({resp.url}; headers: {wiki_api_headers}) - waiting {delay} seconds for next attempt.", file=sys.stderr, flush=True)
-                    sleep(delay)
-                if resp and resp.status_code == 200:
-                    print(f"[{datetime.now()}] API success for attempt no. {connection_attempts} of page \"{title}\": {resp.json()}.", file=sys.stderr, flush=True)
-                    break
-                elif resp.status_code == 429:
-                    delay = uniform(connection_attempts * WIKI_API_DELAY_MIN, connection_attempts * WIKI_API_DELAY_MAX)
-                    print(f"[{datetime.now()}] API error TOO MANY REQUESTS for attempt no. {connection_attempts} of page \"{title}\" - waiting {delay} seconds for next attempt.", file=sys.stderr, flush=True)
-                    sleep(delay)
-                else:
-                    delay = uniform(connection_attempts * WIKI_API_DELAY_MIN, connection_attempts * WIKI_API_DELAY_MAX)
-                    print(f"[{datetime.now()}] API error for attempt no. {connection_attempts} of page \"{title}\": {resp.status_code} - {resp.text.strip()} ({resp.url}; headers: {wiki_api_headers}) - waiting {delay} seconds for next attempt.", file=sys.stderr, flush=True)
-                    sleep(delay)
-            pages = resp.json()["query"]["pages"]
-            first_page = next(iter(pages))
-            if first_page != "-1" and "coordinates" in pages[first_page]:
-                self.latitude = self._unify_lat_long(latlong=pages[first_page]["coordinates"][0]["lat"])
-                self.longitude = self._unify_lat_long(latlong=pages[first_page]["coordinates"][0]["lon"])
-        except Exception as e:
-            resp_detail = ""
-            if resp:
-                resp_detail = f"([{resp.status_code}]: {resp.json()})"
-            print(f"[{datetime.now()}] API Error: Coordinates for \"{title}\" could not be found due to error: {e}. {resp_detail}", file=sys.stderr, flush=True)
+        self.origin = ""
 
     def get_latitude(self, latitude):
         """
@@ -219,13 +186,30 @@ class EntCore(metaclass=ABCMeta):
         #        if clear_name_links:
         #            clean_text = re.sub(r"(|\s*.*?název\s*=\s*(?!=)\s*.*?)\[\[[^\]]+\]\]", r"\1", text).strip() # odkaz v názvu zřejmě vede na jinou entitu (u jmen často odkazem napsán jazyk názvu)
         #        else:
-        link_lang = re.search(r"\[\[(.*?)(?:\|.*?)?\]\]\s*(<br(?: ?/)?>)?", text)
-        if link_lang and link_lang.group(1):
-            txt_lang = link_lang.group(1).lower()
-            if txt_lang in langmap:
-                text = text.replace(
-                    link_lang.group(0), "{{{{Vjazyce|{}}}}} ".format(langmap[txt_lang])
-                )
+        if langmap:
+            link_lang = re.search(r"\[\[(.*?)(?:\|.*?)?\]\]\s*(<br(?: ?/)?>)?", text)
+            if link_lang and link_lang.group(1):
+                txt_lang = link_lang.group(1).lower()
+                if txt_lang in langmap:
+                    text = text.replace(
+                        link_lang.group(0), "{{{{Vjazyce|{}}}}} ".format(langmap[txt_lang])
+                    )
+
+        return EntCore._clean_redundant_text(text, multiple_separator)
+
+    @staticmethod
+    @lru_cache
+    def _clean_redundant_text(text, multiple_separator):
+        """
+        Odstraňuje wiki formátování společné pro všechny získávané údaje (část del_redundant_text nezávislá na mapě jazyků).
+
+        Parametry:
+        text - text, který má být upraven (str)
+        multiple_separator - znak oddělující více řádků (str)
+
+        Návratová hodnota:
+        Upravený text. (str)
+        """
         clean_text = re.sub(
             r"\[\[[^\]|]+\|([^\]|]+)\]\]", r"\1", text
         )  # [[Sth (sth)|Sth]] -> Sth
@@ -257,15 +241,17 @@ class EntCore(metaclass=ABCMeta):
 
         return clean_text
 
-    def get_data(self, content):
+    def get_data(self, content, first_sentence=True):
         """
         Extract data of entity from the content of page.
 
         Parameters:
         * content - content of the page (str)
+        * first_sentence - process first sentence of the page (bool; disabled in degraded mode of page processing)
         """
 
-        self.data_preprocess(content)
+        self.origin = ""
+        content = self.data_preprocess(content)
 
         try:
             data = content.splitlines()
@@ -369,6 +355,7 @@ class EntCore(metaclass=ABCMeta):
                     if not was_infobox:
                         # If line belongs to infobox and infobox was already not present and is not UNESCO infobox, process it
                         if not is_infobox_unesco:
+                            self.origin = ORIGIN_INFOBOX
                             self.line_process_infobox(part_infobox, is_infobox_block)
                             if infobox_braces_depth == 0:
                                 was_infobox = True
@@ -388,9 +375,12 @@ class EntCore(metaclass=ABCMeta):
                                             ] = LANG_ORIG
                         is_infobox_block = None
 
-                if part_text:
+                if part_text and first_sentence:
+                    self.origin = ORIGIN_SENTENCE
                     self.line_process_1st_sentence(part_text)
 
+            self.origin = ""
+
             try:
                 self.latitude = str(self.latitude)
                 self.longitude = str(self.longitude)
@@ -415,11 +405,17 @@ class EntCore(metaclass=ABCMeta):
     def data_preprocess(self, content):
         """
         Entity data preprocessing - method designed for override in child method (not designed as abstract!!)
+        Applies PREPROCESS_STEPS of the entity class; overriding methods return the result of this one.
 
         Parameters:
         * content - content of page (str)
+
+        Returns:
+        * content of page used for data extraction (str)
         """
-        return
+        for step in self.PREPROCESS_STEPS:
+            content = step(content)
+        return content
 
     def line_process_infobox(self, line, is_infobox_bloxk):
         """
@@ -561,15 +557,13 @@ class EntCore(metaclass=ABCMeta):
             for av in self.unfold_alias_variants(a):
                 if re.search(r"[^\W_/]", av):
                     if marked_czech:
-                        result.update(
-                            self.scrape_quoted_inside(av, nametype, self.LANG_CZECH)
-                        )
+                        self.scrape_quoted_inside(av, nametype, self.LANG_CZECH, result)
                         self.n_marked_czech += 1
 
                     else:
                         if self.first_alias is None and nametype is None:
                             self.first_alias = av
-                        result.update(self.scrape_quoted_inside(av, nametype))
+                        self.scrape_quoted_inside(av, nametype, result=result)
 
         for lng, a in lang_aliases:
             a = a.strip()
@@ -578,12 +572,22 @@ class EntCore(metaclass=ABCMeta):
                 if re.search(r"[^\W_]", av):
                     if not len(self.aliases):
                         self.first_alias = av
-                    result.update(self.scrape_quoted_inside(av, nametype, lng))
+                    self.scrape_quoted_inside(av, nametype, lng, result)
 
         return result
 
-    def scrape_quoted_inside(self, alias, nametype, lang=None):
-        result = DictOfUniqueDict()
+    def scrape_quoted_inside(self, alias, nametype, lang=None, result=None):
+        """
+        Adds alias (and names quoted inside it) into aliases.
+
+        Parameters:
+        * alias - alternative name of entity (str)
+        * nametype - type of name (str)
+        * lang - language of name (str)
+        * result - aliases to be filled in place; new ones are created if not given (DictOfUniqueDict)
+        """
+        if result is None:
+            result = DictOfUniqueDict()
 
         if not alias.startswith('"') or not alias.endswith('"'):
             result[alias] = self.get_alias_properties(nametype, lang)
@@ -666,6 +670,12 @@ class EntCore(metaclass=ABCMeta):
 
         return "|".join(preserialized)
 
+    def serialize_images(self):
+        """
+        Serialized images to be written while creating KB
+        """
+        return "|".join(self.images)
+
     def process_and_clean_common_images(self, line):
         """
         Process common image, transform it to Wikimedia Commons absolute path and return the rest of line without this common image
@@ -704,7 +714,7 @@ class EntCore(metaclass=ABCMeta):
         image_hash = md5(image.encode("utf-8")).hexdigest()[:2]
         image = "wikimedia/commons/" + image_hash[0] + "/" + image_hash + "/" + image
 
-        self.images += image if not self.images else "|" + image
+        self.images.append(image)
 
         # starý způsob extrakce - prozatím nemazat
         # try:
@@ -725,7 +735,13 @@ class EntCore(metaclass=ABCMeta):
         #         self.images += full_path if not self.images else "|" + full_path
 
     def _extract_lat_long_value(self, latlong: str) -> str:
-        original = latlong
+        tmp, unified = self._convert_lat_long(latlong)
+        print(f"LATLONG: orig=\"{latlong}\" -> extracted=\"{tmp}\" -> unified=\"{unified}\"", file=sys.stderr, flush=True)
+        return unified
+
+    @staticmethod
+    @lru_cache
+    def _convert_lat_long(latlong: str) -> Tuple[str, str]:
         latlong = re.sub(r"\(.*?\)", "", latlong)
         latlong = re.sub(r"\[.*?\]", "", latlong)
         latlong = re.sub(r"<.*?>", "", latlong)
@@ -734,10 +750,9 @@ class EntCore(metaclass=ABCMeta):
         latlong = re.sub(r"(?<=\d),(?=\d)", ".", latlong)
         latlong = re.sub(r"^[^\d-]*(?=\d)", "", latlong)
         latlong = re.sub(r"^(\d+(?:\.\d+)?)[^\d\.]+.*$", r"\1", latlong)
-        tmp=latlong
-        latlong = self._unify_lat_long(latlong=latlong)
-        print(f"LATLONG: orig=\"{original}\" -> extracted=\"{tmp}\" -> unified=\"{latlong}\"", file=sys.stderr, flush=True)
-        return "" if not re.search(r"\d", latlong) else latlong
+        tmp = latlong
+        latlong = EntCore._unify_lat_long(latlong=latlong)
+        return tmp, "" if not re.search(r"\d", latlong) else latlong
 
     @staticmethod
     def _are_equal_in_same_decimals(less_decimals: str, more_decimals: str) -> bool:
@@ -752,33 +767,51 @@ class EntCore(metaclass=ABCMeta):
         return latlong
 
     def _check_inconsistence(self, column: str, old: str, new: str, except_contain: bool = False) -> None:
-        from inspect import stack
-        from re import match
-        from sys import stderr
-
         if old == new:
             return
 
-        origin = ""
+        origin = f" (new value came from {self.origin})" if self.origin else ""
+
+        self.report_inconsistence(self.original_title, self.prefix, column, old, new, except_contain, origin)
+
+    @classmethod
+    def report_inconsistence(
+        cls,
+        original_title: str,
+        prefix: str,
+        column: str,
+        old: str,
+        new: str,
+        except_contain: bool = False,
+        origin: str = "",
+    ) -> None:
+        """
+        Vypíše nekonzistenci staré (ponechané) a nové hodnoty položky entity (viz _check_inconsistence).
 
-        try:
-            caller = stack()[2][3]
-            matches = match(r"(?:get_first|line_process)_(.*)", caller)
-            if matches:
-                origin = f" (new value came from {matches.group(1)})"
-        except IndexError:
-            ...
+        Parametry:
+        original_title - původní název stránky entity (str)
+        prefix - prefix (typ) entity (str)
+        column - název položky (str)
+        old - stará (ponechaná) hodnota (str)
+        new - nová hodnota (str)
+        except_contain - nová hodnota obsažená ve staré (či naopak) není chybou (bool)
+        origin - popis původu nové hodnoty (str)
+        """
+        from sys import stderr
+
+        if old == new:
+            return
 
         if column in {"LATITUDE", "LONGITUDE"}:
             try:
-                if len(new) < len(old) and self._are_equal_in_same_decimals(less_decimals=new, more_decimals=old):
-                    print(f'[INCONSISTENCE CHECK] Info: New value="{new}" is rounded value of old value="{old}" for item "{column}" of "{self.original_title}" (of type "{self.prefix}") {origin}', file=sys.stderr, flush=True)
+                if len(new) < len(old) and cls._are_equal_in_same_decimals(less_decimals=new, more_decimals=old):
+                    print(f'[INCONSISTENCE CHECK] Info: New value="{new}" is rounded value of old value="{old}" for item "{column}" of "{original_title}" (of type "{prefix}") {origin}', file=sys.stderr, flush=True)
                     return
-                elif len(old) < len(new) and self._are_equal_in_same_decimals(less_decimals=old, more_decimals=new):
-                    print(f'[INCONSISTENCE CHECK] Warning: New value="{new}" (more accurate) maybe should be in KB for item "{column}" of "{self.original_title}" (of type "{self.prefix}")? Old value="{old}" (which is less accure) remains in KB.{origin}', file=sys.stderr, flush=True)
+                elif len(old) < len(new) and cls._are_equal_in_same_decimals(less_decimals=old, more_decimals=new):
+                    print(f'[INCONSISTENCE CHECK] Warning: New value="{new}" (more accurate) maybe should be in KB for item "{column}" of "{original_title}" (of type "{prefix}")? Old value="{old}" (which is less accure) remains in KB.{origin}', file=sys.stderr, flush=True)
                     return
             except (InvalidOperation, ValueError) as e:
-                print(f'Some problems with Decimals in entity "{self.original_title}" (new={new}; old={old}): {str(e)}', file=sys.stderr, flush=True)
+                print(f'Some problems with Decimals in entity "{original_title}" (new={new}; old={old}): {str(e)}', file=sys.stderr, flush=True)
 
         if except_contain:
             re_contain_before = r""
@@ -787,25 +820,25 @@ class EntCore(metaclass=ABCMeta):
                 re_contain_before = r"([,-]\s*)?"
                 re_contain_after = r"(\s*[,-])?"
             if len(new) < len(old):
-                if self._is_contained(
+                if cls._is_contained(
                     pattern=new,
                     text=old,
                     re_contain_before=re_contain_before,
                     re_contain_after=re_contain_after,
                 ):
-                    print(f'[INCONSISTENCE CHECK] Info: New value="{new}" is contained in old value="{old}" for item "{column}" of "{self.original_title}" (of type "{self.prefix}") {origin}', file=stderr, flush=True)
+                    print(f'[INCONSISTENCE CHECK] Info: New value="{new}" is contained in old value="{old}" for item "{column}" of "{original_title}" (of type "{prefix}") {origin}', file=stderr, flush=True)
                     return
             else:
-                if self._is_contained(
+                if cls._is_contained(
                     pattern=old,
                     text=new,
                     re_contain_before=re_contain_before,
                     re_contain_after=re_contain_after,
                 ):
-                    print(f'[INCONSISTENCE CHECK] Warning: New value="{new}" maybe should be in KB for item "{column}" of "{self.original_title}" (of type "{self.prefix}")? Old value="{old}" remains in KB.{origin}', file=stderr, flush=True)
+                    print(f'[INCONSISTENCE CHECK] Warning: New value="{new}" maybe should be in KB for item "{column}" of "{original_title}" (of type "{prefix}")? Old value="{old}" remains in KB.{origin}', file=stderr, flush=True)
                     return
 
-        print(f'[INCONSISTENCE CHECK] Error: Inconsistence found for "{self.original_title}" (of type "{self.prefix}") in item "{column}": old="{old}" vs. new="{new}"{origin}', file=stderr, flush=True)
+        print(f'[INCONSISTENCE CHECK] Error: Inconsistence found for "{original_title}" (of type "{prefix}") in item "{column}": old="{old}" vs. new="{new}"{origin}', file=stderr, flush=True)
 
     @staticmethod
     def _is_contained(
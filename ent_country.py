@@ -18,6 +18,7 @@ Infobox stát USA
 
 import re
 from ent_core import EntCore
+from libs.QuantityParser import QuantityParser
 
 
 class EntCountry(EntCore):
@@ -31,12 +32,18 @@ class EntCountry(EntCore):
     link - odkaz na Wikipedii (str)
     aliases - alternativní pojmenování státu (str)
     description - stručný popis státu (str)
-    images - absolutní cesty k obrázkům Wikimedia Commons (str)
+    images - absolutní cesty k obrázkům Wikimedia Commons (list)
 
     area - rozloha státu v kilometrech čtverečních (str)
     population - počet obyvatel státu (str)
     """
 
+    __slots__ = (
+        "area",
+        "population",
+        "lang_orig",
+    )
+
     def __init__(self, title, prefix, link, redirects, langmap):
         """
         Inicializuje třídu 'EntCountry'.
@@ -55,8 +62,6 @@ class EntCountry(EntCore):
 
         self.re_infobox_kw_img = r"(?:vlajka|znak|mapa[\s_]umístění)"
 
-        self.get_wiki_api_location(title)
-
     @staticmethod
     def is_country(content):
         """
@@ -110,6 +115,8 @@ class EntCountry(EntCore):
         ):
             self.prefix = "country:former"
 
+        return super().data_preprocess(content)
+
     def line_process_infobox(self, ln, is_infobox_block):
         # aliases - czech name is preferable
         rexp = re.search(r"název[\s_]česky\s*=(?!=)\s*(.*)", ln, re.I)
@@ -269,17 +276,7 @@ class EntCountry(EntCore):
         Parametry:
         area - rozloha státu (str)
         """
-        area = re.sub(r"\(.*?\)", "", area)
-        area = re.sub(r"\[.*?\]", "", area)
-        area = re.sub(r"<.*?>", "", area)
-        area = re.sub(r"{{.*?}}", "", area).replace("{", "").replace("}", "")
-        area = re.sub(r"(?<=\d)\s(?=\d)", "", area).strip()
-        area = re.sub(r"(?<=\d)\.(?=\d)", ",", area)
-        area = re.sub(r"^\D*(?=\d)", "", area)
-        area = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", area)
-        area = "" if not re.search(r"\d", area) else area
-
-        self.area = area
+        self.area = QuantityParser.parse_decimal(area).text
 
     def get_first_sentence(self, fs):
         """
@@ -328,29 +325,7 @@ class EntCountry(EntCore):
         Parametry:
         population - počet obyvatel státu (str)
         """
-        coef = (
-            1000000
-            if re.search(r"mil\.|mili[oó]n", population, re.I)
-            else 1000
-            if re.search(r"tis\.|tis[ií]c", population, re.I)
-            else 0
-        )
-
-        population = re.sub(r"\(.*?\)", "", population)
-        population = re.sub(r"\[.*?\]", "", population)
-        population = re.sub(r"<.*?>", "", population)
-        population = (
-            re.sub(r"{{.*?}}", "", population).replace("{", "").replace("}", "")
-        )
-        population = re.sub(r"(?<=\d)[,.\s](?=\d)", "", population).strip()
-        population = re.sub(r"^\D*(?=\d)", "", population)
-        population = re.sub(r"^(\d+)\D.*$", r"\1", population)
-        population = "" if not re.search(r"\d", population) else population
-
-        if coef and population:
-            population = str(int(population) * coef)
-
-        self.population = population
+        self.population = QuantityParser.parse_count(population).text
 
     def serialize(self):
         """
@@ -366,7 +341,7 @@ class EntCountry(EntCore):
                 "|".join(self.redirects),
                 self.description,
                 self.original_title,
-                self.images,
+                self.serialize_images(),
                 self.link,
                 self.latitude,
                 self.longitude,
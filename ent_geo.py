@@ -16,6 +16,7 @@ TODO: odstavec "Název"
 import re
 import sys
 from ent_core import EntCore
+from libs.QuantityParser import QuantityParser
 
 
 class EntGeo(EntCore):
@@ -29,7 +30,7 @@ class EntGeo(EntCore):
     link - odkaz na Wikipedii (str)
     aliases - alternativní pojmenování geografické entity (str)
     description - stručný popis geografické entity (str)
-    images - absolutní cesty k obrázkům Wikimedia Commons (str)
+    images - absolutní cesty k obrázkům Wikimedia Commons (list)
 
     area - rozloha geografické entity v kilometrech čtverečních (str)
     continent - světadíl, na kterém geografická entita leží (str)
@@ -41,6 +42,18 @@ class EntGeo(EntCore):
     subtype - podtyp geografické entity (str)
     """
 
+    __slots__ = (
+        "area",
+        "continent",
+        "population",
+        "subtype",
+        "total_height",
+    )
+
+    # Šablona "světové dědictví" přináší do alternativních jmen spustu problémů - prozatím vyřešeno jinak v end_geo.del_redundant_text, protože jinak chybělo spoustu užitečných názvů
+    #        content = re.sub(r"(?sm)({{\s*Infobox\s*-\s*světové dědictví.*?)(?:|\s*název(?:[\s_]místním[\s_]jazykem)?\s*=(?!=)\s*)?(?:[^\n]*?\[[^\n]*?)(.*?^\s*}})", r"\1\2", content, re.I)
+    #        content = re.sub(r"(?sm)({{\s*Infobox\s*-\s*světové dědictví.*?)(?:|\s*jméno\s*=(?!=)\s*)?(?:[^\n]*?\[[^\n]*?)(.*?^\s*}})", r"\1\2", content, re.I)
+
     def __init__(self, title, prefix, link, redirects, langmap):
         """
         Inicializuje třídu 'EntGeo'.
@@ -64,8 +77,6 @@ class EntGeo(EntCore):
 
         self.re_infobox_kw_img = r"(?:obrázek|mapa)"
 
-        self.get_wiki_api_location(title)
-
     def set_entity_subtype(self, subtype):
         """
         Nastavuje podtyp geografické entity získaný z identifikace.
@@ -124,20 +135,6 @@ class EntGeo(EntCore):
 
         return 0, ""
 
-    def data_preprocess(self, content):
-        """
-        Předzpracování dat o geografické entitě.
-
-        Parametry:
-        content - obsah stránky (str)
-        """
-        content = content.replace("&nbsp;", " ")
-        content = re.sub(r"m\sn\.\s*", "metrů nad ", content)
-
-    # Šablona "světové dědictví" přináší do alternativních jmen spustu problémů - prozatím vyřešeno jinak v end_geo.del_redundant_text, protože jinak chybělo spoustu užitečných názvů
-    #        content = re.sub(r"(?sm)({{\s*Infobox\s*-\s*světové dědictví.*?)(?:|\s*název(?:[\s_]místním[\s_]jazykem)?\s*=(?!=)\s*)?(?:[^\n]*?\[[^\n]*?)(.*?^\s*}})", r"\1\2", content, re.I)
-    #        content = re.sub(r"(?sm)({{\s*Infobox\s*-\s*světové dědictví.*?)(?:|\s*jméno\s*=(?!=)\s*)?(?:[^\n]*?\[[^\n]*?)(.*?^\s*}})", r"\1\2", content, re.I)
-
     def line_process_infobox(self, ln, is_infobox_block):
         # aliasy
         rexp = re.search(r"(?:název|jméno)\s*=(?!=)\s*(.*)", ln, re.I)
@@ -276,27 +273,7 @@ class EntGeo(EntCore):
         Parametry:
         area - rozloha geografické entity v kilometrech čtverečních (str)
         """
-        is_ha = re.search(r"\d\s*(?:ha|hektar)", area, re.I)
-
-        area = re.sub(r"\(.*?\)", "", area)
-        area = re.sub(r"\[.*?\]", "", area)
-        area = re.sub(r"<.*?>", "", area)
-        area = re.sub(r"{{.*?}}", "", area).replace("{", "").replace("}", "")
-        area = re.sub(r"(?<=\d)\s(?=\d)", "", area).strip()
-        area = re.sub(r"(?<=\d)\.(?=\d)", ",", area)
-        area = re.sub(r"^\D*(?=\d)", "", area)
-        area = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", area)
-        area = "" if not re.search(r"\d", area) else area
-
-        if (
-            is_ha
-        ):  # je-li údaj uveden v hektarech, dojde k převodu na kilometry čtvereční
-            try:
-                area = str(float(area.replace(",", ".")) / 100).replace(".", ",")
-            except ValueError:
-                pass
-
-        self.area = area
+        self.area = QuantityParser.parse_decimal(area, hectares=True).text
 
     def get_continent(self, continent):
         """
@@ -344,35 +321,7 @@ class EntGeo(EntCore):
         Parametry:
         population - počet obyvatel, jenž žije na území geografické entity (str)
         """
-
-        coef = (
-            1000000
-            if re.search(r"mil\.|mili[oó]n", population, re.I)
-            else 1000
-            if re.search(r"tis\.|tis[ií]c", population, re.I)
-            else 0
-        )
-
-        population = re.sub(r"\(.*?\)", "", population)
-        population = re.sub(r"\[.*?\]", "", population)
-        population = re.sub(r"<.*?>", "", population)
-        population = (
-            re.sub(r"{{.*?}}", "", population).replace("{", "").replace("}", "")
-        )
-        population = re.sub(r"(?<=\d)[,.\s](?=\d)", "", population).strip()
-        population = re.sub(r"^\D*(?=\d)", "", population)
-        population = re.sub(r"^(\d+)\D.*$", r"\1", population)
-        population = (
-            "0"
-            if re.search(r"neobydlen|bez.+?obyvatel", population, re.I)
-            else population
-        )  # pouze v tomto souboru
-        population = "" if not re.search(r"\d", population) else population
-
-        if coef and population:
-            population = str(int(population) * coef)
-
-        self.population = population
+        self.population = QuantityParser.parse_count(population, uninhabited=True).text
 
     def get_total_height(self, height):
         """
@@ -381,17 +330,7 @@ class EntGeo(EntCore):
         Parametry:
         height - ceková výška vodopádu (str)
         """
-        height = re.sub(r"\(.*?\)", "", height)
-        height = re.sub(r"\[.*?\]", "", height)
-        height = re.sub(r"<.*?>", "", height)
-        height = re.sub(r"{{.*?}}", "", height).replace("{", "").replace("}", "")
-        height = re.sub(r"(?<=\d)\s(?=\d)", "", height).strip()
-        height = re.sub(r"(?<=\d)\.(?=\d)", ",", height)
-        height = re.sub(r"^\D*(?=\d)", "", height)
-        height = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", height)
-        height = "" if not re.search(r"\d", height) else height
-
-        self.total_height = height
+        self.total_height = QuantityParser.parse_decimal(height).text
 
     def serialize(self):
         """
@@ -405,7 +344,7 @@ class EntGeo(EntCore):
             "|".join(self.redirects),
             self.description,
             self.original_title,
-            self.images,
+            self.serialize_images(),
             self.link,
         ]
 
@@ -11,13 +11,47 @@ Popis souboru:
 Soubor obsahuje třídu 'EntPerson', která uchovává údaje o lidech.
 """
 
+import os
 import re
 import regex
 import sys
 from ent_core import EntCore
+from libs.DateParser import DateParser
+from libs.LRUCache import lru_cache
 from libs.natToKB import *
 from libs.UniqueDict import KEY_LANG, LANG_UNKNOWN
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+
+def _load_titles(fname: str) -> List[str]:
+    """
+    Načte regulární výrazy titulů z datového souboru ve složce libs.
+
+    Parametry:
+    fname - název datového souboru (str)
+
+    Návratové hodnoty:
+    Seznam regulárních výrazů titulů. (List[str])
+    """
+    with open(
+        os.path.join(os.path.dirname(__file__), "libs", fname), "r", encoding="utf-8"
+    ) as fl:
+        titles = [ln.split("#", 1)[0].strip() for ln in fl]
+    return [title for title in titles if title]
+
+
+def _compile_titles(titles: List[str]):
+    """
+    Sestaví vzor nahrazující oddělovač ", " svislítkem, ale jen tehdy, nenásleduje-li za ním titul.
+
+    Parametry:
+    titles - regulární výrazy titulů (List[str])
+    """
+    #                 v---- need to be space without asterisk - with asterisk the comma will be replaced
+    return re.compile(
+        r", (?!(" + "|".join(titles) + r")(\.|,| |$))",
+        flags=re.I,
+    )
 
 
 class EntPerson(EntCore):
@@ -31,7 +65,7 @@ class EntPerson(EntCore):
     link - odkaz na Wikipedii (str)
     aliases - alternativní jména osoby (str)
     description - stručný popis osoby (str)
-    images - absolutní cesty k obrázkům Wikimedia Commons (str)
+    images - absolutní cesty k obrázkům Wikimedia Commons (list)
 
     birth_date - datum narození osoby (str)
     birth_place - místo narození osoby (str)
@@ -42,15 +76,38 @@ class EntPerson(EntCore):
     nationality - národnost osoby (str)
 
     Třídní atributy:
-    ib_types - typy infoboxů, které se týkají osob (set)
+    ib_types - typy infoboxů, které se týkají osob (set; viz get_infobox_type a load_infobox_types)
     """
 
+    __slots__ = (
+        "birth_date",
+        "birth_place",
+        "death_date",
+        "death_place",
+        "gender",
+        "jobs",
+        "nationality",
+    )
+
     NT_PSEUDO = "pseudo"
     NT_NICK = "nick"
 
-    # získání typů infoboxů týkajících se osob
-    with open("person_infoboxes", "r", encoding="utf-8") as fl:
-        ib_types = {x.lower().strip() for x in fl.readlines()}
+    # typy infoboxů týkajících se osob - zjišťují se ze šablon během průchodu dumpem, případně se načítají z mezipaměti
+    ib_types = set()
+    RE_IB_CATEGORY = re.compile(r"\[\[\s*Kategorie:\s*Infoboxy\s+lidí")
+    RE_IB_TITLE = re.compile(r"^Šablona:Infobox[\-–—−\s]+(.+)$")
+    IB_TYPES_UNRELATED = ("etnická skupina", "předkové")
+    IB_TYPES_VERSION_PREFIX = "#"
+
+    # typy infoboxů, u nichž se mezi tituly uvažují i zkratky církevních řádů
+    IB_TYPES_RELIGIOUS = {"křesťanský vůdce", "světec"}
+
+    # tituly jsou předkompilovány jednou pro všechny aliasy (viz custom_transform_alias)
+    TITLES_CIVIL = _load_titles("titles_civil.txt")
+    TITLES_RELIGIOUS = _load_titles("titles_religious.txt")
+    RE_TITLES = _compile_titles(TITLES_CIVIL)
+    RE_TITLES_RELIGIOUS = _compile_titles(TITLES_CIVIL + TITLES_RELIGIOUS)
+    RE_INITIALS = regex.compile(r"(?<=^|\|)\p{Lu}\.(?:\s*\p{Lu}\.)+(\||$)")
 
     def __init__(self, title, prefix, link, redirects, langmap):
         """
@@ -76,6 +133,66 @@ class EntPerson(EntCore):
 
         self.re_infobox_kw_img = r"obrázek"
 
+    @classmethod
+    def get_infobox_type(cls, title: str, content: str) -> Optional[str]:
+        """
+        Určí, zda stránka šablony je infoboxem týkajícím se osob (šablona v kategorii Infoboxy lidí).
+
+        Parametry:
+        title - název stránky (str)
+        content - obsah stránky (str)
+
+        Návratové hodnoty:
+        Typ infoboxu (malými písmeny), pokud se jedná o infobox týkající se osob, jinak None. (Optional[str])
+        """
+        if not title.startswith("Šablona:") or not content:
+            return None
+        if not cls.RE_IB_CATEGORY.search(content):
+            return None
+        ib_re = cls.RE_IB_TITLE.search(title)
+        if not ib_re:
+            return None
+        ib_type = ib_re.group(1).replace("/doc", "").strip().lower()
+        if any(unrelated in ib_type for unrelated in cls.IB_TYPES_UNRELATED):
+            return None  # nesouvisí s osobami
+        return ib_type
+
+    @classmethod
+    def load_infobox_types(cls, fpath: str) -> Optional[str]:
+        """
+        Načte typy infoboxů týkajících se osob ze souboru (mezipaměti).
+
+        Parametry:
+        fpath - cesta k souboru s typy infoboxů (jeden na řádek; volitelně s úvodním řádkem "#verze dumpu") (str)
+
+        Návratové hodnoty:
+        Verze dumpu, z něhož typy pocházejí (prázdný řetězec, není-li uvedena), nebo None, pokud soubor neexistuje. (Optional[str])
+        """
+        try:
+            with open(fpath, "r", encoding="utf-8") as fl:
+                lines = fl.readlines()
+        except OSError:
+            return None
+        version = ""
+        if lines and lines[0].startswith(cls.IB_TYPES_VERSION_PREFIX):
+            version = lines.pop(0)[len(cls.IB_TYPES_VERSION_PREFIX) :].strip()
+        cls.ib_types = {x.lower().strip() for x in lines} - {""}
+        return version
+
+    @classmethod
+    def save_infobox_types(cls, fpath: str, version: str) -> None:
+        """
+        Uloží typy infoboxů týkajících se osob do souboru (mezipaměti) spolu s verzí dumpu.
+
+        Parametry:
+        fpath - cesta k souboru s typy infoboxů (str)
+        version - verze dumpu, z něhož typy pocházejí (str)
+        """
+        with open(fpath, "w", encoding="utf-8") as fl:
+            fl.write(cls.IB_TYPES_VERSION_PREFIX + version + "\n")
+            for ib_type in sorted(cls.ib_types):
+                fl.write(ib_type + "\n")
+
     @classmethod
     def is_person(cls, content):
         """
@@ -271,6 +388,8 @@ class EntPerson(EntCore):
                     self.LANG_CZECH if self.title[-3:] == "ová" else LANG_UNKNOWN
                 )
 
+        return super().data_preprocess(content)
+
     def line_process_infobox(self, ln, is_infobox_block):
         # Aliases
         rexp_format = r"(jiná[\s_]+jména|(?:rodné|celé|úplné|posmrtné|chrámové|trůnní)[\s_]+jméno|pseudonym|přezdívka|alias)\s*=(?!=)\s+(?!nezveřejněn[aáéoý]?|neznám[aáéoý]?)(.*)"
@@ -495,119 +614,13 @@ class EntPerson(EntCore):
         Parametry:
         alias - alternativní pojmenování entity (str)
         """
-        re_titles_religious = []
-        if self.infobox_type in ["křesťanský vůdce", "světec"]:
-            # https://cs.wikipedia.org/wiki/Seznam_zkratek_c%C3%ADrkevn%C3%ADch_%C5%99%C3%A1d%C5%AF_a_kongregac%C3%AD
-            # https://cs.qwe.wiki/wiki/List_of_ecclesiastical_abbreviations#Abbreviations_of_titles_of_the_principal_religious_orders_and_congregations_of_priests
-            # http://www.katolik.cz/otazky/ot.asp?ot=657
-            re_titles_religious = [
-                "A(?:\. ?)?(?:F|M)\.?",  # AF, AM
-                "A(?:\. ?)?(?:B(?:\. ?)?)?A\.?",  # AA, ABA
-                "A(?:\. ?)?C(?:\. ?)?S\.?",  # ACS
-                "A(?:\. ?)?M(?:\. ?)?B(?:\. ?)?V\.?",  # AMBV
-                "B\.?",  # B
-                "C(?:\. ?)?C\.?(?: ?G\.?)?",  # CC, CCG
-                "C(?:\. ?)?F(?:\. ?)?C\.?",  # CFC
-                "C(?:\. ?)?F(?:\. ?)?Ss(?:\. ?)?S\.?",  # CFSsS
-                "C(?:\. ?)?C(?:\. ?)?R(?:\. ?)?R(?:\. ?)?M(?:\. ?)?M\.?",  # CCRRMM
-                "C(?:\. ?)?(?:J(?:\. ?)?)?M\.?",  # CJM, CM
-                "C(?:\. ?)?M(?:\. ?)?F\.?",  # CMF
-                "C(?:\. ?)?M(?:\. ?)?S(?:\. ?)?Sp(?:\. ?)?S\.?",  # CMSSpS
-                "C(?:\. ?)?P\.?(?: ?P(?:\. ?)?S\.?)?",  # CP, CPPS
-                "Č(?:\. ?)?R\.?",  # ČR
-                "C(?:\. ?)?R(?:\. ?)?C(?:\. ?)?S\.?",  # CRCS
-                "C(?:\. ?)?R(?:\. ?)?I(?:\. ?)?C\.?",  # CRIC
-                "C(?:\. ?)?R(?:\. ?)?(?:L|M|T|V)\.?",  # CRL, CRM, CRT, CRV
-                "C(?:\. ?)?R(?:\. ?)?M(?:\. ?)?(?:D|I)\.?",  # CRMD, CRMI
-                "C(?:\. ?)?R(?:\. ?)?(?:S(?:\. ?)?)?P\.?",  # CRP, CRSP
-                "C(?:\. ?)?S(?:\. ?)?(?:B|C|J|P|V)\.?",  # CSB, CSC, CSJ, CSP, CSV
-                "C(?:\. ?)?S(?:\. ?)?C(?:\. ?)?D(?:\. ?)?I(?:\. ?)?J\.?",  # CSCDIJ
-                "C(?:\. ?)?S(?:\. ?)?S(?:\. ?)?E\.?",  # CSSE
-                "C(?:\. ?)?S(?:\. ?)?Sp\.?",  # CSSp
-                "C(?:\. ?)?Ss(?:\. ?)?(?:CC|Cc|R)\.?",  # CSsCC, CSsR
-                "C(?:\. ?)?S(?:\. ?)?T(?:\. ?)?F\.?",  # CSTF
-                "D(?:\. ?)?K(?:\. ?)?L\.?",  # DKL
-                "D(?:\. ?)?N(?:\. ?)?S\.?",  # DNS
-                "F(?:\. ?)?D(?:\. ?)?C\.?",  # FDC
-                "F(?:\. ?)?M(?:\. ?)?A\.?",  # FMA
-                "F(?:\. ?)?M(?:\. ?)?C(?:\. ?)?S\.?",  # FMCS
-                "F(?:\. ?)?M(?:\. ?)?D(?:\. ?)?D\.?",  # FMDD
-                "F(?:\. ?)?S(?:\. ?)?C(?:\. ?)?I\.?",  # FSCI
-                "F(?:\. ?)?S(?:\. ?)?P\.?",  # FSP
-                "I(?:\. ?)?B(?:\. ?)?M(?:\. ?)?V\.?",  # IBMV
-                "Inst(?:\. ?)?Char\.?",  # Inst. Char.
-                "I(?:\. ?)?Sch\.?",  # ISch
-                "I(?:\. ?)?S(?:\. ?)?P(?:\. ?)?X\.?",  # ISPX
-                "I(?:\. ?)?S(?:\. ?)?S(?:\. ?)?M\.?",  # ISSM
-                "K(?:\. ?)?M(?:\. ?)?B(?:\. ?)?M\.?",  # KMBM
-                "K(?:\. ?)?S(?:\. ?)?H\.?",  # KSH
-                "K(?:\. ?)?S(?:\. ?)?N(?:\. ?)?S\.?",  # KSNS
-                "(?:L|M|O|S)(?:\. ?)?C\.?",  # LC, MC, OC, SC
-                "M(?:\. ?)?I(?:\. ?)?C\.?",  # MIC
-                "N(?:\. ?)?Id\.?",  # MId
-                "M(?:\. ?)?S\.?(?: ?(?:C|J)\.?)?",  # MS, MSC, MSJ
-                "N(?:\. ?)?D\.?",  # ND
-                "O(?:\. ?)?(?:Camald|Carm|Cart|Cist|Cr|Crucig|F|H|M|Melit|Merced|P|Praed|Praem|T|Trinit)\.?",  # OCamald, OCarm, OCart, OCist, OCr, OCrucig, OF, OH, OM, OMelit, OMerced, OP, OPraed, OPraem, OT, OTrinit
-                "O(?:\. ?)?C(?:\. ?)?(?:C|D|R)\.?",  # OCC, OCD, OCR
-                "O(?:\. ?)?C(?:\. ?)?S(?:\. ?)?O\.?",  # OCSO
-                "O(?:\. ?)?F(?:\. ?)?M\.?(?: ?(?:Cap|Conv|Rec)\.?)?",  # OFM, OFM Cap., OFM Conv., OFM Rec.
-                "O(?:\. ?)?M(\. ?)?(?:C|I)\.?",  # OMC, OMI
-                "O(?:\. ?)?(?:F(\. ?)?)?M(\. ?)?Cap\.?",  # OM Cap. OFM Cap.
-                "O(?:\. ?)?S(?:\. ?)?(?:A|B|C|E|F|H|M|U)\.?",  # OSA, OSB, OSC, OSE, OSF, OSH, OSM, OSU
-                "O(?:\. ?)?S(?:\. ?)?B(\. ?)?M\.?",  # OSBM
-                "O(?:\. ?)?S(?:\. ?)?C(\. ?)?(?:Cap|O)\.?",  # OSC Cap., OSCO
-                "O(?:\. ?)?S(?:\. ?)?F(?:\. ?)?(?:C|S)\.?",  # OSFC, OSFS
-                "O(?:\. ?)?S(?:\. ?)?F(\. ?)?Gr\.?",  # OSFGr
-                "O(?:\. ?)?Ss(?:\. ?)?C\.?",  # OSsC
-                "O(?:\. ?)?V(?:\. ?)?M\.?",  # OVM
-                "P(?:\. ?)?D(?:\. ?)?D(\. ?)?M\.?",  # PDDM
-                "P(?:\. ?)?O\.?",  # PO
-                "P(?:\. ?)?S(?:\. ?)?(?:M|S)\.?",  # PSM, PSS
-                "R(?:\. ?)?G(?:\. ?)?S\.?",  # RGS
-                "S(?:\. ?)?(?:A|J|S)(?:\. ?)?C\.?",  # SAC, SJC, SSC
-                "S(?:\. ?)?C(?:\. ?)?(?:B|H|M)\.?",  # SCB, SCH, SCM
-                "S(?:\. ?)?C(?:\. ?)?S(\. ?)?C\.?",  # SCSC
-                "S(?:\. ?)?D(?:\. ?)?(?:B|J|S)\.?",  # SDB, SDJ, SDS
-                "Sch(?:\. ?)?P\.?",  # SchP
-                "(?:S|T)(?:\. ?)?(?:I|J)\.?",  # SI, SJ, TI, TJ
-                "S(?:\. ?)?(?:P(?:\. ?)?)?M\.?",  # SM, SPM
-                "S(?:\. ?)?M(?:\. ?)?F(?:\. ?)?O\.?",  # SMFO
-                "S(?:\. ?)?M(?:\. ?)?O(?:\. ?)?M\.?",  # SMOM
-                "S(?:\. ?)?(?:P|Praem)\.?",  # SP, SPraem
-                "S(?:\. ?)?S(?:\. ?)?J\.?",  # SSJ
-                "S(?:\. ?)?S(?:\. ?)?N(?:\. ?)?D\.?",  # SSND
-                "S(?:\. ?)?(?:S|T)(?:\. ?)?S\.?",  # SSS, STS
-                "S(?:\. ?)?V\.?(?: ?D\.?)?",  # SV, SVD
-            ]
-        # u titulů bez teček je třeba kontrolova mezeru, čárku nebo konec (například MA jinak vezme následující příjmení začínající "Ma..." a bude toto jméno považovat za součást předchozího)
-        re_titles_civil = [
-            r"J[rn]\.?",
-            "Sr\.?",
-            "ml(?:\.|adší)?",
-            "st(?:\.|arší)?",
-            "jun(\.|ior)?",
-            "[PT]h(\.\s?)?Dr?\.?",
-            "MBA",
-            "M\.?A\.?",
-            "M\.?S\.?",
-            "M\.?Sc\.?",
-            "CSc\.",
-            "D(?:\.|r\.?)Sc\.",
-            "[Dd]r\. ?h\. ?c\.",
-            "DiS\.",
-            "CC",
-        ]
-        #                 v---- need to be space without asterisk - with asterisk the comma will be replaced
-        alias = re.sub(
-            r", (?!("
-            + "|".join(re_titles_civil + re_titles_religious)
-            + r")(\.|,| |$))",
-            "|",
-            alias,
-            flags=re.I,
-        )
-        alias = regex.sub(
-            r"(?<=^|\|)\p{Lu}\.(?:\s*\p{Lu}\.)+(\||$)", "\g<1>", alias
+        if self.infobox_type in self.IB_TYPES_RELIGIOUS:
+            re_titles = self.RE_TITLES_RELIGIOUS
+        else:
+            re_titles = self.RE_TITLES
+        alias = re_titles.sub("|", alias)
+        alias = self.RE_INITIALS.sub(
+            r"\g<1>", alias
         )  # Elimination of initials like "V. H." (also in infobox pseudonymes, nicknames, ...)
 
         return alias
@@ -641,18 +654,7 @@ class EntPerson(EntCore):
         )
         fs = re.sub(r"{{IPA\d?\|(.+?)}}", r"\1", fs, flags=re.I)
         fs = re.sub(r"{{výslovnost\|(.+?)\|.*?}}", r"\1", fs, flags=re.I)
-        fs = self._subx(
-            r".*?{{\s*datum[\s_]+(?:narození|úmrtí)\D*\|\s*(\d*)\s*\|\s*(\d*)\s*\|\s*(\d*)[^}]*}}.*",
-            lambda x: self._regex_date(x, 3),
-            fs,
-            flags=re.I,
-        )
-        fs = self._subx(
-            r".*?{{\s*JULGREGDATUM\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+)[^}]*}}.*",
-            lambda x: self._regex_date(x, 4),
-            fs,
-            flags=re.I,
-        )
+        fs = DateParser.parse_templates(fs)
         fs = re.sub(
             r"{{čínsky(.+?)}}",
             lambda x: re.sub(
@@ -781,7 +783,7 @@ class EntPerson(EntCore):
                 "|".join(self.redirects),
                 self.description,
                 self.original_title,
-                self.images,
+                self.serialize_images(),
                 self.link,
                 self.gender,
                 self.birth_date,
@@ -797,7 +799,9 @@ class EntPerson(EntCore):
         converted_place = self._convert_place(place=place, do_sentence_conversions=do_sentence_conversions)
         self._save_place(converted_place=converted_place, is_birth=is_birth)
 
-    def _convert_date(self, date, is_birth):
+    @staticmethod
+    @lru_cache
+    def _convert_date(date, is_birth):
         """
         Zpracuje a konvertuje datum narození/úmrtí osoby do jednotného formátu.
 
@@ -808,258 +812,11 @@ class EntPerson(EntCore):
         Návratové hodnoty:
         Datum narození/úmrtí osoby v jednotném formátu. (str)
         """
-
-        # detekce př. n. l.
-        date_bc = True if re.search(r"př\.?\s*n\.?\s*l\.?", date, re.I) else False
-
-        # datum před úpravou
-        orig_date = date[:]
-
-        # odstranění přebytečného textu
-        date = date.replace("?", "").replace("~", "")
-        date = re.sub(r"{{(?!\s*datum|\s*julgreg)[^}]+}}", "", date, flags=re.I)
-        date = re.sub(r"př\.\s*n\.\s*l\.", "", date, flags=re.I)
-
-        # staletí - začátek
-        date = self._subx(
-            r".*?(\d+\.?|prvn.|druh.)\s*(?:pol(?:\.|ovin.))\s*(\d+)\.?\s*(?:st(?:\.?|ol\.?|oletí)).*",
-            lambda x: self._regex_date(x, 0),
-            date,
-            flags=re.I,
-        )
-
-        date = self._subx(
-            r".*?(\d+)\.?\s*(?:až?|[\-–—−/])\s*(\d+)\.?\s*(?:st\.?|stol\.?|století).*",
-            lambda x: self._regex_date(x, 1),
-            date,
-            flags=re.I,
-        )
-
-        date = self._subx(
-            r".*?(\d+)\.?\s*(?:st\.?|stol\.?|století).*",
-            lambda x: self._regex_date(x, 2),
-            date,
-            flags=re.I,
-        )
-        # staletí - konec
-
-        # data z šablon - začátek
-        if is_birth:
-            date = self._subx(
-                r".*?{{\s*datum[\s_]+narození\D*\|\s*(\d*)\s*\|\s*(\d*)\s*\|\s*(\d*)[^}]*}}.*",
-                lambda x: self._regex_date(x, 3),
-                date,
-                flags=re.I,
-            )
-        else:
-            date = self._subx(
-                r".*?{{\s*datum[\s_]+úmrtí\D*\|\s*(\d*)\s*\|\s*(\d*)\s*\|\s*(\d*)[^}]*}}.*",
-                lambda x: self._regex_date(x, 3),
-                date,
-                flags=re.I,
-            )
-        date = self._subx(
-            r".*?{{\s*JULGREGDATUM\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+)[^}]*}}.*",
-            lambda x: self._regex_date(x, 4),
-            date,
-            flags=re.I,
-        )
-        # data z šablon - konec
-
-        # data napsaná natvrdo - začátek
-        date = self._subx(
-            r".*?(\d+)\.\s*((?:led|úno|bře|dub|kvě|čer|srp|zář|říj|list|pros)[^\W\d_]+)(?:\s*,)?\s+(\d+).*",
-            lambda x: self._regex_date(x, 8),
-            date,
-            flags=re.I,
-        )
-        date = self._subx(
-            r".*?(\d+)\s*(?:či|až?|nebo|[\-–—−/])\s*(\d+).*",
-            lambda x: self._regex_date(x, 5),
-            date,
-            flags=re.I,
-        )
-        date = self._subx(
-            r".*?(\d+)\s*\.\s*(\d+)\s*\.\s*(\d+).*",
-            lambda x: self._regex_date(x, 4),
-            date,
-        )
-        date = self._subx(
-            r".*?((?:led|úno|bře|dub|kvě|čer|srp|zář|říj|list|pros)[^\W\d_]+)(?:\s*,)?\s+(\d+).*",
-            lambda x: self._regex_date(x, 9),
-            date,
-            flags=re.I,
-        )
-        date = self._subx(
-            r".*?(\d+)\.\s*((?:led|úno|bře|dub|kvě|čer|srp|zář|říj|list|pros)[^\W\d_]+).*",
-            lambda x: self._regex_date(x, 7),
-            date,
-            flags=re.I,
-        )
-        date = self._subx(r".*?(\d{1,4}).*", lambda x: self._regex_date(x, 6), date)
-        # data napsaná natvrdo - konec
-
-        # odstranění zdvojených bílých znaků a jejich převod na mezery
-        date = self._subx(r"\s+", " ", date).strip()
-
-        # odstranění nezkonvertovatelných dat
-        date = "" if orig_date == date else date
-
-        # převod na formát data před naším letopočtem - začátek
-        if date and date_bc:
-            rexp = re.search(r"^([\d?]{4})-([\d?]{2})-([\d?]{2})$", date)
-            if rexp and rexp.group(1):
-                if rexp.group(1) != "????":
-                    bc_year = (
-                        "-" + str(int(rexp.group(1)) - 1).zfill(4)
-                        if rexp.group(1) != "0001"
-                        else "0000"
-                    )
-                    date = "{}-{}-{}".format(bc_year, rexp.group(2), rexp.group(3))
-            else:
-                rexp = re.search(
-                    r"^([\d?]{4})-([\d?]{2})-([\d?]{2})/([\d?]{4})-([\d?]{2})-([\d?]{2})$",
-                    date,
-                )
-                if rexp and rexp.group(1) and rexp.group(4):
-                    if rexp.group(1) != "????" and rexp.group(4) != "????":
-                        yr1, yr2 = int(rexp.group(1)), int(rexp.group(4))
-                        if (
-                            yr1 < yr2
-                        ):  # prohození hodnot, pokud je první rok menší než druhý
-                            yr1, yr2 = yr2, yr1
-                        bc_year1 = "-" + str(yr1 - 1).zfill(4) if yr1 != 1 else "0000"
-                        bc_year2 = "-" + str(yr2 - 1).zfill(4) if yr2 != 1 else "0000"
-                        date = "{}-{}-{}/{}-{}-{}".format(
-                            bc_year1,
-                            rexp.group(2),
-                            rexp.group(3),
-                            bc_year2,
-                            rexp.group(6),
-                            rexp.group(6),
-                        )
-        # převod na formát data před naším letopočtem - konec
-
-        return date
+        return DateParser.parse(date, is_birth)
 
     @staticmethod
-    def _get_cal_month(month):
-        """
-        Převádí název kalendářního měsíce na číselný tvar.
-
-        Parametry:
-        month - název měsíce (str)
-
-        Návratové hodnoty:
-        Číslo kalendářního měsíce na 2 pozicích, jinak ??. (str)
-        """
-
-        cal_months_part = [
-            "led",
-            "únor",
-            "břez",
-            "dub",
-            "květ",
-            "červ",
-            "červen",
-            "srp",
-            "září",
-            "říj",
-            "listopad",
-            "prosin",
-        ]
-
-        for idx, mon in enumerate(cal_months_part, 1):
-            if mon in month.lower():
-                if (
-                    idx == 6 and "c" in month
-                ):  # v případě špatné identifikace června a července v některých pádech
-                    return "07"
-                return str(idx).zfill(2)
-
-        return "??"
-
-    def _regex_date(self, match_obj, match_type):
-        """
-        Převádí předaný match object na jednotný formát data dle standardu ISO 8601.
-
-        Parametry:
-        match_obj  - match object (MatchObject)
-        match_type - určuje, jaký typ formátu se má aplikovat (int)
-
-        Návratová hodnota:
-        Jednotný formát data. (str)
-        """
-        if match_type == 0:
-            f = "{:04d}-??-??/{:04d}-??-??"
-            if re.search(r"1\.?|prvn.", match_obj.group(1), re.I):
-                f = f.format(
-                    (int(match_obj.group(2)) - 1) * 100 + 1,
-                    int(match_obj.group(2)) * 100 - 50,
-                )
-            else:
-                f = f.format(
-                    (int(match_obj.group(2)) - 1) * 100 + 51,
-                    int(match_obj.group(2)) * 100,
-                )
-            return f
-
-        if match_type == 1:
-            f = "{:04d}-??-??/{:04d}-??-??"
-            return f.format(
-                (int(match_obj.group(1)) - 1) * 100 + 1, int(match_obj.group(2)) * 100
-            )
-
-        if match_type == 2:
-            f = "{:04d}-??-??/{:04d}-??-??"
-            return f.format(
-                (int(match_obj.group(1)) - 1) * 100 + 1, int(match_obj.group(1)) * 100
-            )
-
-        if match_type == 3:
-            f = "{}-{}-{}"
-            year = "????" if not match_obj.group(1) else match_obj.group(1).zfill(4)
-            month = "??" if not match_obj.group(2) else match_obj.group(2).zfill(2)
-            day = "??" if not match_obj.group(3) else match_obj.group(3).zfill(2)
-            return f.format(year, month, day)
-
-        if match_type == 4:
-            f = "{}-{}-{}"
-            return f.format(
-                match_obj.group(3).zfill(4),
-                match_obj.group(2).zfill(2),
-                match_obj.group(1).zfill(2),
-            )
-
-        if match_type == 5:
-            return "{}-??-??/{}-??-??".format(
-                match_obj.group(1).zfill(4), match_obj.group(2).zfill(4)
-            )
-
-        if match_type == 6:
-            return "{}-??-??".format(match_obj.group(1).zfill(4))
-
-        if match_type == 7:
-            f = "????-{}-{}"
-            return f.format(
-                self._get_cal_month(match_obj.group(2)), match_obj.group(1).zfill(2)
-            )
-
-        if match_type == 8:
-            f = "{}-{}-{}"
-            return f.format(
-                match_obj.group(3).zfill(4),
-                self._get_cal_month(match_obj.group(2)),
-                match_obj.group(1).zfill(2),
-            )
-
-        if match_type == 9:
-            f = "{}-{}-??"
-            return f.format(
-                match_obj.group(2).zfill(4), self._get_cal_month(match_obj.group(1))
-            )
-
-    def _convert_place(self, place: str, do_sentence_conversions: Optional[bool] = False) -> str:
+    @lru_cache
+    def _convert_place(place: str, do_sentence_conversions: Optional[bool] = False) -> str:
         """
         Převádí místo narození/úmrtí osoby do jednotného formátu.
 
@@ -1092,7 +849,7 @@ class EntPerson(EntCore):
         place = re.sub(r"(\]\])[^\),a-z]", r"\1, ", place)  # Žebětín (dnes [[Brno]]), CZ -> Žebětín (dnes Brno), CZ [previously bugged: Žebětín (dnes Brno, CZ ]
         if do_sentence_conversions:
             place = re.sub(r", [^,]*'{2,}.+'{2,}", "", place)   # (*2001, Praha, CZ, rodným jménem '''Jan Novák'''), (*2001, Praha, CZ, plné rodné jméno ''Jan Jakub Novák'')
-        place = self.del_redundant_text(place)
+        place = EntCore.del_redundant_text(place)
         place = re.sub(r"[{}<>\[\]]", "", place)
         place = re.sub(r"\s*,([^\s])", r", \1", place)   # Brno,CZ | Brno ,CZ -> Brno, CZ
         place = re.sub(r"\s+,\s+", ", ", place)  # Brno , CZ -> Brno, CZ
@@ -1146,19 +903,3 @@ class EntPerson(EntCore):
                 self._check_inconsistence(column="DEATH PLACE", old=self.death_place, new=converted_place, except_contain=True)
             else:
                 self.death_place = converted_place
-
-    @staticmethod
-    def _subx(pattern, repl, string, count=0, flags=0):
-        """
-        Vykonává totožný úkon jako funkce sub z modulu re, ale jen v případě, že nenarazí na datum ve standardizovaném formátu.
-
-        Parametry:
-        pattern - vzor (str)
-        repl - náhrada (str)
-        string - řetězec, na kterém má být úkon proveden (str)
-        count - počet výskytů, na kterých má být úkon proveden (int)
-        flags - speciální značky, které ovlivňují chování funkce (int)
-        """
-        if re.match(r"[\d?]+-[\d?]+-[\d?]+", string):
-            return string
-        return re.sub(pattern, repl, string, count, flags)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje registr typů entit ('ENTITY_TYPES') - pro každý typ funkci určující z názvu a obsahu stránky,
+zda stránka o entitě daného typu pojednává, třídu entity, prioritu a schéma hlavičkového souboru HEAD-KB -
+a funkci 'classify', jež podle registru určí typ entity stránky.
+
+Poznámky:
+- typy se vyhodnocují v pořadí priority (nižší hodnota - vyšší priorita)
+- úroveň určení typu: 0 - stránka o entitě daného typu nepojednává, 1 (BEST_LEVEL) - nejspolehlivější určení
+  (např. infobox), vyšší - méně spolehlivé určení (kategorie, název)
+- výlučný typ (osoba, stát) je přijat, jakmile jej stránka splňuje; ostatní typy soupeří úrovní určení typu -
+  vítězí nejnižší úroveň, při shodě typ s vyšší prioritou; typ s nižší prioritou nahradí nalezený typ jen úrovní
+  ostře lepší, výlučný typ s nižší prioritou jej nenahradí
+- vyhodnocování končí, jakmile výsledek nemůže ovlivnit žádný další typ - tj. po dosažení nejlepší úrovně, nebo
+  pokud zbývají jen nevybrané typy a nalezený typ vybraný není (typy s vyšší prioritou se přitom vyhodnocují vždy,
+  aby stránka nebyla určena jako vybraný typ jen proto, že se nevybraný typ nevyhodnotil)
+- další typ entity se přidá funkcí register_type
+"""
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ent_country import EntCountry
+from ent_geo import EntGeo
+from ent_person import EntPerson
+from ent_settlement import EntSettlement
+from ent_waterarea import EntWaterArea
+from ent_watercourse import EntWatercourse
+
+
+BEST_LEVEL = 1
+
+HEAD_KB_COMMON = [
+    "ID",
+    "TYPE",
+    "NAME",
+    "{m}ALIASES",
+    "{m}REDIRECTS",
+    "DESCRIPTION",
+    "ORIGINAL_WIKINAME",
+    "{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE",
+    "{ui}WIKIPEDIA LINK",
+]
+HEAD_KB_STATS = [
+    "WIKI BACKLINKS",
+    "WIKI HITS",
+    "WIKI PRIMARY SENSE",
+    "SCORE WIKI",
+    "SCORE METRICS",
+    "CONFIDENCE",
+]
+
+
+class EntityType(NamedTuple):
+    """
+    Typ entity - název (prefix entity), třída entity, funkce určující typ (vrací úroveň určení typu a podtyp),
+    priorita, schéma HEAD-KB (sloupce specifické pro typ podle prefixů entit daného typu včetně podtypů),
+    příznak výlučného typu a příznak nastavení podtypu entity z určení typu.
+    """
+
+    name: str
+    ent_class: type
+    classify: Callable[[str, str], Tuple[int, str]]
+    priority: int
+    head_kb: Dict[str, List[str]]
+    exclusive: bool = False
+    subtyped: bool = False
+
+    def head_kb_lines(self) -> List[str]:
+        """
+        Vrací řádky hlavičkového souboru HEAD-KB pro entity daného typu.
+        """
+        return [
+            "<{}>{}\n".format(prefix, "\t".join(HEAD_KB_COMMON + columns + HEAD_KB_STATS))
+            for prefix, columns in self.head_kb.items()
+        ]
+
+
+ENTITY_TYPES = dict()
+
+
+def register_type(ent_type: EntityType) -> None:
+    """
+    Přidá typ entity do registru.
+
+    Parametry:
+    ent_type - typ entity (EntityType)
+    """
+    ENTITY_TYPES[ent_type.name] = ent_type
+
+
+def get_types(names: Optional[Iterable[str]] = None) -> List[EntityType]:
+    """
+    Vrací typy entit zadaných názvů seřazené podle priority.
+
+    Parametry:
+    names - názvy typů entit; None pro všechny typy (Optional[Iterable[str]])
+
+    Návratové hodnoty:
+    Seznam typů entit. (List[EntityType])
+
+    Poznámky:
+    - při zadání neznámého názvu typu vyvolá výjimku ValueError
+    """
+    if names is None:
+        ent_types = ENTITY_TYPES.values()
+    else:
+        unknown = set(names) - set(ENTITY_TYPES)
+        if unknown:
+            raise ValueError(
+                "unknown entity type(s): {} (known: {})".format(
+                    ", ".join(sorted(unknown)), ", ".join(ENTITY_TYPES)
+                )
+            )
+        ent_types = [ENTITY_TYPES[name] for name in set(names)]
+    return sorted(ent_types, key=lambda ent_type: ent_type.priority)
+
+
+def classify(
+    title: str, content: str, selected: Optional[Iterable[str]] = None
+) -> Optional[Tuple[EntityType, int, str]]:
+    """
+    Určí typ entity, o níž stránka pojednává.
+
+    Parametry:
+    title - název stránky (str)
+    content - obsah stránky (str)
+    selected - názvy vybraných typů entit; None pro všechny typy (Optional[Iterable[str]])
+
+    Návratové hodnoty:
+    Trojice (typ entity, úroveň určení typu, podtyp z určení typu), nebo None, pokud stránka nepojednává o entitě vybraného typu. (Optional[Tuple[EntityType, int, str]])
+    """
+    ent_types = get_types()
+    if selected is not None:
+        selected = set(selected)
+        # za posledním vybraným typem už nelze výsledek změnit na vybraný typ
+        i_last = max(
+            (i for i, ent_type in enumerate(ent_types) if ent_type.name in selected),
+            default=-1,
+        )
+    else:
+        i_last = len(ent_types) - 1
+
+    found = None
+    found_level = None
+    for i_type, ent_type in enumerate(ent_types):
+        if found is not None:
+            # lepší než nejlepší úroveň dosáhnout nelze (ani výlučným typem s nižší prioritou)
+            if found_level <= BEST_LEVEL:
+                break
+            if i_type > i_last and selected is not None and found[0].name not in selected:
+                break
+            if ent_type.exclusive:
+                continue
+        elif i_type > i_last:
+            break
+
+        id_level, id_subtype = ent_type.classify(title, content)
+        if not id_level:
+            continue
+        if ent_type.exclusive and found is None:
+            found = (ent_type, id_level, id_subtype)
+            break
+        if found_level is None or id_level < found_level:
+            found = (ent_type, id_level, id_subtype)
+            found_level = id_level
+
+    if found is None or (selected is not None and found[0].name not in selected):
+        return None
+    return found
+
+
+PERSON_HEAD_KB = [
+    "GENDER",
+    "{e}DATE OF BIRTH",
+    "PLACE OF BIRTH",
+    "{e}DATE OF DEATH",
+    "PLACE OF DEATH",
+    "{m}JOBS",
+    "{m}NATIONALITY",
+]
+COUNTRY_HEAD_KB = ["LATITUDE", "LONGITUDE", "AREA", "POPULATION"]
+
+register_type(
+    EntityType(
+        "person",
+        EntPerson,
+        lambda title, content: (int(EntPerson.is_person(content) >= 2), ""),
+        10,
+        {
+            "person": PERSON_HEAD_KB,
+            "person:fictional": PERSON_HEAD_KB,
+            "person:group": PERSON_HEAD_KB,
+        },
+        exclusive=True,
+    )
+)
+register_type(
+    EntityType(
+        "country",
+        EntCountry,
+        lambda title, content: (EntCountry.is_country(content), ""),
+        20,
+        {"country": COUNTRY_HEAD_KB, "country:former": COUNTRY_HEAD_KB},
+        exclusive=True,
+    )
+)
+register_type(
+    EntityType(
+        "settlement",
+        EntSettlement,
+        EntSettlement.is_settlement,
+        30,
+        {"settlement": ["COUNTRY", "LATITUDE", "LONGITUDE", "AREA", "POPULATION"]},
+    )
+)
+register_type(
+    EntityType(
+        "watercourse",
+        EntWatercourse,
+        EntWatercourse.is_watercourse,
+        40,
+        {
+            "watercourse": [
+                "{m}CONTINENT",
+                "LATITUDE",
+                "LONGITUDE",
+                "LENGTH",
+                "AREA",
+                "STREAMFLOW",
+                "SOURCE_LOC",
+            ]
+        },
+    )
+)
+register_type(
+    EntityType(
+        "waterarea",
+        EntWaterArea,
+        EntWaterArea.is_water_area,
+        50,
+        {"waterarea": ["{m}CONTINENT", "LATITUDE", "LONGITUDE", "AREA"]},
+    )
+)
+register_type(
+    EntityType(
+        "geo",
+        EntGeo,
+        EntGeo.is_geo,
+        60,
+        {
+            "geo:relief": ["{m}CONTINENT", "LATITUDE", "LONGITUDE"],
+            "geo:waterfall": ["{m}CONTINENT", "LATITUDE", "LONGITUDE", "TOTAL HEIGHT"],
+            "geo:island": ["{m}CONTINENT", "LATITUDE", "LONGITUDE", "AREA", "POPULATION"],
+            "geo:peninsula": ["LATITUDE", "LONGITUDE"],
+            "geo:continent": ["LATITUDE", "LONGITUDE", "AREA", "POPULATION"],
+        },
+        subtyped=True,
+    )
+)
+# dosud nezpracovávané typy:
+# <organisation> ... {m}REDIRECTS\tFOUNDED\tCANCELLED\tORGANIZATION TYPE\tLOCATION\tDESCRIPTION ...
+# <event> ... {m}REDIRECTS\tSTART\tEND\tLOCATION\tDESCRIPTION ...
@@ -21,6 +21,7 @@ Infobox anglické město
 import re
 import sys
 from ent_core import EntCore
+from libs.QuantityParser import QuantityParser
 
 
 class EntSettlement(EntCore):
@@ -34,13 +35,19 @@ class EntSettlement(EntCore):
     link - odkaz na Wikipedii (str)
     aliases - alternativní pojmenování sídla (str)
     description - stručný popis sídla (str)
-    images - absolutní cesty k obrázkům Wikimedia Commons (str)
+    images - absolutní cesty k obrázkům Wikimedia Commons (list)
 
     area - rozloha sídla v kilometrech čtverečních (str)
     country - stát, ke kterému sídlo patří (str)
     population - počet obyvatel sídla (str)
     """
 
+    __slots__ = (
+        "area",
+        "population",
+        "country",
+    )
+
     def __init__(self, title, prefix, link, redirects, langmap):
         """
         Inicializuje třídu 'EntSettlement'.
@@ -59,8 +66,6 @@ class EntSettlement(EntCore):
 
         self.re_infobox_kw_img = r"(?:obrázek|vlajka|znak|logo)"
 
-        self.get_wiki_api_location(title)
-
     @classmethod
     def is_settlement(cls, title, content):
         """
@@ -142,11 +147,11 @@ class EntSettlement(EntCore):
 
         # kontrola probíhá dál
         id_level, id_type = 0, ""
-        content = content.replace("[ ", "[").replace(" ]", "]")
 
-        if re.search(r"\[\[Kategorie:Města\s+(?:na|ve?)\s+.+?\]\]", content, re.I):
+        # mezera za "[" a před "]" odkazu na kategorii je přípustná (bez kopírování obsahu stránky)
+        if re.search(r"\[ ?\[ ?Kategorie:Města\s+(?:na|ve?)\s+.+?\] ?\]", content, re.I):
             id_level, id_type = 2, "Kategorie Města..."
-        elif re.search(r"\[\[Kategorie:Obce\s+(?:na|ve?)\s+.+?\]\]", content, re.I):
+        elif re.search(r"\[ ?\[ ?Kategorie:Obce\s+(?:na|ve?)\s+.+?\] ?\]", content, re.I):
             id_level, id_type = 2, "Kategorie Obce..."
 
         if any(
@@ -168,16 +173,6 @@ class EntSettlement(EntCore):
 
         return id_level, id_type
 
-    def data_preprocess(self, content):
-        """
-        Předzpracování dat o sídlu.
-
-        Parametry:
-        content - obsah stránky (str)
-        """
-        content = content.replace("&nbsp;", " ")
-        content = re.sub(r"m\sn\.\s*", "metrů nad ", content)
-
     def line_process_infobox(self, ln, is_infobox_block):
         # aliasy
         rexp_format = r"\|\s*jméno\s*=(?!=)\s*(.*)"
@@ -324,17 +319,7 @@ class EntSettlement(EntCore):
         Parametry:
         area - rozloha/výměra sídla (str)
         """
-        area = re.sub(r"\(.*?\)", "", area)
-        area = re.sub(r"\[.*?\]", "", area)
-        area = re.sub(r"<.*?>", "", area)
-        area = re.sub(r"{{.*?}}", "", area).replace("{", "").replace("}", "")
-        area = re.sub(r"(?<=\d)\s(?=\d)", "", area).strip()
-        area = re.sub(r"(?<=\d)\.(?=\d)", ",", area)
-        area = re.sub(r"^\D*(?=\d)", "", area)
-        area = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", area)
-        area = "" if not re.search(r"\d", area) else area
-
-        self.area = area
+        self.area = QuantityParser.parse_decimal(area).text
 
     def get_country(self, country):
         """
@@ -385,29 +370,7 @@ class EntSettlement(EntCore):
         Parametry:
         population - počet obyvatel sídla (str)
         """
-        coef = (
-            1000000
-            if re.search(r"mil\.|mili[oó]n", population, re.I)
-            else 1000
-            if re.search(r"tis\.|tis[ií]c", population, re.I)
-            else 0
-        )
-
-        population = re.sub(r"\(.*?\)", "", population)
-        population = re.sub(r"\[.*?\]", "", population)
-        population = re.sub(r"<.*?>", "", population)
-        population = (
-            re.sub(r"{{.*?}}", "", population).replace("{", "").replace("}", "")
-        )
-        population = re.sub(r"(?<=\d)[,.\s](?=\d)", "", population).strip()
-        population = re.sub(r"^\D*(?=\d)", "", population)
-        population = re.sub(r"^(\d+)\D.*$", r"\1", population)
-        population = "" if not re.search(r"\d", population) else population
-
-        if coef and population:
-            population = str(int(population) * coef)
-
-        self.population = population
+        self.population = QuantityParser.parse_count(population).text
 
     def serialize(self):
         """
@@ -422,7 +385,7 @@ class EntSettlement(EntCore):
                 "|".join(self.redirects),
                 self.description,
                 self.original_title,
-                self.images,
+                self.serialize_images(),
                 self.link,
                 self.country,
                 self.latitude,
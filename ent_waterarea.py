@@ -13,6 +13,7 @@ Soubor obsahuje třídu 'EntWaterArea', která uchovává údaje o vodních ploc
 
 import re
 from ent_core import EntCore
+from libs.QuantityParser import QuantityParser
 
 
 class EntWaterArea(EntCore):
@@ -26,12 +27,17 @@ class EntWaterArea(EntCore):
     link - odkaz na Wikipedii (str)
     aliases - alternativní pojmenování vodní plochy (str)
     description - stručný popis vodní plochy (str)
-    images - absolutní cesty k obrázkům Wikimedia Commons (str)
+    images - absolutní cesty k obrázkům Wikimedia Commons (list)
 
     area - rozloha vodní plochy v kilometrech čtverečních (str)
     continent - světadíl, na kterém se vodní plocha nachází (str)
     """
 
+    __slots__ = (
+        "area",
+        "continent",
+    )
+
     def __init__(self, title, prefix, link, redirects, langmap):
         """
         Inicializuje třídu 'EntWaterArea'.
@@ -49,8 +55,6 @@ class EntWaterArea(EntCore):
 
         self.re_infobox_kw_img = r"(?:obrázek|mapa)"
 
-        self.get_wiki_api_location(title)
-
     @staticmethod
     def is_water_area(title, content):
         """
@@ -85,16 +89,6 @@ class EntWaterArea(EntCore):
 
         return 0, ""
 
-    def data_preprocess(self, content):
-        """
-        Předzpracování dat o vodní ploše.
-
-        Parametry:
-        content - obsah stránky (str)
-        """
-        content = content.replace("&nbsp;", " ")
-        content = re.sub(r"m\sn\.\s*", "metrů nad ", content)
-
     def line_process_infobox(self, ln, is_infobox_block):
         # aliasy
         rexp = re.search(r"název\s*=(?!=)\s*(.*)", ln, re.I)
@@ -208,27 +202,7 @@ class EntWaterArea(EntCore):
         Parametry:
         area - rozloha vodní plochy v kilometrech čtverečních (str)
         """
-        is_ha = re.search(r"\d\s*(?:ha|hektar)", area, re.I)
-
-        area = re.sub(r"\(.*?\)", "", area)
-        area = re.sub(r"\[.*?\]", "", area)
-        area = re.sub(r"<.*?>", "", area)
-        area = re.sub(r"{{.*?}}", "", area).replace("{", "").replace("}", "")
-        area = re.sub(r"(?<=\d)\s(?=\d)", "", area).strip()
-        area = re.sub(r"(?<=\d)\.(?=\d)", ",", area)
-        area = re.sub(r"^\D*(?=\d)", "", area)
-        area = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", area)
-        area = "" if not re.search(r"\d", area) else area
-
-        if (
-            is_ha
-        ):  # je-li údaj uveden v hektarech, dojde k převodu na kilometry čtvereční
-            try:
-                area = str(float(area.replace(",", ".")) / 100).replace(".", ",")
-            except ValueError:
-                pass
-
-        self.area = area
+        self.area = QuantityParser.parse_decimal(area, hectares=True).text
 
     def get_continent(self, continent):
         """
@@ -282,7 +256,7 @@ class EntWaterArea(EntCore):
                 "|".join(self.redirects),
                 self.description,
                 self.original_title,
-                self.images,
+                self.serialize_images(),
                 self.link,
                 self.continent,
                 self.latitude,
@@ -16,6 +16,7 @@ Poznámky:
 
 import re
 from ent_core import EntCore
+from libs.QuantityParser import QuantityParser
 
 
 class EntWatercourse(EntCore):
@@ -29,7 +30,7 @@ class EntWatercourse(EntCore):
     link - odkaz na Wikipedii (str)
     aliases - alternativní pojmenování vodního toku (str)
     description - stručný popis vodního toku (str)
-    images - absolutní cesty k obrázkům Wikimedia Commons (str)
+    images - absolutní cesty k obrázkům Wikimedia Commons (list)
 
     area - plocha povodí vodního toku v kilometrech čtverečních (str)
     continent - světadíl, kterým vodní tok protéká (str)
@@ -38,6 +39,14 @@ class EntWatercourse(EntCore):
     streamflow - průtok vodního toku (str)
     """
 
+    __slots__ = (
+        "area",
+        "continent",
+        "length",
+        "source_loc",
+        "streamflow",
+    )
+
     def __init__(self, title, prefix, link, redirects, langmap):
         """
         Inicializuje třídu 'EntWatercourse'.
@@ -58,8 +67,6 @@ class EntWatercourse(EntCore):
 
         self.re_infobox_kw_img = r"(?:obrázek|mapa)"
 
-        self.get_wiki_api_location(title)
-
     @staticmethod
     def is_watercourse(title, content):
         """
@@ -93,16 +100,6 @@ class EntWatercourse(EntCore):
 
         return 0, ""
 
-    def data_preprocess(self, content):
-        """
-        Předzpracování dat o vodním toku z obsahu stránky.
-
-        Parametry:
-        content - obsah stránky (str)
-        """
-        content = content.replace("&nbsp;", " ")
-        content = re.sub(r"m\sn\.\s*", "metrů nad ", content)
-
     def line_process_infobox(self, ln, is_infobox_block):
         # aliasy
         rexp = re.search(r"řeka\s*=(?!=)\s*(.*)", ln, re.I)
@@ -236,17 +233,7 @@ class EntWatercourse(EntCore):
         Parametry:
         area - plocha vodního toku v kilometrech čtverečních (str)
         """
-        area = re.sub(r"\(.*?\)", "", area)
-        area = re.sub(r"\[.*?\]", "", area)
-        area = re.sub(r"<.*?>", "", area)
-        area = re.sub(r"{{.*?}}", "", area).replace("{", "").replace("}", "")
-        area = re.sub(r"(?<=\d)\s(?=\d)", "", area).strip()
-        area = re.sub(r"(?<=\d)\.(?=\d)", ",", area)
-        area = re.sub(r"^\D*(?=\d)", "", area)
-        area = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", area)
-        area = "" if not re.search(r"\d", area) else area
-
-        self.area = area
+        self.area = QuantityParser.parse_decimal(area).text
 
     def get_continent(self, continent):
         """
@@ -294,17 +281,7 @@ class EntWatercourse(EntCore):
         Parametry:
         length - délka vodního toku v kilometrech (str)
         """
-        length = re.sub(r"\(.*?\)", "", length)
-        length = re.sub(r"\[.*?\]", "", length)
-        length = re.sub(r"<.*?>", "", length)
-        length = re.sub(r"{{.*?}}", "", length).replace("{", "").replace("}", "")
-        length = re.sub(r"(?<=\d)\s(?=\d)", "", length).strip()
-        length = re.sub(r"(?<=\d)\.(?=\d)", ",", length)
-        length = re.sub(r"^\D*(?=\d)", "", length)
-        length = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", length)
-        length = "" if not re.search(r"\d", length) else length
-
-        self.length = length
+        self.length = QuantityParser.parse_decimal(length).text
 
     def get_source_loc(self, source_loc):
         """
@@ -329,19 +306,7 @@ class EntWatercourse(EntCore):
         Parametry:
         streamflow - průtok vodního toku v metrech krychlových za sekundu (str)
         """
-        streamflow = re.sub(r"\(.*?\)", "", streamflow)
-        streamflow = re.sub(r"\[.*?\]", "", streamflow)
-        streamflow = re.sub(r"<.*?>", "", streamflow)
-        streamflow = (
-            re.sub(r"{{.*?}}", "", streamflow).replace("{", "").replace("}", "")
-        )
-        streamflow = re.sub(r"(?<=\d)\s(?=\d)", "", streamflow).strip()
-        streamflow = re.sub(r"(?<=\d)\.(?=\d)", ",", streamflow)
-        streamflow = re.sub(r"^\D*(?=\d)", "", streamflow)
-        streamflow = re.sub(r"^(\d+(?:,\d+)?)[^\d,]+.*$", r"\1", streamflow)
-        streamflow = "" if not re.search(r"\d", streamflow) else streamflow
-
-        self.streamflow = streamflow
+        self.streamflow = QuantityParser.parse_decimal(streamflow).text
 
     def serialize(self):
         """
@@ -356,7 +321,7 @@ class EntWatercourse(EntCore):
                 "|".join(self.redirects),
                 self.description,
                 self.original_title,
-                self.images,
+                self.serialize_images(),
                 self.link,
                 self.continent,
                 self.latitude,
@@ -9,16 +9,34 @@
 """
 
 import argparse
+import heapq
+import io
 import os
 import re
+import shutil
+import sys
+import tempfile
+import time
 from collections import OrderedDict
+from contextlib import ExitStack
+from itertools import chain, islice
+from multiprocessing import Pool
+from typing import NamedTuple
 
 INFILE_KB_HEAD = "HEAD-KB"  # name of KB HEAD file in Wikipedia KB format
 INFILE_KB_DATA = "KBstatsMetrics.all"  # name of KB data file in Wikipedia KB format
 INFILE_KB_HEAD_TYPE = "TYPE"  # name of column with TYPE in Wikipedia KB format
+INFILE_KB_HEAD_TITLE = "ORIGINAL_WIKINAME"  # name of column with title of Wikipedia page in Wikipedia KB format
 
 OUTFILE_KB_HEAD = "HEAD-KB.tsv"  # name of KB HEAD file in Generic KB format
 OUTFILE_KB_DATA = "KB.tsv"  # name of KB data file in Generic KB format
+OUTFILE_KB_DATA_STATS = "KB+stats.tsv"  # name of KB data file with stats columns in Generic KB format
+
+STDIO_FNAME = "-"  # file name representing standard input / output
+BATCH_LINES = 10000  # number of lines converted at once (in streaming mode also number of lines sent to a pool process)
+CHUNK_SIZE = 64 * 1024 * 1024  # maximal size (in bytes) of input file chunk converted by a pool process
+CHUNKS_PER_PROCESS = 4  # minimal number of input file chunks per pool process (for balancing of load)
+OUTPUT_BUFFER_SIZE = 1024 * 1024  # size (in bytes) of output buffer
 
 
 # Basic type names of Generic KB format
@@ -279,132 +297,507 @@ def transform_head(fout_head, with_stats: bool = False):
         fout_head.write("\t".join(out_columns) + "\n")
 
 
-# Transform KB data in WikipediaKB format to GenericKB format
-def transform_data(in_head, in_kb, fout_kb, with_stats: bool = False):
+# Load list of columns with their positional index for each entity type of WikipediaKB format (and index of TYPE column)
+def load_in_columns(in_head):
     in_columns = dict()
     col_type = None
-    # list of columns with their positional index for each entity type of WikipediaKB format
     with open(in_head, "r", encoding="utf8") as fin_head:
         for line in fin_head:
             line = line.strip("\n")
             ent_type = re.search(r"<(.*?)>", line)
             if ent_type:
-                ent_type = ent_type.group(1)
+                ent_type = ent_type.group(1).lower()
                 line = re.sub(r"<.*?>", "", line)
                 line = re.sub(r"{.*?}", "", line)
                 line = re.sub(r"\[.*?\]", "", line)
-                in_columns[ent_type.lower()] = {
-                    key: i for i, key in enumerate(line.split("\t"))
-                }
-                if not col_type:
+                in_columns[ent_type] = {key: i for i, key in enumerate(line.split("\t"))}
+                if col_type is None:
                     col_type = in_columns[ent_type][INFILE_KB_HEAD_TYPE]
-    # print(in_columns)
-    with open(in_kb, "r", encoding="utf8") as fin_kb:
-        for line in fin_kb:
-            line = line.strip("\n")
-            # line of data from KB in WikipediaKB format
-            in_data = line.split("\t")
-            # entity type of this line
-            in_type = in_data[col_type].lower()
-            out_basetype = MAP_ENTITIES_BASETYPES[in_type]
-            out_types = MAP_BASETYPES_COMPOSITE_TYPES[out_basetype]
-            out_alltypes = [COLTYPE_GENERIC] + out_types
-            if with_stats:
-                out_alltypes += [COLTYPE_STATS]
-            out_data = []
-            for out_type in out_alltypes:
-                for out_column, trash in MAP_TYPES_COLUMNS[out_type].items():
-                    # Type is consisting of multiple types (except generic types prefixed and suffixed by underscore) in GenericKB format
-                    if out_column == __GENERIC_TYPE:
-                        out_data.append("+".join(out_types))
-                    # Fictional flag of GenericKB format is based on "person:fictional" entity type of WikipediaKB format
-                    elif out_column == __GENERIC_FICTIONAL:
-                        if in_type == "person:fictional":
-                            out_data.append("1")
-                        # If entity type is person (except group), it is likely to be a non-fictional entity
-                        elif in_type.startswith("person") and in_type != "person:group":
-                            out_data.append("0")
-                        # ...otherwise we do not know
-                        else:
-                            out_data.append("")
-                    # Special processing for column ROLES of GenericKB format
-                    elif out_column == __GENERIC_ROLES:
-                        if out_basetype in MAP_COLROLE_OLDCOL:
-                            out_data.append(
-                                in_data[
-                                    in_columns[in_type][
-                                        MAP_COLROLE_OLDCOL[out_basetype]
-                                    ]
-                                ]
-                            )
-                        else:
-                            out_data.append("")
-                    # Special processing for column GEOTYPES of GenericKB format
-                    elif out_column == GEO_TYPES:
-                        out_data.append(in_type.split(":")[-1])
-                    # For column code of GenericKB format find data in KB of WikipediaKB format (with help of WikipediaKB HEAD definition and its entity types)
-                    else:
-                        if (
-                            out_column in MAP_NEWCOLS_OLDCOLS
-                            and in_type in in_columns
-                            and MAP_NEWCOLS_OLDCOLS[out_column] in in_columns[in_type]
-                        ):
-                            out_data.append(
-                                in_data[
-                                    in_columns[in_type][MAP_NEWCOLS_OLDCOLS[out_column]]
-                                ]
-                            )
-                        else:
-                            out_data.append("")
-            if in_type in in_columns:
-                fout_kb.write("\t".join(out_data) + "\n")
-
-
-parser = argparse.ArgumentParser(
-    description="Convert KB in wikipedia format to generic KB format."
-)
-parser.add_argument(
-    "--indir",
-    default=".",
-    help="Input files (wikipedia format) directory path (default: %(default)s).",
-)
-parser.add_argument(
-    "--outdir",
-    default=".",
-    help="Output files (generic format) directory path (default: %(default)s).",
-)
-parser.add_argument(
-    "--inhead",
-    default=INFILE_KB_HEAD,
-    help="Input KB head (wikipedia format) file name (default: %(default)s).",
-)
-parser.add_argument(
-    "--inkb",
-    default=INFILE_KB_DATA,
-    help="Input KB data (wikipedia format) file name (default: %(default)s).",
-)
-parser.add_argument(
-    "--outkb",
-    default=OUTFILE_KB_DATA,
-    help="Output KB (generic format) file name\n(default: %(default)s).",
-)
-parser.add_argument(
-    "--stats",
-    action="store_true",
-    help="Output KB with stats columns (default: without stats columns).",
-)
-args = parser.parse_args()
+    return in_columns, col_type
 
-outkb = os.path.join(args.outdir, args.outkb)
-with open(outkb, "w") as fout_kb:
-    with open(os.path.join(args.indir, "VERSION"), "r") as fin_version:
-        fout_kb.write("VERSION=" + fin_version.read())
+
+# Lookup tables of stats columns of GenericKB format (column code => {title of Wikipedia page: value}), see load_stats()
+STATS_LOOKUPS = dict()
+
+
+# Load stats lookup table from TSV file with lines "title<TAB>value" (lines with non-numeric value, e.g. header, are skipped)
+def load_stats(fpath):
+    lookup = dict()
+    with open(fpath, "r", encoding="utf8") as fin_stats:
+        for line in fin_stats:
+            title, _, value = line.rstrip("\n").partition("\t")
+            value = value.split("\t", 1)[0].strip()
+            if not value.isdigit():
+                continue
+            title = title.replace("_", " ")
+            lookup[title] = int(value) + lookup.get(title, 0)
+    return {title: str(value) for title, value in lookup.items()}
+
+
+# Projection plan of WikipediaKB entity type to GenericKB columns
+#
+# Output row is built from input row extended by constants as [extended[i] for i in indexes], where constants are placed
+# in front of input data (so input data index "i" is shifted by number of constants). Input rows shorter than n_columns
+# (e.g. without stats columns) are padded by empty values. Lookups are pairs (output index, lookup table) filled by title
+# of Wikipedia page (input column with index i_title).
+class ProjectionPlan(NamedTuple):
+    constants: list
+    indexes: list
+    n_columns: int
+    lookups: list
+    i_title: int
+
+
+# Precompute projection plan of WikipediaKB entity type to GenericKB columns
+def build_projection_plan(in_type, in_columns, with_stats: bool = False):
+    out_basetype = MAP_ENTITIES_BASETYPES[in_type]
+    out_types = MAP_BASETYPES_COMPOSITE_TYPES[out_basetype]
+    out_alltypes = [COLTYPE_GENERIC] + out_types
+    if with_stats:
+        out_alltypes += [COLTYPE_STATS]
+    type_columns = in_columns.get(in_type, {})
+
+    constants = []
+    constants_idx = dict()
+    plan = []  # items: ("const", value), ("col", index of input column) or ("lookup", column code)
+
+    def add_const(value):
+        plan.append(("const", value))
+
+    for out_type in out_alltypes:
+        for out_column in MAP_TYPES_COLUMNS[out_type]:
+            # Type is consisting of multiple types (except generic types prefixed and suffixed by underscore) in GenericKB format
+            if out_column == __GENERIC_TYPE:
+                add_const("+".join(out_types))
+            # Fictional flag of GenericKB format is based on "person:fictional" entity type of WikipediaKB format
+            elif out_column == __GENERIC_FICTIONAL:
+                if in_type == "person:fictional":
+                    add_const("1")
+                # If entity type is person (except group), it is likely to be a non-fictional entity
+                elif in_type.startswith("person") and in_type != "person:group":
+                    add_const("0")
+                # ...otherwise we do not know
+                else:
+                    add_const("")
+            # Special processing for column ROLES of GenericKB format
+            elif out_column == __GENERIC_ROLES:
+                if out_basetype in MAP_COLROLE_OLDCOL:
+                    plan.append(("col", in_columns[in_type][MAP_COLROLE_OLDCOL[out_basetype]]))
+                else:
+                    add_const("")
+            # Special processing for column GEOTYPES of GenericKB format
+            elif out_column == GEO_TYPES:
+                add_const(in_type.split(":")[-1])
+            # Stats columns filled from lookup tables by title of Wikipedia page
+            elif out_column in STATS_LOOKUPS and INFILE_KB_HEAD_TITLE in type_columns:
+                plan.append(("lookup", out_column))
+            # For column code of GenericKB format find data in KB of WikipediaKB format (with help of WikipediaKB HEAD definition and its entity types)
+            elif out_column in MAP_NEWCOLS_OLDCOLS and MAP_NEWCOLS_OLDCOLS[out_column] in type_columns:
+                plan.append(("col", type_columns[MAP_NEWCOLS_OLDCOLS[out_column]]))
+            else:
+                add_const("")
+
+    lookups = [
+        (i, STATS_LOOKUPS[value]) for i, (kind, value) in enumerate(plan) if kind == "lookup"
+    ]
+    # lookup columns are prefilled by empty values
+    plan = [("const", "") if kind == "lookup" else (kind, value) for kind, value in plan]
+    for kind, value in plan:
+        if kind == "const" and value not in constants_idx:
+            constants_idx[value] = len(constants)
+            constants.append(value)
+    indexes = [
+        constants_idx[value] if kind == "const" else len(constants) + value
+        for kind, value in plan
+    ]
+    return ProjectionPlan(
+        constants,
+        indexes,
+        len(type_columns),
+        lookups,
+        type_columns.get(INFILE_KB_HEAD_TITLE, -1),
+    )
+
+
+# Transform lines of KB data in WikipediaKB format to lines of GenericKB format (projection plans are cached in plans)
+def transform_lines(lines, in_columns, col_type, plans, with_stats: bool = False):
+    out_lines = []
+    for line in lines:
+        # line of data from KB in WikipediaKB format
+        line = line.strip("\n")
+        # empty lines (e.g. at the end of input) hold no entity
+        if not line:
+            continue
+        in_data = line.split("\t")
+        # entity type of this line
+        in_type = in_data[col_type].lower()
+        plan = plans.get(in_type)
+        if plan is None:
+            plan = plans[in_type] = build_projection_plan(in_type, in_columns, with_stats)
+        if in_type in in_columns:
+            if len(in_data) < plan.n_columns:
+                in_data += [""] * (plan.n_columns - len(in_data))
+            extended = plan.constants + in_data
+            out_data = [extended[i] for i in plan.indexes]
+            if plan.lookups:
+                title = in_data[plan.i_title]
+                for i, lookup in plan.lookups:
+                    out_data[i] = lookup.get(title, "")
+            out_lines.append("\t".join(out_data) + "\n")
+    return out_lines
+
+
+# Split file into byte ranges of (approximately) given size on line boundaries
+def find_chunks(fpath, chunk_size):
+    size = os.path.getsize(fpath)
+    chunks = []
+    with open(fpath, "rb") as fin:
+        start = 0
+        while start < size:
+            fin.seek(min(start + chunk_size, size))
+            fin.readline()
+            end = min(fin.tell(), size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+# Yield batches of lines from (possibly endless) stream
+def iter_batches(lines, batch_size=BATCH_LINES):
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+# State of pool worker process (input KB columns and cached projection plans)
+_worker_state = dict()
+
+
+def _init_worker(in_columns, col_type, with_stats):
+    _worker_state.update(
+        in_columns=in_columns, col_type=col_type, with_stats=with_stats, plans=dict()
+    )
+
+
+def _transform_worker_lines(lines):
+    return transform_lines(
+        lines,
+        _worker_state["in_columns"],
+        _worker_state["col_type"],
+        _worker_state["plans"],
+        _worker_state["with_stats"],
+    )
+
+
+# Transform batch of lines, returns number of input rows and output lines
+def _transform_worker_batch(lines):
+    return len(lines), _transform_worker_lines(lines)
+
+
+# Transform chunk (byte range) of input file to output segment file, returns number of input rows
+def _transform_worker_chunk(in_kb, start, end, segment_fpath):
+    with open(in_kb, "rb") as fin_kb:
+        fin_kb.seek(start)
+        data = fin_kb.read(end - start)
+    # text wrapper keeps the same line splitting as reading the whole file in text mode
+    lines = list(io.TextIOWrapper(io.BytesIO(data), encoding="utf8"))
+    with open(segment_fpath, "w", encoding="utf8") as fout_segment:
+        fout_segment.writelines(_transform_worker_lines(lines))
+    return len(lines)
+
+
+# Transform KB data in WikipediaKB format to GenericKB format
+#
+# With more processes, input file is split on line boundaries into chunks converted by a pool of processes into segment files,
+# which are concatenated in order of chunks.
+def transform_data(in_head, in_kb, fout_kb, with_stats: bool = False, processes: int = 1):
+    in_columns, col_type = load_in_columns(in_head)
+
+    time_start = time.time()
+    n_rows = 0
+    if processes > 1:
+        chunk_size = max(
+            1,
+            min(CHUNK_SIZE, os.path.getsize(in_kb) // (processes * CHUNKS_PER_PROCESS)),
+        )
+        chunks = find_chunks(in_kb, chunk_size)
+        segments_dir = tempfile.mkdtemp(
+            prefix=".kbwiki2gkb-", dir=os.path.dirname(os.path.abspath(in_kb))
+        )
+        try:
+            segments = [
+                os.path.join(segments_dir, "{:06d}".format(i)) for i in range(len(chunks))
+            ]
+            with Pool(
+                processes=processes,
+                initializer=_init_worker,
+                initargs=(in_columns, col_type, with_stats),
+            ) as pool:
+                n_rows = sum(
+                    pool.starmap(
+                        _transform_worker_chunk,
+                        [
+                            (in_kb, start, end, segment)
+                            for (start, end), segment in zip(chunks, segments)
+                        ],
+                    )
+                )
+            for segment in segments:
+                with open(segment, "r", encoding="utf8") as fin_segment:
+                    fout_kb.writelines(fin_segment)
+        finally:
+            shutil.rmtree(segments_dir, ignore_errors=True)
+    else:
+        plans = dict()
+        with open(in_kb, "r", encoding="utf8") as fin_kb:
+            for batch in iter_batches(fin_kb):
+                fout_kb.writelines(
+                    transform_lines(batch, in_columns, col_type, plans, with_stats)
+                )
+                n_rows += len(batch)
+    log_throughput(n_rows, time_start)
+
+
+# Transform stream of KB data lines in WikipediaKB format (e.g. standard input) to GenericKB format
+#
+# Lines are converted in batches (by a pool of processes, if requested), output keeps the order of input.
+def transform_stream(in_head, lines, fout_kb, with_stats: bool = False, processes: int = 1):
+    in_columns, col_type = load_in_columns(in_head)
+
+    time_start = time.time()
+    n_rows = 0
+    if processes > 1:
+        with Pool(
+            processes=processes,
+            initializer=_init_worker,
+            initargs=(in_columns, col_type, with_stats),
+        ) as pool:
+            for n_batch, out_lines in pool.imap(
+                _transform_worker_batch, iter_batches(lines)
+            ):
+                fout_kb.writelines(out_lines)
+                n_rows += n_batch
+    else:
+        plans = dict()
+        for batch in iter_batches(lines):
+            fout_kb.writelines(transform_lines(batch, in_columns, col_type, plans, with_stats))
+            n_rows += len(batch)
+    log_throughput(n_rows, time_start)
+
+
+# Transform KB data in columnar format (see libs/ColumnarKB.py) to GenericKB format - columns are projected as whole
+#
+# Rows of all entity types are written in the order of the TSV KB the columnar files were written from (if they keep it).
+def transform_columnar_data(in_head, in_dir, fout_kb, with_stats: bool = False):
+    from libs.ColumnarKB import ColumnarKB
+
+    in_columns, col_type = load_in_columns(in_head)
+
+    time_start = time.time()
+    n_rows = 0
+    ordered_types = []
+    for in_type in in_columns:
+        fpath = os.path.join(in_dir, ColumnarKB.type_fname(in_type))
+        if in_type not in MAP_ENTITIES_BASETYPES or not os.path.exists(fpath):
+            continue
+        table = ColumnarKB.read(fpath)
+        plan = build_projection_plan(in_type, in_columns, with_stats)
+        in_names = sorted(in_columns[in_type], key=in_columns[in_type].get)
+        # columns missing in the columnar file (e.g. stats) are empty
+        available = [name for name in in_names if name in table.column_names]
+        exported = dict(zip(available, zip(*ColumnarKB.iter_rows(table, available))))
+        empty = ("",) * table.num_rows
+        extended = [(value,) * table.num_rows for value in plan.constants] + [
+            exported.get(name, empty) for name in in_names
+        ]
+        out_columns = [extended[i] for i in plan.indexes]
+        for i, lookup in plan.lookups:
+            out_columns[i] = [
+                lookup.get(title, "") for title in extended[len(plan.constants) + plan.i_title]
+            ]
+        out_lines = ("\t".join(out_row) + "\n" for out_row in zip(*out_columns))
+        row_numbers = ColumnarKB.row_numbers(table)
+        if row_numbers is None:
+            fout_kb.writelines(out_lines)
+        else:
+            ordered_types.append(zip(row_numbers, out_lines))
+        n_rows += table.num_rows
+    # rows of each type are in the original order, so they are merged by their row numbers
+    fout_kb.writelines(line for _, line in heapq.merge(*ordered_types))
+    log_throughput(n_rows, time_start)
+
+
+# Writer of KB with stats columns, which writes also KB without stats columns (stats columns are the last ones)
+class StatsSplitWriter:
+    def __init__(self, fout_kb, fout_kb_stats):
+        self.fout_kb = fout_kb
+        self.fout_kb_stats = fout_kb_stats
+        self.n_stats = len(HEAD_STATS)
+
+    def write(self, line):
+        self.fout_kb_stats.write(line)
+        self.fout_kb.write(line.rsplit("\t", self.n_stats)[0] + "\n")
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+
+def log_throughput(n_rows, time_start):
+    elapsed = time.time() - time_start
+    print(
+        "Converted {} rows in {:.2f} s ({:.0f} rows/s).".format(
+            n_rows, elapsed, n_rows / elapsed if elapsed else 0
+        ),
+        file=sys.stderr,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Convert KB in wikipedia format to generic KB format."
+    )
+    parser.add_argument(
+        "--indir",
+        default=".",
+        help="Input files (wikipedia format) directory path (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--outdir",
+        default=".",
+        help="Output files (generic format) directory path (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--inhead",
+        default=INFILE_KB_HEAD,
+        help="Input KB head (wikipedia format) file name (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--inkb",
+        default=INFILE_KB_DATA,
+        help='Input KB data (wikipedia format) file name, "-" for standard input (default: %(default)s).',
+    )
+    parser.add_argument(
+        "--outkb",
+        default=OUTFILE_KB_DATA,
+        help='Output KB (generic format) file name, "-" for standard output\n(default: %(default)s).',
+    )
+    parser.add_argument(
+        "--outkb-stats",
+        metavar="OUTKB_STATS",
+        nargs="?",
+        const=OUTFILE_KB_DATA_STATS,
+        help="Output also KB with stats columns (generic format) into given file name within the same pass (default: %(const)s). Only WIKI HITS and WIKI BACKLINKS are filled, WIKI PRIMARY SENSE, SCORE WIKI, SCORE METRICS and CONFIDENCE are computed by wikipedia_stats/stats_to_kb.py.",
+    )
+    parser.add_argument(
+        "-pw",
+        "--pageviews",
+        help='Pageviews TSV file ("title<TAB>count") to fill WIKI HITS stats column.',
+    )
+    parser.add_argument(
+        "-bps",
+        "--backlinks",
+        help='Backlinks TSV file ("title<TAB>count") to fill WIKI BACKLINKS stats column.',
+    )
+    parser.add_argument(
+        "--incolumnar",
+        metavar="DIR",
+        help="Read input KB data from directory with columnar files (see --columnar of wiki_cs_extract.py) instead of --inkb.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Output KB with stats columns (default: without stats columns).",
+    )
+    parser.add_argument(
+        "-m",
+        default=1,
+        type=int,
+        help="Number of processors of multiprocessing.Pool() for conversion (default: %(default)s).",
+    )
+    args = parser.parse_args()
+    if args.m < 1:
+        args.m = 1
+    # stats columns are filled only in KB with stats columns
+    if (args.pageviews or args.backlinks) and not args.outkb_stats:
+        args.stats = True
+    return args
+
+
+def open_output(outdir, outkb):
+    if outkb == STDIO_FNAME:
+        return io.TextIOWrapper(
+            io.BufferedWriter(sys.stdout.buffer, OUTPUT_BUFFER_SIZE), encoding="utf8"
+        )
+    return open(
+        os.path.join(outdir, outkb), "w", encoding="utf8", buffering=OUTPUT_BUFFER_SIZE
+    )
+
+
+def write_head(fout_kb, in_version, with_stats: bool = False):
+    fout_kb.write("VERSION=" + in_version)
     fout_kb.write("\n")
-    transform_head(fout_kb, args.stats)
+    transform_head(fout_kb, with_stats)
     fout_kb.write("\n")
-    transform_data(
-        os.path.join(args.indir, args.inhead),
-        os.path.join(args.indir, args.inkb),
-        fout_kb,
-        args.stats,
-    )
+
+
+def main():
+    args = parse_args()
+
+    if args.pageviews:
+        STATS_LOOKUPS[__STATS_WHITS] = load_stats(args.pageviews)
+    if args.backlinks:
+        STATS_LOOKUPS[__STATS_WBACKLINKS] = load_stats(args.backlinks)
+
+    fin_kb = None
+    first_line = None
+    if not args.incolumnar and args.inkb == STDIO_FNAME:
+        fin_kb = io.TextIOWrapper(sys.stdin.buffer, encoding="utf8")
+        # wait for the first line of data - producer of data (e.g. wiki_cs_extract.py --kb -) creates HEAD and VERSION files before
+        first_line = fin_kb.readline()
+        fin_kb = chain([first_line], fin_kb)
+
+    with open(os.path.join(args.indir, "VERSION"), "r") as fin_version:
+        in_version = fin_version.read()
+
+    with ExitStack() as stack:
+        fout_kb = stack.enter_context(open_output(args.outdir, args.outkb))
+        # with KB with stats columns, the (main) KB is written without them
+        write_head(fout_kb, in_version, args.stats and not args.outkb_stats)
+        if args.outkb_stats:
+            fout_kb_stats = stack.enter_context(open_output(args.outdir, args.outkb_stats))
+            write_head(fout_kb_stats, in_version, True)
+            fout_kb = StatsSplitWriter(fout_kb, fout_kb_stats)
+            args.stats = True
+        if args.incolumnar:
+            transform_columnar_data(
+                os.path.join(args.indir, args.inhead),
+                args.incolumnar,
+                fout_kb,
+                args.stats,
+            )
+        elif fin_kb is not None:
+            # empty input (e.g. no entities extracted) - output KB consists of head only
+            if not first_line:
+                return
+            transform_stream(
+                os.path.join(args.indir, args.inhead),
+                fin_kb,
+                fout_kb,
+                args.stats,
+                args.m,
+            )
+        else:
+            transform_data(
+                os.path.join(args.indir, args.inhead),
+                os.path.join(args.indir, args.inkb),
+                fout_kb,
+                args.stats,
+                args.m,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'ColumnarKB', jež ukládá znalostní bázi do sloupcového typovaného formátu (Arrow IPC / Feather v2)
+- jeden soubor pro každý typ entity - a načítá ji zpět (s mapováním do paměti, bez kopírování dat).
+
+Poznámky:
+- schéma se odvozuje z hlavičkového souboru HEAD-KB (příznak {m} => seznam řetězců, TYPE => slovníkově kódovaný řetězec,
+  ostatní => řetězec)
+- číselné údaje (rozlohy, počty obyvatel, souřadnice apod.) jsou uloženy v kanonickém textovém tvaru KB (viz
+  QuantityParser) - převod na float64/int64 by nezachoval zápis hodnot (např. "12,50", "45,000", "0,00001") ani přesnost
+  velkých čísel a hodnoty, jež nejsou čistým číslem, by ztratil; zpětný převod do TSV tak dává shodné hodnoty
+- vedle textového sloupce číselného údaje je typovaný sloupec (float64/int64) s názvem doplněným o VALUE_COLUMN_SUFFIX
+  (např. AREA__VALUE), aby jej čtenáři nemuseli převádět z textu; hodnota je null, není-li text čistým číslem
+  (viz QuantityParser.decimal_value a QuantityParser.count_value)
+- každá tabulka obsahuje navíc sloupec s pořadím řádků v TSV KB (ROW_NUMBER_COLUMN), podle nějž lze při čtení obnovit
+  původní pořadí entit napříč typy
+- vyžaduje volitelnou závislost pyarrow (importována až při použití)
+- TSV zůstává výchozím výstupem; sloupcový formát je volitelný (viz argument --columnar)
+"""
+
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from libs.QuantityParser import QuantityParser
+
+
+HEAD_COLUMN_TYPE = "TYPE"
+MULTIPLE_VALUES_SEPARATOR = "|"
+COLUMNAR_SUFFIX = ".arrow"
+ROW_NUMBER_COLUMN = "__ROW_NUMBER__"
+VALUE_COLUMN_SUFFIX = "__VALUE"
+
+# sloupce číselných údajů, k nimž je zapsán typovaný sloupec
+DECIMAL_COLUMNS = {"AREA", "LENGTH", "STREAMFLOW", "TOTAL HEIGHT"}  # desetinná čárka => float64
+COUNT_COLUMNS = {"POPULATION", "WIKI BACKLINKS", "WIKI HITS"}  # => int64
+COORDINATE_COLUMNS = {"LATITUDE", "LONGITUDE"}  # desetinná tečka => float64
+INT64_MAX = 2**63 - 1
+
+RE_COORDINATE = re.compile(r"-?\d+(?:\.\d+)?")
+
+RE_HEAD_TYPE = re.compile(r"^<(.*?)>")
+RE_HEAD_FLAGS = re.compile(r"^{(.*?)}")
+RE_HEAD_PREFIX = re.compile(r"^\[.*?\]")
+
+
+class HeadColumn(NamedTuple):
+    name: str
+    flags: str
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError as e:
+        raise ImportError(
+            "Columnar KB format requires optional dependency pyarrow (pip install pyarrow)."
+        ) from e
+    return pyarrow
+
+
+class ColumnarKB:
+    """
+    Zápis a čtení znalostní báze ve sloupcovém formátu.
+
+    Metody:
+    parse_head(head_fpath) - načte schéma sloupců pro jednotlivé typy entit z HEAD-KB
+    type_fname(ent_type) - název souboru pro daný typ entity
+    write(rows, head_fpath, outdir) - zapíše serializované řádky KB (TSV) do souborů dle typu
+    read(fpath) - načte tabulku jednoho typu s mapováním do paměti
+    iter_rows(table) - vrací řádky tabulky ve formátu TSV (seznamy řetězců)
+    kb_columns(table) - názvy sloupců tabulky odpovídajících sloupcům KB (bez typovaných sloupců a pořadí řádků)
+    row_numbers(table) - vrací pořadí řádků tabulky v TSV KB
+    """
+
+    @staticmethod
+    def parse_head(head_fpath: str) -> Dict[str, List[HeadColumn]]:
+        """
+        Načte schéma sloupců pro jednotlivé typy entit z hlavičkového souboru.
+
+        Parametry:
+        head_fpath - cesta k souboru HEAD-KB (str)
+
+        Návratové hodnoty:
+        Seřazený slovník typ entity => seznam sloupců (název, příznaky). (Dict[str, List[HeadColumn]])
+        """
+        head = OrderedDict()
+        with open(head_fpath, "r", encoding="utf-8") as fl:
+            for line in fl:
+                line = line.rstrip("\n")
+                ent_type = RE_HEAD_TYPE.match(line)
+                if not ent_type:
+                    continue
+                columns = []
+                for column in line[ent_type.end() :].split("\t"):
+                    flags = RE_HEAD_FLAGS.match(column)
+                    if flags:
+                        column = column[flags.end() :]
+                        flags = RE_HEAD_PREFIX.sub("", flags.group(1))
+                    columns.append(HeadColumn(column, flags or ""))
+                head[ent_type.group(1).lower()] = columns
+        return head
+
+    @staticmethod
+    def type_fname(ent_type: str) -> str:
+        return ent_type.replace(":", "-") + COLUMNAR_SUFFIX
+
+    @staticmethod
+    def _arrow_type(pa, column: HeadColumn):
+        if "m" in column.flags:
+            return pa.list_(pa.string())
+        return pa.string()
+
+    @staticmethod
+    def _convert_values(column: HeadColumn, values: List[str]) -> list:
+        if "m" in column.flags:
+            return [v.split(MULTIPLE_VALUES_SEPARATOR) if v else [] for v in values]
+        return [v if v else None for v in values]
+
+    @staticmethod
+    def _typed_values(pa, column: HeadColumn, values: List[str]):
+        """
+        Převede kanonický text číselného údaje na typované hodnoty (None, není-li text čistým číslem).
+
+        Parametry:
+        pa - modul pyarrow
+        column - sloupec KB (HeadColumn)
+        values - kanonické texty hodnot sloupce (List[str])
+
+        Návratové hodnoty:
+        Typ a hodnoty typovaného sloupce; None, nejde-li o číselný údaj. (Optional[Tuple[pyarrow.DataType, list]])
+        """
+        if column.name in DECIMAL_COLUMNS:
+            typed = (QuantityParser.decimal_value(v) for v in values)
+            return pa.float64(), [None if v is None else float(v) for v in typed]
+        if column.name in COUNT_COLUMNS:
+            typed = (QuantityParser.count_value(v) for v in values)
+            return pa.int64(), [v if v is not None and v <= INT64_MAX else None for v in typed]
+        if column.name in COORDINATE_COLUMNS:
+            return pa.float64(), [float(v) if RE_COORDINATE.fullmatch(v) else None for v in values]
+        return None
+
+    @classmethod
+    def write(cls, rows: Iterable[str], head_fpath: str, outdir: str) -> Dict[str, int]:
+        """
+        Zapíše serializované řádky KB do sloupcových souborů (jeden pro každý typ entity).
+
+        Parametry:
+        rows - serializované entity - řádky KB ve formátu TSV (Iterable[str])
+        head_fpath - cesta k souboru HEAD-KB se schématem (str)
+        outdir - výstupní složka (str)
+
+        Návratové hodnoty:
+        Počty zapsaných entit pro jednotlivé typy. (Dict[str, int])
+        """
+        pa = _import_pyarrow()
+        head = cls.parse_head(head_fpath)
+
+        i_type = [c.name for c in next(iter(head.values()))].index(HEAD_COLUMN_TYPE)
+
+        # rozdělení řádků dle typu (sloupce jsou transponovány až při zápisu)
+        rows_by_type = OrderedDict()
+        row_numbers_by_type = dict()
+        i_row = 0
+        for row in rows:
+            if not row:
+                continue
+            values = row.split("\t")
+            ent_type = values[i_type].lower() if len(values) > i_type else ""
+            if ent_type not in head:
+                continue
+            rows_by_type.setdefault(ent_type, []).append(values)
+            row_numbers_by_type.setdefault(ent_type, []).append(i_row)
+            i_row += 1
+
+        os.makedirs(outdir, exist_ok=True)
+        counts = OrderedDict()
+        for ent_type, type_rows in rows_by_type.items():
+            columns = head[ent_type]
+            arrays = []
+            names = []
+            for i_col, column in enumerate(columns):
+                values = [r[i_col] if i_col < len(r) else "" for r in type_rows]
+                converted = cls._convert_values(column, values)
+                if column.name == HEAD_COLUMN_TYPE:
+                    arrays.append(pa.array(converted, type=pa.string()).dictionary_encode())
+                else:
+                    arrays.append(pa.array(converted, type=cls._arrow_type(pa, column)))
+                names.append(column.name)
+                typed = cls._typed_values(pa, column, values)
+                if typed:
+                    arrays.append(pa.array(typed[1], type=typed[0]))
+                    names.append(column.name + VALUE_COLUMN_SUFFIX)
+            arrays.append(pa.array(row_numbers_by_type[ent_type], type=pa.int64()))
+            names.append(ROW_NUMBER_COLUMN)
+            table = pa.Table.from_arrays(arrays, names=names)
+            with pa.OSFile(os.path.join(outdir, cls.type_fname(ent_type)), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            counts[ent_type] = table.num_rows
+        return counts
+
+    @staticmethod
+    def read(fpath: str):
+        """
+        Načte tabulku jednoho typu entity (soubor je mapován do paměti, data nejsou kopírována).
+
+        Parametry:
+        fpath - cesta ke sloupcovému souboru (str)
+
+        Návratové hodnoty:
+        Tabulka entit. (pyarrow.Table)
+        """
+        pa = _import_pyarrow()
+        return pa.ipc.open_file(pa.memory_map(fpath, "r")).read_all()
+
+    @staticmethod
+    def iter_rows(table, columns: Optional[List[str]] = None) -> Iterator[List[str]]:
+        """
+        Vrací řádky tabulky ve formátu TSV KB (seznamy řetězců; seznamy jsou spojeny znakem "|").
+
+        Parametry:
+        table - tabulka entit (pyarrow.Table)
+        columns - názvy sloupců v požadovaném pořadí; výchozí jsou všechny sloupce KB (viz kb_columns) (List[str])
+        """
+        if columns is None:
+            columns = ColumnarKB.kb_columns(table)
+        pycolumns = []
+        for name in columns:
+            values = table.column(name).to_pylist()
+            if str(table.schema.field(name).type).startswith("list"):
+                values = [MULTIPLE_VALUES_SEPARATOR.join(v) if v else "" for v in values]
+            else:
+                values = ["" if v is None else v for v in values]
+            pycolumns.append(values)
+        return (list(row) for row in zip(*pycolumns))
+
+    @staticmethod
+    def kb_columns(table) -> List[str]:
+        """
+        Vrací názvy sloupců tabulky, které odpovídají sloupcům TSV KB (bez typovaných sloupců a sloupce s pořadím řádků).
+
+        Parametry:
+        table - tabulka entit (pyarrow.Table)
+        """
+        return [
+            name
+            for name in table.column_names
+            if name != ROW_NUMBER_COLUMN and not name.endswith(VALUE_COLUMN_SUFFIX)
+        ]
+
+    @staticmethod
+    def row_numbers(table) -> Optional[List[int]]:
+        """
+        Vrací pořadí řádků tabulky v TSV KB, z níž byla tabulka zapsána.
+
+        Parametry:
+        table - tabulka entit (pyarrow.Table)
+
+        Návratové hodnoty:
+        Pořadová čísla řádků, nebo None, pokud je tabulka neobsahuje. (Optional[List[int]])
+        """
+        if ROW_NUMBER_COLUMN not in table.column_names:
+            return None
+        return table.column(ROW_NUMBER_COLUMN).to_pylist()
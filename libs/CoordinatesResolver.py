@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'CoordinatesResolver', jež získává souřadnice stránek z API Wikipedie
+(prop=coordinates) souběžně ve vláknech - s omezeným počtem souběžných dotazů, omezenou frekvencí dotazů
+a dávkováním názvů stránek (více stránek v jednom dotazu).
+
+Poznámky:
+- opakované pokusy (s čekáním) při chybách spojení či odpovědi blokují jen vlákno daného dotazu
+- adresa API je nastavitelná (např. lokální náhradní server pro testování bez přístupu k síti)
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from getpass import getuser
+from random import uniform
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+
+WIKI_API_URL = "https://cs.wikipedia.org/w/api.php"
+WIKI_API_PARAMS_BASE = {
+    "action": "query",
+    "format": "json",
+}
+WIKI_API_ATTEMPTS = 10
+WIKI_API_DELAY_MIN = 1
+WIKI_API_DELAY_MAX = 2
+WIKI_API_MAX_TITLES = 50  # maximální počet názvů stránek v jednom dotazu API
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 5.0  # maximální počet dotazů za sekundu (všech vláken dohromady)
+
+
+def get_user_agent() -> str:
+    """
+    Sestaví hlavičku User-Agent dotazů na API Wikipedie (s kontaktem na spouštějícího uživatele).
+    """
+    mail = ""
+    user = getuser()
+    if user != "root":
+        mail = user + "@" + ("stud." if user[0] == "x" and len(user) == 8 else "") + "fit.vut.cz"
+    if mail != "":
+        mail = f"; {mail}"
+    return f"KNOT FIT BUT/0.0 (http://knot.fit.vut.cz{mail})"
+
+
+class RateLimiter:
+    """
+    Omezuje frekvenci dotazů sdílenou všemi vlákny (rovnoměrně rozložené časové sloty).
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class CoordinatesResolver:
+    """
+    Souběžně získává souřadnice stránek z API Wikipedie.
+
+    Instanční atributy:
+    api_url - adresa API (str)
+    workers - maximální počet souběžných dotazů (int)
+    batch_size - počet názvů stránek v jednom dotazu (int)
+    attempts - maximální počet pokusů o jeden dotaz (int)
+    rate_limiter - omezení frekvence dotazů (RateLimiter)
+    """
+
+    def __init__(
+        self,
+        api_url: str = WIKI_API_URL,
+        workers: int = DEFAULT_WORKERS,
+        rate: float = DEFAULT_RATE,
+        batch_size: int = WIKI_API_MAX_TITLES,
+        attempts: int = WIKI_API_ATTEMPTS,
+    ):
+        self.api_url = api_url
+        self.workers = max(workers, 1)
+        self.batch_size = min(max(batch_size, 1), WIKI_API_MAX_TITLES)
+        self.attempts = attempts
+        self.rate_limiter = RateLimiter(rate)
+        self.headers = {"user-agent": get_user_agent()}
+
+    def resolve(self, titles: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """
+        Získá souřadnice zadaných stránek.
+
+        Parametry:
+        titles - názvy stránek (Iterable[str])
+
+        Návratové hodnoty:
+        Slovník název stránky => (zeměpisná šířka, zeměpisná délka) pro stránky, které souřadnice mají. (Dict[str, Tuple[float, float]])
+        """
+        titles = sorted(set(titles))
+        batches = [
+            titles[i : i + self.batch_size] for i in range(0, len(titles), self.batch_size)
+        ]
+        coordinates = dict()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for batch_coordinates in executor.map(self._resolve_batch, batches):
+                coordinates.update(batch_coordinates)
+        return coordinates
+
+    def _resolve_batch(self, titles: List[str]) -> Dict[str, Tuple[float, float]]:
+        params = WIKI_API_PARAMS_BASE.copy()
+        params["prop"] = "coordinates"
+        params["colimit"] = "max"
+        params["titles"] = "|".join(titles)
+
+        coordinates = dict()
+        normalized = dict()
+        requested = set(titles)
+        try:
+            while True:
+                result = self._request(params, titles)
+                if result is None:
+                    break
+                query = result.get("query", {})
+                for item in query.get("normalized", []):
+                    normalized.setdefault(item["to"], []).append(item["from"])
+                for page in query.get("pages", {}).values():
+                    if "coordinates" in page:
+                        # souřadnice patří všem zadaným názvům stránky (normalizovaným i přímo zadanému)
+                        page_titles = normalized.get(page["title"], [])
+                        if page["title"] in requested:
+                            page_titles = page_titles + [page["title"]]
+                        for title in page_titles:
+                            coordinates.setdefault(
+                                title,
+                                (page["coordinates"][0]["lat"], page["coordinates"][0]["lon"]),
+                            )
+                # pokračování výsledků (souřadnice více stránek nemusí být vráceny v jedné odpovědi)
+                if "continue" not in result:
+                    break
+                params = {**params, **result["continue"]}
+        except Exception as e:
+            print(
+                f'[{datetime.now()}] API Error: Coordinates for "{titles[0]}" (and {len(titles) - 1} other pages) could not be found due to error: {e}.',
+                file=sys.stderr,
+                flush=True,
+            )
+        return coordinates
+
+    def _request(self, params: dict, titles: List[str]) -> Optional[dict]:
+        resp = None
+        for attempt in range(1, self.attempts + 1):
+            delay = uniform(attempt * WIKI_API_DELAY_MIN, attempt * WIKI_API_DELAY_MAX)
+            self.rate_limiter.wait()
+            try:
+                resp = requests.get(self.api_url, headers=self.headers, params=params)
+            except requests.exceptions.ConnectionError as e:
+                print(
+                    f'[{datetime.now()}] API error for attempt no. {attempt} of pages "{titles[0]}"..."{titles[-1]}": {e} - waiting {delay} seconds for next attempt.',
+                    file=sys.stderr,
+                    flush=True,
+                )
+                time.sleep(delay)
+                continue
+            if resp.status_code == 200:
+                return resp.json()
+            if resp.status_code == 429:
+                print(
+                    f'[{datetime.now()}] API error TOO MANY REQUESTS for attempt no. {attempt} of pages "{titles[0]}"..."{titles[-1]}" - waiting {delay} seconds for next attempt.',
+                    file=sys.stderr,
+                    flush=True,
+                )
+            else:
+                print(
+                    f'[{datetime.now()}] API error for attempt no. {attempt} of pages "{titles[0]}"..."{titles[-1]}": {resp.status_code} - {resp.text.strip()} ({resp.url}) - waiting {delay} seconds for next attempt.',
+                    file=sys.stderr,
+                    flush=True,
+                )
+            time.sleep(delay)
+        print(
+            f'[{datetime.now()}] API connection failed (reached maximum connection attempts) for pages "{titles[0]}"..."{titles[-1]}"',
+            file=sys.stderr,
+            flush=True,
+        )
+        return None
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'DateParser', jež převádí česká data z wikitextu (staletí, poloviny staletí, rozsahy,
+šablony {{Datum narození}}/{{Datum úmrtí}}/{{JULGREGDATUM}}, názvy měsíců a data před naším letopočtem)
+na jednotný formát dle standardu ISO 8601.
+
+Poznámky:
+Pravidla jsou zkoušena v pevném pořadí a první pravidlo, které ve vstupu najde shodu, určí výsledek
+(stejně jako původní kaskáda re.sub(".*?vzor.*") volání v EntPerson._convert_date). Vstup je nejdříve jedním
+průchodem rozložen na tokeny (čísla, šablony, značky staletí, kmeny měsíců) a zkoušena jsou jen pravidla,
+jejichž povinné tokeny ve vstupu jsou.
+"""
+
+import re
+from typing import Callable, FrozenSet, List, NamedTuple, Optional
+
+
+TOKEN_NUMBER = "number"
+TOKEN_TEMPLATE = "template"
+TOKEN_CENTURY = "century"
+TOKEN_MONTH = "month"
+
+RE_MONTHS = r"(?:led|úno|bře|dub|kvě|čer|srp|zář|říj|list|pros)"
+
+RE_TOKENS = re.compile(
+    r"(?P<%s>\d)|(?P<%s>{{)|(?P<%s>st)|(?P<%s>%s)"
+    % (TOKEN_NUMBER, TOKEN_TEMPLATE, TOKEN_CENTURY, TOKEN_MONTH, RE_MONTHS),
+    flags=re.I,
+)
+RE_ISO_DATE = re.compile(r"[\d?]+-[\d?]+-[\d?]+")
+RE_ISO_DATE_FULL = re.compile(r"^([\d?]{4})-([\d?]{2})-([\d?]{2})$")
+RE_ISO_RANGE_FULL = re.compile(
+    r"^([\d?]{4})-([\d?]{2})-([\d?]{2})/([\d?]{4})-([\d?]{2})-([\d?]{2})$"
+)
+RE_BC = re.compile(r"př\.?\s*n\.?\s*l\.?", flags=re.I)
+RE_BC_STRICT = re.compile(r"př\.\s*n\.\s*l\.", flags=re.I)
+RE_OTHER_TEMPLATES = re.compile(r"{{(?!\s*datum|\s*julgreg)[^}]+}}", flags=re.I)
+RE_FIRST_HALF = re.compile(r"1\.?|prvn.", flags=re.I)
+RE_WHITESPACES = re.compile(r"\s+")
+
+CAL_MONTHS_PART = (
+    "led",
+    "únor",
+    "břez",
+    "dub",
+    "květ",
+    "červ",
+    "červen",
+    "srp",
+    "září",
+    "říj",
+    "listopad",
+    "prosin",
+)
+
+
+class DateRule(NamedTuple):
+    pattern: "re.Pattern"
+    convert: Callable[["re.Match"], str]
+    tokens: FrozenSet[str]
+
+
+def get_cal_month(month: str) -> str:
+    """
+    Převádí název kalendářního měsíce na číselný tvar.
+
+    Parametry:
+    month - název měsíce (str)
+
+    Návratové hodnoty:
+    Číslo kalendářního měsíce na 2 pozicích, jinak ??. (str)
+    """
+    month_lower = month.lower()
+    for idx, mon in enumerate(CAL_MONTHS_PART, 1):
+        if mon in month_lower:
+            if (
+                idx == 6 and "c" in month
+            ):  # v případě špatné identifikace června a července v některých pádech
+                return "07"
+            return str(idx).zfill(2)
+
+    return "??"
+
+
+def _century_half(m: "re.Match") -> str:
+    # 1. pol. 19. st. -> 1801-??-??/1850-??-??
+    century = int(m.group(2))
+    if RE_FIRST_HALF.search(m.group(1)):
+        return "{:04d}-??-??/{:04d}-??-??".format(
+            (century - 1) * 100 + 1, century * 100 - 50
+        )
+    return "{:04d}-??-??/{:04d}-??-??".format(
+        (century - 1) * 100 + 51, century * 100
+    )
+
+
+def _century_range(m: "re.Match") -> str:
+    # 18.-19. st. -> 1701-??-??/1900-??-??
+    return "{:04d}-??-??/{:04d}-??-??".format(
+        (int(m.group(1)) - 1) * 100 + 1, int(m.group(2)) * 100
+    )
+
+
+def _century(m: "re.Match") -> str:
+    # 19. st. -> 1801-??-??/1900-??-??
+    return "{:04d}-??-??/{:04d}-??-??".format(
+        (int(m.group(1)) - 1) * 100 + 1, int(m.group(1)) * 100
+    )
+
+
+def _year_month_day(m: "re.Match") -> str:
+    # {{Datum narození|1900|1|15}} -> 1900-01-15
+    year = "????" if not m.group(1) else m.group(1).zfill(4)
+    month = "??" if not m.group(2) else m.group(2).zfill(2)
+    day = "??" if not m.group(3) else m.group(3).zfill(2)
+    return "{}-{}-{}".format(year, month, day)
+
+
+def _day_month_year(m: "re.Match") -> str:
+    # 15. 1. 1900 -> 1900-01-15
+    return "{}-{}-{}".format(m.group(3).zfill(4), m.group(2).zfill(2), m.group(1).zfill(2))
+
+
+def _years_range(m: "re.Match") -> str:
+    # 1900–1910 -> 1900-??-??/1910-??-??
+    return "{}-??-??/{}-??-??".format(m.group(1).zfill(4), m.group(2).zfill(4))
+
+
+def _year(m: "re.Match") -> str:
+    # 1900 -> 1900-??-??
+    return "{}-??-??".format(m.group(1).zfill(4))
+
+
+def _day_month(m: "re.Match") -> str:
+    # 15. ledna -> ????-01-15
+    return "????-{}-{}".format(get_cal_month(m.group(2)), m.group(1).zfill(2))
+
+
+def _day_monthname_year(m: "re.Match") -> str:
+    # 15. ledna 1900 -> 1900-01-15
+    return "{}-{}-{}".format(
+        m.group(3).zfill(4), get_cal_month(m.group(2)), m.group(1).zfill(2)
+    )
+
+
+def _monthname_year(m: "re.Match") -> str:
+    # leden 1900 -> 1900-01-??
+    return "{}-{}-??".format(m.group(2).zfill(4), get_cal_month(m.group(1)))
+
+
+def _rule(pattern: str, convert: Callable, tokens, flags=re.I) -> DateRule:
+    return DateRule(re.compile(pattern, flags), convert, frozenset(tokens))
+
+
+RULE_CENTURY_HALF = _rule(
+    r"(\d+\.?|prvn.|druh.)\s*(?:pol(?:\.|ovin.))\s*(\d+)\.?\s*(?:st(?:\.?|ol\.?|oletí))",
+    _century_half,
+    (TOKEN_NUMBER, TOKEN_CENTURY),
+)
+RULE_CENTURY_RANGE = _rule(
+    r"(\d+)\.?\s*(?:až?|[\-–—−/])\s*(\d+)\.?\s*(?:st\.?|stol\.?|století)",
+    _century_range,
+    (TOKEN_NUMBER, TOKEN_CENTURY),
+)
+RULE_CENTURY = _rule(
+    r"(\d+)\.?\s*(?:st\.?|stol\.?|století)",
+    _century,
+    (TOKEN_NUMBER, TOKEN_CENTURY),
+)
+RULE_TEMPLATE_BIRTH = _rule(
+    r"{{\s*datum[\s_]+narození\D*\|\s*(\d*)\s*\|\s*(\d*)\s*\|\s*(\d*)[^}]*}}",
+    _year_month_day,
+    (TOKEN_TEMPLATE,),
+)
+RULE_TEMPLATE_DEATH = _rule(
+    r"{{\s*datum[\s_]+úmrtí\D*\|\s*(\d*)\s*\|\s*(\d*)\s*\|\s*(\d*)[^}]*}}",
+    _year_month_day,
+    (TOKEN_TEMPLATE,),
+)
+RULE_TEMPLATE_ANY = _rule(
+    r"{{\s*datum[\s_]+(?:narození|úmrtí)\D*\|\s*(\d*)\s*\|\s*(\d*)\s*\|\s*(\d*)[^}]*}}",
+    _year_month_day,
+    (TOKEN_TEMPLATE,),
+)
+RULE_TEMPLATE_JULGREG = _rule(
+    r"{{\s*JULGREGDATUM\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+)[^}]*}}",
+    _day_month_year,
+    (TOKEN_TEMPLATE, TOKEN_NUMBER),
+)
+RULE_DAY_MONTHNAME_YEAR = _rule(
+    r"(\d+)\.\s*(" + RE_MONTHS + r"[^\W\d_]+)(?:\s*,)?\s+(\d+)",
+    _day_monthname_year,
+    (TOKEN_NUMBER, TOKEN_MONTH),
+)
+RULE_YEARS_RANGE = _rule(
+    r"(\d+)\s*(?:či|až?|nebo|[\-–—−/])\s*(\d+)",
+    _years_range,
+    (TOKEN_NUMBER,),
+)
+RULE_DAY_MONTH_YEAR = _rule(
+    r"(\d+)\s*\.\s*(\d+)\s*\.\s*(\d+)",
+    _day_month_year,
+    (TOKEN_NUMBER,),
+    flags=0,
+)
+RULE_MONTHNAME_YEAR = _rule(
+    r"(" + RE_MONTHS + r"[^\W\d_]+)(?:\s*,)?\s+(\d+)",
+    _monthname_year,
+    (TOKEN_NUMBER, TOKEN_MONTH),
+)
+RULE_DAY_MONTHNAME = _rule(
+    r"(\d+)\.\s*(" + RE_MONTHS + r"[^\W\d_]+)",
+    _day_month,
+    (TOKEN_NUMBER, TOKEN_MONTH),
+)
+RULE_YEAR = _rule(r"(\d{1,4})", _year, (TOKEN_NUMBER,), flags=0)
+
+
+class DateParser:
+    """
+    Převádí data z wikitextu do jednotného formátu dle standardu ISO 8601.
+
+    Třídní atributy:
+    RULES_BIRTH - pravidla pro datum narození (List[DateRule])
+    RULES_DEATH - pravidla pro datum úmrtí (List[DateRule])
+    RULES_TEMPLATES - pravidla pro šablony s daty v první větě (List[DateRule])
+
+    Metody:
+    parse(date, is_birth) - převede datum narození/úmrtí do jednotného formátu
+    parse_templates(text) - nahradí text datem, obsahuje-li šablonu s datem
+    """
+
+    RULES_CENTURIES = [RULE_CENTURY_HALF, RULE_CENTURY_RANGE, RULE_CENTURY]
+    RULES_PLAIN = [
+        RULE_DAY_MONTHNAME_YEAR,
+        RULE_YEARS_RANGE,
+        RULE_DAY_MONTH_YEAR,
+        RULE_MONTHNAME_YEAR,
+        RULE_DAY_MONTHNAME,
+        RULE_YEAR,
+    ]
+    RULES_BIRTH = (
+        RULES_CENTURIES + [RULE_TEMPLATE_BIRTH, RULE_TEMPLATE_JULGREG] + RULES_PLAIN
+    )
+    RULES_DEATH = (
+        RULES_CENTURIES + [RULE_TEMPLATE_DEATH, RULE_TEMPLATE_JULGREG] + RULES_PLAIN
+    )
+    RULES_TEMPLATES = [RULE_TEMPLATE_ANY, RULE_TEMPLATE_JULGREG]
+
+    @staticmethod
+    def tokenize(text: str) -> FrozenSet[str]:
+        """
+        Jedním průchodem zjistí druhy tokenů, které text obsahuje.
+
+        Parametry:
+        text - vstupní text (str)
+
+        Návratové hodnoty:
+        Množina druhů tokenů. (FrozenSet[str])
+        """
+        return frozenset(m.lastgroup for m in RE_TOKENS.finditer(text))
+
+    @classmethod
+    def apply_rules(cls, text: str, rules: List[DateRule]) -> str:
+        """
+        Aplikuje pravidla v daném pořadí; pravidlo se neaplikuje, pokud text již začíná datem ve standardizovaném formátu.
+
+        Parametry:
+        text - vstupní text (str)
+        rules - pravidla k aplikaci (List[DateRule])
+
+        Návratové hodnoty:
+        Převedený text. (str)
+        """
+        tokens = None
+        for rule in rules:
+            if RE_ISO_DATE.match(text):
+                break
+            if tokens is None:
+                tokens = cls.tokenize(text)
+            if not rule.tokens <= tokens:
+                continue
+            m = rule.pattern.search(text)
+            if m:
+                text = rule.convert(m)
+                tokens = None
+        return text
+
+    @classmethod
+    def parse_templates(cls, text: str) -> str:
+        """
+        Obsahuje-li text šablonu s datem narození/úmrtí nebo JULGREGDATUM, je celý nahrazen tímto datem.
+
+        Parametry:
+        text - vstupní text (str)
+        """
+        return cls.apply_rules(text, cls.RULES_TEMPLATES)
+
+    @classmethod
+    def parse(cls, date: str, is_birth: bool) -> str:
+        """
+        Zpracuje a konvertuje datum narození/úmrtí osoby do jednotného formátu.
+
+        Parametry:
+        date - datum narození/úmrtí osoby (str)
+        is_birth - určuje, zda se jedná o datum narození, či úmrtí (bool)
+
+        Návratové hodnoty:
+        Datum narození/úmrtí osoby v jednotném formátu. (str)
+        """
+        # detekce př. n. l.
+        date_bc = True if RE_BC.search(date) else False
+
+        # datum před úpravou
+        orig_date = date[:]
+
+        # odstranění přebytečného textu
+        date = date.replace("?", "").replace("~", "")
+        date = RE_OTHER_TEMPLATES.sub("", date)
+        date = RE_BC_STRICT.sub("", date)
+
+        date = cls.apply_rules(date, cls.RULES_BIRTH if is_birth else cls.RULES_DEATH)
+
+        # odstranění zdvojených bílých znaků a jejich převod na mezery
+        if not RE_ISO_DATE.match(date):
+            date = RE_WHITESPACES.sub(" ", date)
+        date = date.strip()
+
+        # odstranění nezkonvertovatelných dat
+        date = "" if orig_date == date else date
+
+        if date and date_bc:
+            date = cls._to_bc(date)
+
+        return date
+
+    @staticmethod
+    def _to_bc(date: str) -> str:
+        """
+        Převádí datum na formát data před naším letopočtem.
+
+        Parametry:
+        date - datum v jednotném formátu (str)
+        """
+        rexp = RE_ISO_DATE_FULL.search(date)
+        if rexp and rexp.group(1):
+            if rexp.group(1) != "????":
+                bc_year = (
+                    "-" + str(int(rexp.group(1)) - 1).zfill(4)
+                    if rexp.group(1) != "0001"
+                    else "0000"
+                )
+                date = "{}-{}-{}".format(bc_year, rexp.group(2), rexp.group(3))
+        else:
+            rexp = RE_ISO_RANGE_FULL.search(date)
+            if rexp and rexp.group(1) and rexp.group(4):
+                if rexp.group(1) != "????" and rexp.group(4) != "????":
+                    yr1, yr2 = int(rexp.group(1)), int(rexp.group(4))
+                    if yr1 < yr2:  # prohození hodnot, pokud je první rok menší než druhý
+                        yr1, yr2 = yr2, yr1
+                    bc_year1 = "-" + str(yr1 - 1).zfill(4) if yr1 != 1 else "0000"
+                    bc_year2 = "-" + str(yr2 - 1).zfill(4) if yr2 != 1 else "0000"
+                    date = "{}-{}-{}/{}-{}-{}".format(
+                        bc_year1,
+                        rexp.group(2),
+                        rexp.group(3),
+                        bc_year2,
+                        rexp.group(6),
+                        rexp.group(6),
+                    )
+        return date
+
+
+# mikro-benchmark: python3 -m libs.DateParser [počet opakování]
+if __name__ == "__main__":
+    import sys
+    import timeit
+
+    samples = [
+        "15. ledna 1900",
+        "{{Datum narození|1900|1|15}}",
+        "{{JULGREGDATUM|3|3|1700}}",
+        "1. pol. 19. st.",
+        "18.–19. století",
+        "kolem 1340",
+        "1900–1910",
+        "15. 1. 1900",
+        "březen 1848",
+        "20. března",
+        "44 př. n. l.",
+        "[[15. leden|15. ledna]] [[1900]] ve [[Praha|Praze]]",
+    ]
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for sample in samples:
+        seconds = timeit.timeit(lambda: DateParser.parse(sample, True), number=repeat)
+        print(
+            "{:>10.2f} us  {!r} -> {!r}".format(
+                seconds / repeat * 1e6, sample, DateParser.parse(sample, True)
+            )
+        )
@@ -7,6 +7,9 @@ from libs.UniqueDict import *
 
 
 class DictOfUniqueDict(dict):
+    __slots__ = ()
+
     def __missing__(self, key):
-        self[key] = UniqueDict()
-        return self[key]
+        value = UniqueDict()
+        dict.__setitem__(self, key, value)
+        return value
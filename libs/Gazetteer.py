@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'Gazetteer' - slovník pojmenování entit pro rozpoznávání pojmenovaných entit (NER), jenž
+mapuje normalizovaná pojmenování (jména, aliasy a přesměrování entit ze znalostní báze) na ID entit s příznaky
+jazyka a typu jména. Slovník je uložen v jednom binárním souboru, jenž se při načtení mapuje do paměti (mmap)
+a pole se čtou přímo z mapované paměti bez kopírování.
+
+Formát souboru:
+- hlavička - MAGIC, verze a tabulka sekcí (pozice a velikost každé sekce)
+- klíče - normalizovaná pojmenování (UTF-8) seřazená podle bajtů a pole jejich pozic (uint32)
+- záznamy - pro každý klíč úsek polí entit (index entity) a příznaků (zdroj pojmenování, jazyk a typ jména)
+- hašovací tabulka - index klíče + 1 pro každou pozici (0 - prázdná pozice; otevřené adresování, crc32)
+- entity - ID entit a indexy jejich typů
+- tabulky řetězců - typy entit, jazyky a typy jmen (oddělené znakem nového řádku)
+
+Poznámky:
+- normalizace pojmenování: Unicode NFC, sloučení bílých znaků do jedné mezery a převod na malá písmena (casefold)
+- přesné vyhledání probíhá přes hašovací tabulku (jedno porovnání klíče v typickém případě), vyhledání podle
+  předpony (např. pro hledání nejdelší shody v textu) binárním vyhledáváním nad seřazenými klíči
+- pole jsou uložena v pořadí bajtů little-endian a čtena jako nativní pole (memoryview.cast)
+"""
+
+import mmap
+import struct
+import sys
+import unicodedata
+import zlib
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from libs.ColumnarKB import HEAD_COLUMN_TYPE, MULTIPLE_VALUES_SEPARATOR, ColumnarKB
+
+
+MAGIC = b"EKBGAZET"
+VERSION = 1
+SECTIONS = (
+    "key_offsets",
+    "key_entries",
+    "entry_entities",
+    "entry_flags",
+    "slots",
+    "entity_offsets",
+    "entity_types",
+    "keys",
+    "entity_ids",
+    "types",
+    "langs",
+    "ntypes",
+)
+HEADER = struct.Struct("<8sI" + "QQ" * len(SECTIONS))  # MAGIC, verze, (pozice, velikost) sekcí
+SECTION_ALIGNMENT = 8
+
+SOURCE_NAME = 0
+SOURCE_ALIAS = 1
+SOURCE_REDIRECT = 2
+SOURCES = ("name", "alias", "redirect")
+# příznaky záznamu (uint32) - zdroj pojmenování (bity 0-3), index jazyka (bity 4-17) a index typu jména (bity 18-31)
+SOURCE_MASK = 0xF
+LANG_SHIFT = 4
+NTYPE_SHIFT = 18
+TABLE_INDEX_MASK = 0x3FFF
+
+KEY_LANG = "lang"
+KEY_NAMETYPE = "ntype"
+FLAG_SEPARATOR = "#"
+
+
+class GazetteerEntry(NamedTuple):
+    """
+    Záznam pojmenování - ID a typ entity, zdroj pojmenování (jméno / alias / přesměrování), jazyk a typ jména
+    (prázdné řetězce, nejsou-li uvedeny).
+    """
+
+    eid: str
+    ent_type: str
+    source: str
+    lang: str
+    ntype: str
+
+
+def normalize(form: str) -> str:
+    """
+    Normalizuje pojmenování pro vyhledávání ve slovníku.
+
+    Parametry:
+    form - pojmenování (str)
+
+    Návratové hodnoty:
+    Normalizované pojmenování. (str)
+    """
+    return " ".join(unicodedata.normalize("NFC", form).split()).casefold()
+
+
+def _parse_alias(alias: str) -> Tuple[str, str, str]:
+    # alias#lang=cs#ntype=nick (viz EntCore.serialize_aliases) - příznaky jsou odděleny od konce aliasu
+    lang = ""
+    ntype = ""
+    while True:
+        form, separator, flag = alias.rpartition(FLAG_SEPARATOR)
+        key, _, value = flag.partition("=")
+        if not separator or key not in (KEY_LANG, KEY_NAMETYPE) or "=" not in flag:
+            return alias, lang, ntype
+        if key == KEY_LANG:
+            lang = value
+        else:
+            ntype = value
+        alias = form
+
+
+class Gazetteer:
+    """
+    Slovník pojmenování entit.
+
+    Instanční atributy:
+    fpath - cesta k souboru slovníku (str)
+    """
+
+    def __init__(self, fpath: str):
+        self.fpath = fpath
+        self._fread = open(fpath, "rb")
+        self._mm = mmap.mmap(self._fread.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mm)
+        header = HEADER.unpack_from(buffer, 0)
+        if header[0] != MAGIC or header[1] != VERSION or sys.byteorder != "little":
+            buffer.release()
+            self._mm.close()
+            self._fread.close()
+            raise ValueError(
+                'File "{}" is not a valid gazetteer (or platform is not little-endian).'.format(fpath)
+            )
+
+        sections = dict()
+        for i_section, name in enumerate(SECTIONS):
+            offset, size = header[2 + 2 * i_section : 4 + 2 * i_section]
+            sections[name] = buffer[offset : offset + size]
+        # všechny pohledy do mapované paměti musí být před jejím uzavřením uvolněny (viz close)
+        self._views = [buffer] + list(sections.values())
+        for name in SECTIONS[:7]:
+            sections[name] = sections[name].cast("I")
+            self._views.append(sections[name])
+        self._key_offsets = sections["key_offsets"]
+        self._key_entries = sections["key_entries"]
+        self._entry_entities = sections["entry_entities"]
+        self._entry_flags = sections["entry_flags"]
+        self._slots = sections["slots"]
+        self._entity_offsets = sections["entity_offsets"]
+        self._entity_types = sections["entity_types"]
+        self._keys = sections["keys"]
+        self._entity_ids = sections["entity_ids"]
+        # tabulky řetězců jsou malé (desítky hodnot), dekódují se při načtení
+        self._types = bytes(sections["types"]).decode("utf-8").split("\n")
+        self._langs = bytes(sections["langs"]).decode("utf-8").split("\n")
+        self._ntypes = bytes(sections["ntypes"]).decode("utf-8").split("\n")
+        self._slot_mask = len(self._slots) - 1
+
+    @classmethod
+    def build(cls, rows: Iterable[str], head_fpath: str, fpath: str) -> Dict[str, int]:
+        """
+        Vytvoří slovník ze serializovaných entit (řádků KB) - z jejich jmen, aliasů a přesměrování.
+
+        Parametry:
+        rows - serializované entity - řádky KB ve formátu TSV (Iterable[str])
+        head_fpath - cesta k souboru HEAD-KB se schématem (str)
+        fpath - cesta k výstupnímu souboru slovníku (str)
+
+        Návratové hodnoty:
+        Počty entit, pojmenování (klíčů) a záznamů slovníku. (Dict[str, int])
+        """
+        head = {
+            ent_type: [column.name for column in columns]
+            for ent_type, columns in ColumnarKB.parse_head(head_fpath).items()
+        }
+        i_type = next(iter(head.values())).index(HEAD_COLUMN_TYPE)
+
+        tables = {"types": dict(), "langs": {"": 0}, "ntypes": {"": 0}}
+
+        def intern(table, value):
+            return tables[table].setdefault(value, len(tables[table]))
+
+        forms = dict()
+        entity_ids = []
+        entity_types = array("I")
+        for row in rows:
+            if not row:
+                continue
+            values = row.split("\t")
+            columns = head.get(values[i_type].lower()) if len(values) > i_type else None
+            if not columns:
+                continue
+            values = dict(zip(columns, values))
+            i_entity = len(entity_ids)
+            entity_ids.append(values["ID"])
+            entity_types.append(intern("types", values[HEAD_COLUMN_TYPE]))
+
+            surface_forms = [(values["NAME"], SOURCE_NAME, "", "")]
+            for alias in filter(None, values.get("ALIASES", "").split(MULTIPLE_VALUES_SEPARATOR)):
+                form, lang, ntype = _parse_alias(alias)
+                surface_forms.append((form, SOURCE_ALIAS, lang, ntype))
+            for redirect in filter(None, values.get("REDIRECTS", "").split(MULTIPLE_VALUES_SEPARATOR)):
+                surface_forms.append((redirect, SOURCE_REDIRECT, "", ""))
+
+            for form, source, lang, ntype in surface_forms:
+                key = normalize(form)
+                if not key:
+                    continue
+                flags = (
+                    source
+                    | intern("langs", lang) << LANG_SHIFT
+                    | intern("ntypes", ntype) << NTYPE_SHIFT
+                )
+                forms.setdefault(key.encode("utf-8"), dict())[(i_entity, flags)] = None
+
+        if max(len(tables["langs"]), len(tables["ntypes"])) > TABLE_INDEX_MASK + 1:
+            raise ValueError("Too many distinct languages or name types for gazetteer.")
+        keys = sorted(forms)
+        key_offsets = array("I", [0])
+        key_entries = array("I", [0])
+        entry_entities = array("I")
+        entry_flags = array("I")
+        for key in keys:
+            key_offsets.append(key_offsets[-1] + len(key))
+            for i_entity, flags in forms[key]:
+                entry_entities.append(i_entity)
+                entry_flags.append(flags)
+            key_entries.append(len(entry_entities))
+        del forms
+
+        n_slots = 1
+        while n_slots < 2 * len(keys):
+            n_slots *= 2
+        slots = array("I", bytes(4 * n_slots))
+        for i_key, key in enumerate(keys):
+            i_slot = zlib.crc32(key) & (n_slots - 1)
+            while slots[i_slot]:
+                i_slot = (i_slot + 1) & (n_slots - 1)
+            slots[i_slot] = i_key + 1
+
+        entity_ids_data = [entity_id.encode("utf-8") for entity_id in entity_ids]
+        entity_offsets = array("I", [0])
+        for entity_id in entity_ids_data:
+            entity_offsets.append(entity_offsets[-1] + len(entity_id))
+
+        data = {
+            "key_offsets": key_offsets,
+            "key_entries": key_entries,
+            "entry_entities": entry_entities,
+            "entry_flags": entry_flags,
+            "slots": slots,
+            "entity_offsets": entity_offsets,
+            "entity_types": entity_types,
+            "keys": b"".join(keys),
+            "entity_ids": b"".join(entity_ids_data),
+            "types": "\n".join(tables["types"]).encode("utf-8"),
+            "langs": "\n".join(tables["langs"]).encode("utf-8"),
+            "ntypes": "\n".join(tables["ntypes"]).encode("utf-8"),
+        }
+        for name in SECTIONS:
+            if isinstance(data[name], array):
+                if sys.byteorder != "little":
+                    data[name].byteswap()
+                data[name] = data[name].tobytes()
+
+        with open(fpath, "wb") as fl:
+            fl.write(bytes(HEADER.size))
+            sections = []
+            for name in SECTIONS:
+                fl.write(bytes(-fl.tell() % SECTION_ALIGNMENT))
+                sections.extend((fl.tell(), len(data[name])))
+                fl.write(data[name])
+            fl.seek(0)
+            fl.write(HEADER.pack(MAGIC, VERSION, *sections))
+
+        return {"entities": len(entity_ids), "forms": len(keys), "entries": len(entry_entities)}
+
+    def lookup(self, form: str) -> List[GazetteerEntry]:
+        """
+        Vyhledá entity zadaného pojmenování.
+
+        Parametry:
+        form - pojmenování (normalizuje se, viz normalize) (str)
+
+        Návratové hodnoty:
+        Záznamy pojmenování (prázdný seznam, není-li ve slovníku). (List[GazetteerEntry])
+        """
+        i_key = self.find(normalize(form).encode("utf-8"))
+        if i_key is None:
+            return []
+        return self._entries(i_key)
+
+    def find(self, key: bytes) -> Optional[int]:
+        """
+        Vyhledá index normalizovaného pojmenování (bez normalizace a dekódování záznamů - nejrychlejší vyhledání).
+
+        Parametry:
+        key - normalizované pojmenování v kódování UTF-8 (bytes)
+
+        Návratové hodnoty:
+        Index pojmenování (viz entries), nebo None, není-li ve slovníku. (Optional[int])
+        """
+        slots = self._slots
+        key_offsets = self._key_offsets
+        i_slot = zlib.crc32(key) & self._slot_mask
+        while True:
+            i_key = slots[i_slot]
+            if not i_key:
+                return None
+            if self._keys[key_offsets[i_key - 1] : key_offsets[i_key]] == key:
+                return i_key - 1
+            i_slot = (i_slot + 1) & self._slot_mask
+
+    def entries(self, i_key: int) -> List[GazetteerEntry]:
+        """
+        Vrací záznamy pojmenování zadaného indexu (viz find).
+
+        Parametry:
+        i_key - index pojmenování (int)
+        """
+        return self._entries(i_key)
+
+    def iter_prefix(self, prefix: str) -> Iterator[Tuple[str, List[GazetteerEntry]]]:
+        """
+        Prochází pojmenování začínající zadanou předponou (v pořadí bajtů jejich UTF-8 reprezentace).
+
+        Parametry:
+        prefix - předpona pojmenování (normalizuje se, viz normalize) (str)
+
+        Návratové hodnoty:
+        Dvojice (normalizované pojmenování, záznamy pojmenování). (Iterator[Tuple[str, List[GazetteerEntry]]])
+        """
+        prefix = normalize(prefix).encode("utf-8")
+        key_offsets = self._key_offsets
+        i_low, i_high = 0, len(self)
+        while i_low < i_high:
+            i_mid = (i_low + i_high) // 2
+            if bytes(self._keys[key_offsets[i_mid] : key_offsets[i_mid + 1]]) < prefix:
+                i_low = i_mid + 1
+            else:
+                i_high = i_mid
+        for i_key in range(i_low, len(self)):
+            key = bytes(self._keys[key_offsets[i_key] : key_offsets[i_key + 1]])
+            if not key.startswith(prefix):
+                break
+            yield key.decode("utf-8"), self._entries(i_key)
+
+    def __len__(self) -> int:
+        return len(self._key_offsets) - 1
+
+    def __contains__(self, form: str) -> bool:
+        return self.find(normalize(form).encode("utf-8")) is not None
+
+    def close(self) -> None:
+        """
+        Uzavře slovník (pole získaná ze slovníku nesmí být poté používána).
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._fread.close()
+
+    def _entries(self, i_key: int) -> List[GazetteerEntry]:
+        entries = []
+        for i_entry in range(self._key_entries[i_key], self._key_entries[i_key + 1]):
+            i_entity = self._entry_entities[i_entry]
+            flags = self._entry_flags[i_entry]
+            entries.append(
+                GazetteerEntry(
+                    bytes(
+                        self._entity_ids[
+                            self._entity_offsets[i_entity] : self._entity_offsets[i_entity + 1]
+                        ]
+                    ).decode("utf-8"),
+                    self._types[self._entity_types[i_entity]],
+                    SOURCES[flags & SOURCE_MASK],
+                    self._langs[flags >> LANG_SHIFT & TABLE_INDEX_MASK],
+                    self._ntypes[flags >> NTYPE_SHIFT & TABLE_INDEX_MASK],
+                )
+            )
+        return entries
+
+
+if __name__ == "__main__":
+    # vytvoření slovníku z KB (python3 -m libs.Gazetteer build KB HEAD-KB SLOVNÍK), výpis záznamů zadaných
+    # pojmenování nebo informací o slovníku a rychlosti vyhledávání (python3 -m libs.Gazetteer SLOVNÍK [POJMENOVÁNÍ ...])
+    # (spouštět z kořenového adresáře projektu)
+    import time
+
+    if sys.argv[1] == "build":
+        with open(sys.argv[2], "r", encoding="utf-8") as fl:
+            counts = Gazetteer.build((line.rstrip("\n") for line in fl), sys.argv[3], sys.argv[4])
+        print(", ".join("{}={}".format(k, v) for k, v in counts.items()))
+        sys.exit(0)
+
+    gazetteer = Gazetteer(sys.argv[1])
+    if len(sys.argv) > 2:
+        for form in sys.argv[2:]:
+            entries = gazetteer.lookup(form)
+            if not entries:
+                print('"{}" not found.'.format(form), file=sys.stderr)
+            for entry in entries:
+                print(form + "\t" + "\t".join(entry))
+    else:
+        keys = [
+            bytes(gazetteer._keys[gazetteer._key_offsets[i] : gazetteer._key_offsets[i + 1]])
+            for i in range(0, len(gazetteer), max(1, len(gazetteer) // 100000))
+        ]
+        forms = [key.decode("utf-8") for key in keys]
+        time_start = time.perf_counter()
+        for key in keys:
+            gazetteer.find(key)
+        time_find = time.perf_counter() - time_start
+        time_start = time.perf_counter()
+        for form in forms:
+            gazetteer.lookup(form)
+        time_lookup = time.perf_counter() - time_start
+        print(
+            "{} forms, {} entities, {:.1f} MB; find {:.2f} us, lookup (normalization, entries) {:.2f} us".format(
+                len(gazetteer),
+                len(gazetteer._entity_offsets) - 1,
+                len(gazetteer._mm) / 1024 / 1024,
+                time_find / len(keys) * 1e6,
+                time_lookup / len(forms) * 1e6,
+            )
+        )
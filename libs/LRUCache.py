@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'LRUCache', jež slouží jako omezená LRU paměť výsledků čistých (bezstavových) funkcí.
+
+Poznámky:
+Velikost všech pamětí se nastavuje společně (např. z argumentu --cache-size) metodou LRUCache.set_max_size().
+Paměti jsou v rámci procesu; při multiprocessingu má každý pracovní proces vlastní paměti a čítače.
+"""
+
+import functools
+import os
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from multiprocessing.util import Finalize
+from typing import Callable, List, Tuple
+
+
+DEFAULT_MAX_SIZE = 65536
+
+
+class LRUCache:
+    """
+    Omezená LRU paměť výsledků funkce s čítači zásahů a výpadků.
+
+    Instanční atributy:
+    func - obalovaná funkce (Callable)
+    cache - uložené výsledky (OrderedDict)
+    hits - počet zásahů (int)
+    misses - počet výpadků (int)
+
+    Třídní atributy:
+    instances - všechny vytvořené paměti (List[LRUCache])
+    max_size - maximální počet položek v jedné paměti; 0 paměti vypíná (int)
+    """
+
+    instances = []
+    max_size = DEFAULT_MAX_SIZE
+
+    def __init__(self, func: Callable):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        LRUCache.instances.append(self)
+
+    def __call__(self, *args, **kwargs):
+        key = args + tuple(kwargs.items()) if kwargs else args
+        try:
+            result = self.cache[key]
+        except KeyError:
+            pass
+        else:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = self.func(*args, **kwargs)
+        if LRUCache.max_size > 0:
+            self.cache[key] = result
+            if len(self.cache) > LRUCache.max_size:
+                self.cache.popitem(last=False)
+        return result
+
+    def cache_clear(self) -> None:
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def set_max_size(cls, max_size: int) -> None:
+        """
+        Nastaví maximální velikost všech pamětí (a zkrátí již naplněné).
+
+        Parametry:
+        max_size - maximální počet položek v jedné paměti; 0 paměti vypíná (int)
+        """
+        cls.max_size = max(max_size, 0)
+        for instance in cls.instances:
+            while len(instance.cache) > cls.max_size:
+                instance.cache.popitem(last=False)
+
+    @classmethod
+    def stats(cls) -> List[Tuple[str, int, int, int]]:
+        """
+        Vrací statistiky všech pamětí jako seznam (název funkce, zásahy, výpadky, počet položek).
+        """
+        return [
+            (instance.__qualname__, instance.hits, instance.misses, len(instance.cache))
+            for instance in cls.instances
+        ]
+
+    @classmethod
+    def log_stats_at_exit(cls) -> None:
+        """
+        Zaregistruje výpis statistik při ukončení (pracovního) procesu; vhodné jako initializer pro multiprocessing.Pool.
+        """
+        Finalize(None, cls.log_stats, exitpriority=0)
+
+    @classmethod
+    def log_stats(cls, file=sys.stderr) -> None:
+        """
+        Vypíše statistiky všech použitých pamětí.
+        """
+        for name, hits, misses, size in cls.stats():
+            if hits or misses:
+                print(
+                    "[{}] cache {} (pid {}): hits={}, misses={}, hit rate={:.1%}, size={}/{}".format(
+                        str(datetime.now().time()),
+                        name,
+                        os.getpid(),
+                        hits,
+                        misses,
+                        hits / (hits + misses),
+                        size,
+                        cls.max_size,
+                    ),
+                    file=file,
+                    flush=True,
+                )
+
+
+def lru_cache(func: Callable) -> LRUCache:
+    """
+    Dekorátor obalující čistou funkci omezenou LRU pamětí výsledků.
+    """
+    return LRUCache(func)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'MultistreamReader' pro náhodný přístup ke stránkám multistream XML dumpu Wikipedie
+(*-pages-articles-multistream.xml.bz2) podle jejich názvů - pozice proudů bz2 obsahujících hledané stránky zjistí
+z indexu dumpu (*-pages-articles-multistream-index.txt.bz2) a dekomprimuje jen tyto proudy.
+
+Poznámky:
+- řádek indexu má tvar "POZICE_PROUDU:ID_STRÁNKY:NÁZEV_STRÁNKY" (název může obsahovat dvojtečky); názvy jsou
+  v indexu zapsány s XML entitami (např. "&amp;", "&quot;", "&#039;"), před porovnáním jsou proto dekódovány
+- jeden proud obsahuje (typicky 100) celých stránek bez kořenového elementu, pro parsování je proto obalen
+  elementem <mediawiki>
+- index je čten jen do nalezení všech hledaných názvů; nekomprimovaný index (bez přípony .bz2) je také podporován
+"""
+
+import bz2
+import html
+import sys
+from typing import Dict, Iterable, Iterator, Set
+
+from libs.PageReader import CHUNK_SIZE, Page, PageReader
+
+
+STREAM_START = b"<mediawiki>"
+STREAM_END = b"</mediawiki>"
+
+
+class MultistreamReader:
+    """
+    Čtení vybraných stránek multistream XML dumpu Wikipedie.
+
+    Instanční atributy:
+    fpath - cesta k multistream XML dumpu (str)
+    index_fpath - cesta k indexu multistream XML dumpu (str)
+    missing - názvy stránek posledního čtení, které v indexu nebyly nalezeny (Set[str])
+    n_streams - počet dekomprimovaných proudů posledního čtení (int)
+    """
+
+    def __init__(self, fpath: str, index_fpath: str):
+        self.fpath = fpath
+        self.index_fpath = index_fpath
+        self.missing = set()
+        self.n_streams = 0
+
+    def find_streams(self, titles: Iterable[str]) -> Dict[int, Set[str]]:
+        """
+        Vyhledá v indexu dumpu pozice proudů obsahujících stránky zadaných názvů.
+
+        Parametry:
+        titles - názvy stránek (Iterable[str])
+
+        Návratové hodnoty:
+        Slovník s pozicemi proudů (v bajtech) jako klíči a množinami názvů stránek v nich obsažených jako hodnotami. (Dict[int, Set[str]])
+        """
+        remaining = set(titles)
+        streams = dict()
+        open_index = bz2.open if self.index_fpath.endswith(".bz2") else open
+        with open_index(self.index_fpath, "rt", encoding="utf-8") as fin:
+            for line in fin:
+                offset, _, title = line.rstrip("\n").split(":", 2)
+                if "&" in title:
+                    title = html.unescape(title)
+                if title in remaining:
+                    streams.setdefault(int(offset), set()).add(title)
+                    remaining.remove(title)
+                    if not remaining:
+                        break
+        self.missing = remaining
+        return streams
+
+    def read(self, titles: Iterable[str]) -> Iterator[Page]:
+        """
+        Přečte z dumpu stránky zadaných názvů (v pořadí jejich výskytu v dumpu).
+
+        Parametry:
+        titles - názvy stránek (Iterable[str])
+
+        Návratové hodnoty:
+        Nalezené stránky. (Iterator[Page])
+        """
+        streams = self.find_streams(titles)
+        self.n_streams = len(streams)
+        reader = PageReader(None)
+        with open(self.fpath, "rb") as fin:
+            for offset in sorted(streams):
+                wanted = streams[offset]
+                for page in reader.parse(self._read_stream(fin, offset)):
+                    if page.title in wanted:
+                        yield page
+
+    @staticmethod
+    def _read_stream(fin, offset: int) -> Iterator[bytes]:
+        fin.seek(offset)
+        decompressor = bz2.BZ2Decompressor()
+        yield STREAM_START
+        while not decompressor.eof:
+            data = fin.read(CHUNK_SIZE)
+            if not data:
+                break
+            yield decompressor.decompress(data)
+        yield STREAM_END
+
+
+if __name__ == "__main__":
+    # výpis textu zadaných stránek (spouštět z kořenového adresáře projektu:
+    # python3 -m libs.MultistreamReader DUMP INDEX NÁZEV_STRÁNKY [NÁZEV_STRÁNKY ...])
+    reader = MultistreamReader(sys.argv[1], sys.argv[2])
+    for page in reader.read(sys.argv[3:]):
+        print("{}\tid={}\tns={}\tredirect={}\n{}".format(page.title, page.id, page.ns, page.redirect, page.text))
+    for title in sorted(reader.missing):
+        print('Page "{}" not found.'.format(title), file=sys.stderr)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'PageReader', jež čte stránky z XML dumpu Wikipedie nízkoúrovňovým parserem expat
+a vrací jen údaje potřebné pro extrakci - jmenný prostor, název, příznak přesměrování, text a ID stránky.
+
+Poznámky:
+- pro ostatní elementy dumpu se nevytvářejí žádné objekty (stromy elementů, události)
+- znaková data se předávají jen u zachytávaných elementů (obsluha se zapíná a vypíná za běhu)
+- text stránek mimo požadované jmenné prostory (a přesměrování, jsou-li přeskakována) se vůbec nesestavuje
+"""
+
+from typing import Iterable, Iterator, NamedTuple, Optional, Set
+from xml.parsers import expat
+
+
+CHUNK_SIZE = 1024 * 1024  # velikost bloku čteného ze souboru (v bajtech)
+TEXT_BUFFER_SIZE = 1024 * 1024  # velikost bufferu znakových dat parseru (méně volání obsluhy pro dlouhé texty)
+
+CAPTURED_ELEMENTS = {"title", "ns", "id", "text"}
+
+
+class Page(NamedTuple):
+    """
+    Stránka dumpu - jmenný prostor, název, příznak přesměrování, text (None, pokud stránka text nemá) a ID stránky.
+    """
+
+    ns: int
+    title: str
+    redirect: bool
+    text: Optional[str]
+    id: int = 0
+
+
+class PageReader:
+    """
+    Čte stránky z XML dumpu Wikipedie.
+
+    Instanční atributy:
+    fpath - cesta k XML dumpu; None při čtení jen ze zadaných dat (viz parse) (Optional[str])
+    namespaces - jmenné prostory vracených stránek; None pro všechny (Optional[Set[int]])
+    skip_redirects - přeskakuje stránky s přesměrováním (bool)
+    """
+
+    def __init__(
+        self,
+        fpath: Optional[str],
+        namespaces: Optional[Set[int]] = None,
+        skip_redirects: bool = False,
+    ):
+        self.fpath = fpath
+        self.namespaces = namespaces
+        self.skip_redirects = skip_redirects
+
+    def __iter__(self) -> Iterator[Page]:
+        yield from self.parse(self._read_chunks())
+
+    def _read_chunks(self) -> Iterator[bytes]:
+        with open(self.fpath, "rb") as fin:
+            while True:
+                data = fin.read(CHUNK_SIZE)
+                if not data:
+                    break
+                yield data
+
+    def parse(self, chunks: Iterable[bytes]) -> Iterator[Page]:
+        """
+        Čte stránky ze zadaných dat XML dumpu (např. z dekomprimovaných proudů multistream dumpu).
+
+        Parametry:
+        chunks - postupně předávaná data XML dumpu (Iterable[bytes])
+        """
+        namespaces = self.namespaces
+        skip_redirects = self.skip_redirects
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.buffer_size = TEXT_BUFFER_SIZE
+
+        pages = []
+        buffer = []
+        # stav právě čtené stránky
+        in_page = False
+        is_skipped = False
+        captured = None
+        title = ""
+        ns = 0
+        redirect = False
+        text = None
+        page_id = None
+
+        def start_element(name, attrs):
+            nonlocal in_page, is_skipped, captured, title, ns, redirect, text, page_id
+            if name == "page":
+                in_page = True
+                is_skipped = False
+                title = ""
+                ns = 0
+                redirect = False
+                text = None
+                page_id = None
+            elif in_page and not is_skipped:
+                # ID stránky je první element "id" stránky (další patří revizi a přispěvateli)
+                if name in CAPTURED_ELEMENTS and (name != "id" or page_id is None):
+                    captured = name
+                    buffer.clear()
+                    parser.CharacterDataHandler = buffer.append
+                elif name == "redirect":
+                    redirect = True
+                    is_skipped = skip_redirects
+
+        def end_element(name):
+            nonlocal in_page, is_skipped, captured, title, ns, text, page_id
+            if name == captured:
+                captured = None
+                parser.CharacterDataHandler = None
+                value = "".join(buffer)
+                buffer.clear()
+                if name == "text":
+                    text = value
+                elif name == "title":
+                    title = value
+                elif name == "id":
+                    page_id = int(value or 0)
+                else:
+                    ns = int(value or 0)
+                    is_skipped = namespaces is not None and ns not in namespaces
+            elif name == "page":
+                in_page = False
+                if not is_skipped:
+                    pages.append(Page(ns, title, redirect, text, page_id or 0))
+
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+
+        for data in chunks:
+            parser.Parse(data, False)
+            yield from pages
+            pages.clear()
+        parser.Parse(b"", True)
+        yield from pages
+
+
+def _read_iterparse(fpath: str) -> Iterator[Page]:
+    """
+    Původní způsob čtení dumpu (ElementTree iterparse) - pouze pro porovnání rychlosti.
+    """
+    import xml.etree.ElementTree as ElementTree
+
+    context = ElementTree.iterparse(fpath, events=("start", "end"))
+    event, root = next(context)
+    for event, elem in context:
+        if event == "end" and "page" in elem.tag:
+            title, ns, redirect, text, page_id = "", 0, False, None, 0
+            for child in elem:
+                if "title" in child.tag:
+                    title = child.text
+                elif child.tag.endswith("}ns"):
+                    ns = int(child.text)
+                elif child.tag.endswith("}id"):
+                    page_id = int(child.text)
+                elif "redirect" in child.tag:
+                    redirect = True
+                elif "revision" in child.tag:
+                    for grandchild in child:
+                        if "text" in grandchild.tag:
+                            text = grandchild.text
+            yield Page(ns, title, redirect, text, page_id)
+            root.clear()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    dump_fpath = sys.argv[1]
+    for name, reader in (
+        ("iterparse", lambda: _read_iterparse(dump_fpath)),
+        ("PageReader (all pages)", lambda: PageReader(dump_fpath)),
+        ("PageReader (ns 0+10, no redirects)", lambda: PageReader(dump_fpath, {0, 10}, True)),
+    ):
+        time_start = time.time()
+        n_pages = sum(1 for _ in reader())
+        print(
+            "{}: {} pages in {:.2f} s".format(name, n_pages, time.time() - time_start)
+        )
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje funkci 'slice_page', jež z (vyčištěného) obsahu stránky vybere jen části, z nichž se získávají
+údaje entit - úvodní část stránky (první infobox a první odstavec), řádky s kategoriemi a obrázky a závěrečný blok
+stránky (navigační šablony, kategorie), a funkci 'slice_lead', jež vybere jen úvodní část stránky a kategorie.
+
+Poznámky:
+- úvodní část končí prvním nadpisem sekce za začátkem prvního infoboxu (infobox umístěný až za nadpisem tak zůstane zachován)
+- řádky těla stránky s obrázky se ponechávají, protože obrázky se získávají z celé stránky (viz EntCore.get_data)
+- pořadí ponechaných řádků odpovídá pořadí ve stránce (pořadí obrázků ve znalostní bázi se nemění)
+- stránka bez nadpisů sekcí se vrací celá
+"""
+
+import re
+from typing import Optional
+
+
+RE_INFOBOX_START = re.compile(r"{{Infobox", flags=re.I)
+RE_HEADING = re.compile(r"^=+[^=\n].*?=+[ \t]*$", flags=re.M)
+# řádky těla stránky s kategoriemi nebo obrázky (odkazy na soubory a parametry šablon - viz re_infobox_kw_img entit)
+RE_KEPT_LINE = re.compile(
+    r"\[\[\s*Kategorie:|\[\[(?:Soubor|File):|(?:obrázek|mapa|umístění|vlajka|znak|logo)\s*=(?!=)",
+    flags=re.I,
+)
+# podřetězce, z nichž alespoň jeden musí ponechaný řádek obsahovat (rychlé předběžné vyřazení řádků textu)
+KEPT_LINE_HINTS = ("ategorie:", "ATEGORIE:", "oubor:", "OUBOR:", "ile:", "ILE:", "=")
+RE_CATEGORY = re.compile(r"\[\[\s*Kategorie:[^\[\]\n]*\]\]", flags=re.I)
+# řádky závěrečného bloku stránky (navigační šablony, kategorie, interwiki odkazy, magická slova)
+RE_TAIL_LINE = re.compile(r"\s*(?:$|{{|}}|\||\[\[|__)")
+
+
+def _find_lead_end(content: str) -> Optional[int]:
+    infobox = RE_INFOBOX_START.search(content)
+    heading = RE_HEADING.search(content, infobox.start() if infobox else 0)
+    return heading.start() if heading else None
+
+
+def slice_lead(content: str) -> str:
+    """
+    Vybere z obsahu stránky jen úvodní část (první infobox a první odstavec) a kategorie (potřebné pro určení typu entity).
+
+    Parametry:
+    content - obsah stránky (str)
+
+    Návratové hodnoty:
+    Úvodní část stránky následovaná kategoriemi z těla stránky. (str)
+    """
+    lead_end = _find_lead_end(content)
+    if lead_end is None:
+        return content
+    return "\n".join([content[:lead_end]] + RE_CATEGORY.findall(content, lead_end))
+
+
+def slice_page(content: str) -> str:
+    """
+    Vybere z obsahu stránky části potřebné pro určení typu entity a získání jejích údajů.
+
+    Parametry:
+    content - (vyčištěný) obsah stránky (str)
+
+    Návratové hodnoty:
+    Úvodní část stránky následovaná ponechanými řádky těla a závěrečným blokem stránky. (str)
+    """
+    lead_end = _find_lead_end(content)
+    if lead_end is None:
+        return content
+
+    lead = content[:lead_end]
+    body_lines = content[lead_end:].split("\n")
+    i_tail = len(body_lines)
+    while i_tail > 0 and RE_TAIL_LINE.match(body_lines[i_tail - 1]):
+        i_tail -= 1
+
+    kept_lines = [
+        ln
+        for ln in body_lines[:i_tail]
+        if any(hint in ln for hint in KEPT_LINE_HINTS) and RE_KEPT_LINE.search(ln)
+    ]
+    return "\n".join([lead] + kept_lines + body_lines[i_tail:])
+
+
+if __name__ == "__main__":
+    # srovnání rychlosti extrakce z největších stránek dumpu (spouštět z kořenového adresáře projektu:
+    # python3 -m libs.PageSlicer DUMP [POČET_STRÁNEK])
+    import argparse
+    import heapq
+    import io
+    import sys
+    import time
+    from contextlib import redirect_stderr
+
+    from libs.PageReader import PageReader
+    from wiki_cs_extract import WikiExtract
+
+    dump_fpath = sys.argv[1]
+    n_pages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    pages = heapq.nlargest(
+        n_pages,
+        (
+            (len(page.text), page.title, page.text)
+            for page in PageReader(dump_fpath, namespaces={0}, skip_redirects=True)
+            if page.text
+        ),
+    )
+    print(
+        "{} largest pages: {:.1f} MB".format(
+            len(pages), sum(size for size, _, _ in pages) / 1024 / 1024
+        )
+    )
+
+    wiki_extract = WikiExtract()
+    wiki_extract.console_args = argparse.Namespace(full_page=False, types=None, classify_only=None)
+    results = dict()
+    for full_page in (True, False):
+        wiki_extract.console_args.full_page = full_page
+        time_start = time.time()
+        with redirect_stderr(io.StringIO()):
+            results[full_page] = [
+                wiki_extract.process_entity(title, text) for _, title, text in pages
+            ]
+        print(
+            "{}: {:.2f} s".format(
+                "full page" if full_page else "sliced page", time.time() - time_start
+            )
+        )
+
+    # ID entit se liší (počítadlo instancí), srovnávají se ostatní sloupce
+    n_diff = sum(
+        (full or "").split("\t")[1:] != (sliced or "").split("\t")[1:]
+        for full, sliced in zip(results[True], results[False])
+    )
+    print("entities differing between modes: {} of {}".format(n_diff, len(pages)))
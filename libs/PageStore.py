@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'PageStore' - úložiště stránek (název, ID, jmenný prostor, příznak přesměrování a text
+v kódování UTF-8) v jednom binárním souboru s indexem, z něhož se texty čtou přes mmap. Procesům zpracovávajícím
+stránky se tak předává jen pozice a délka textu (místo serializovaného textu) a text si každý proces dekóduje sám.
+Uložené úložiště lze opakovaně zpracovat bez čtení XML dumpu (viz wiki_cs_extract.py --store-pages / --from-store).
+
+Formát souboru:
+- hlavička - MAGIC a příznaky (komprese zstd)
+- data - texty stránek za sebou; při kompresi po blocích (blok obsahuje celé stránky, komprimován samostatně)
+- index - tabulka bloků (logická pozice, pozice v souboru, uložená velikost), záznamy stránek (ID, logická pozice
+  a délka textu, jmenný prostor, přesměrování) a názvy stránek (oddělené znakem nového řádku)
+- patička - pozice indexu, počty bloků a stránek, velikost názvů a MAGIC
+
+Poznámky:
+- logická pozice textu je pozice v nekomprimovaných datech (bez komprese odpovídá pozici v datové části souboru)
+- úložiště bez zadané cesty je dočasné (soubor v zadaném adresáři, jinak v adresáři pro dočasné soubory systému, vytvořený
+  při prvním zápisu, smazán při uzavření) - obsahuje texty všech zpracovávaných stránek, proto by neměl být v paměti
+  (tmpfs /tmp), ale na disku, např. vedle výstupu (viz wiki_cs_extract.py --store-tmpdir)
+- čtení z mmap sdílí stránky souboru v paměti mezi procesy (text stránek nezabírá paměť každého procesu zvlášť)
+- komprese vyžaduje volitelnou závislost zstandard (importována až při použití)
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+from libs.PageReader import Page
+
+
+MAGIC = b"EKBPAGES"
+FLAG_ZSTD = 1
+HEADER = struct.Struct("<8sB")  # MAGIC, příznaky
+BLOCK_RECORD = struct.Struct("<QQI")  # logická pozice, pozice v souboru, uložená velikost
+PAGE_RECORD = struct.Struct("<qQIhB")  # ID, logická pozice, délka textu, jmenný prostor, přesměrování
+FOOTER = struct.Struct("<QQQQ8s")  # pozice indexu, počet bloků, počet stránek, velikost názvů, MAGIC
+
+BLOCK_SIZE = 256 * 1024  # minimální nekomprimovaná velikost bloku (v bajtech)
+BLOCK_CACHE_SIZE = 8  # počet dekomprimovaných bloků uchovávaných v paměti (v každém procesu)
+ZSTD_LEVEL = 3
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Compressed page store requires optional dependency zstandard (pip install zstandard)."
+        ) from e
+    return zstandard
+
+
+class PageStore:
+    """
+    Úložiště stránek.
+
+    Instanční atributy:
+    fpath - cesta k souboru úložiště; None u dočasného úložiště před prvním zápisem (Optional[str])
+    is_temporary - soubor je při uzavření úložiště smazán (bool)
+    tmp_dir - adresář dočasného úložiště; None pro adresář pro dočasné soubory systému (Optional[str])
+    compress - texty jsou komprimovány po blocích (zstd) (bool)
+    size - logická (nekomprimovaná) velikost zapsaných textů v bajtech (int)
+    """
+
+    def __init__(
+        self, fpath: Optional[str] = None, compress: bool = False, tmp_dir: Optional[str] = None
+    ):
+        self.is_temporary = fpath is None
+        self.tmp_dir = tmp_dir
+        self.fpath = fpath
+        self.compress = compress
+        self.size = 0
+        self._fwrite = None
+        self._compressor = None
+        self._block = []
+        self._block_start = 0
+        self._blocks = []
+        self._records = []
+        self._titles = []
+        self._reset_reader()
+
+    @classmethod
+    def open(cls, fpath: str) -> "PageStore":
+        """
+        Otevře uložené úložiště pro čtení.
+
+        Parametry:
+        fpath - cesta k souboru úložiště (str)
+        """
+        store = cls(fpath)
+        store._open_reader()
+        store._load_index()
+        return store
+
+    def append(self, page: Page) -> Tuple[int, int]:
+        """
+        Zapíše stránku do úložiště.
+
+        Parametry:
+        page - stránka (Page)
+
+        Návratové hodnoty:
+        Dvojice (logická pozice, délka) textu stránky v úložišti (v bajtech). (Tuple[int, int])
+        """
+        if self._fwrite is None:
+            self._open_writer()
+        data = (page.text or "").encode("utf-8")
+        offset = self.size
+        if self.compress:
+            self._block.append(data)
+            if offset + len(data) - self._block_start >= BLOCK_SIZE:
+                self._write_block(offset + len(data))
+        else:
+            self._fwrite.write(data)
+        self.size += len(data)
+        self._records.append((page.id, offset, len(data), page.ns, page.redirect))
+        self._titles.append(page.title)
+        return offset, len(data)
+
+    def get(self, offset: int, length: int) -> str:
+        """
+        Přečte text stránky z úložiště (zápis do úložiště musí být dokončen - viz finish).
+
+        Parametry:
+        offset - logická pozice textu v úložišti (int)
+        length - délka textu v bajtech (int)
+
+        Návratové hodnoty:
+        Text stránky. (str)
+        """
+        if self._mm is None:
+            self._open_reader()
+        if not self._block_starts:
+            start = HEADER.size + offset
+            return self._mm[start : start + length].decode("utf-8")
+        i_block = bisect_right(self._block_starts, offset) - 1
+        start = offset - self._block_starts[i_block]
+        return self._get_block(i_block)[start : start + length].decode("utf-8")
+
+    def get_page(self, title: str) -> Optional[Page]:
+        """
+        Přečte stránku zadaného názvu z úložiště.
+
+        Parametry:
+        title - název stránky (str)
+
+        Návratové hodnoty:
+        Stránka, nebo None, pokud v úložišti není. (Optional[Page])
+        """
+        i_page = self._get_title_index().get(title)
+        if i_page is None:
+            return None
+        return self._get_page(i_page)[0]
+
+    def iter_pages(
+        self, titles: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[Page, Tuple[int, int]]]:
+        """
+        Prochází stránky úložiště v pořadí jejich zápisu.
+
+        Parametry:
+        titles - názvy vracených stránek (názvy, jež v úložišti nejsou, jsou vynechány); None pro všechny stránky (Optional[Iterable[str]])
+
+        Návratové hodnoty:
+        Dvojice (stránka, (logická pozice, délka) textu stránky). (Iterator[Tuple[Page, Tuple[int, int]]])
+        """
+        self._load_index()
+        if titles is None:
+            i_pages = range(len(self._titles))
+        else:
+            title_index = self._get_title_index()
+            i_pages = sorted({title_index[title] for title in titles if title in title_index})
+        for i_page in i_pages:
+            yield self._get_page(i_page)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __contains__(self, title: str) -> bool:
+        return title in self._get_title_index()
+
+    def finish(self) -> None:
+        """
+        Dokončí zápis do úložiště (zapíše index a patičku).
+        """
+        if self._fwrite is None:
+            return
+        if self._block:
+            self._write_block(self.size)
+        index_offset = self._fwrite.tell()
+        for block in self._blocks:
+            self._fwrite.write(BLOCK_RECORD.pack(*block))
+        for record in self._records:
+            self._fwrite.write(PAGE_RECORD.pack(*record))
+        titles = "\n".join(self._titles).encode("utf-8")
+        self._fwrite.write(titles)
+        self._fwrite.write(
+            FOOTER.pack(index_offset, len(self._blocks), len(self._records), len(titles), MAGIC)
+        )
+        self._fwrite.close()
+        self._fwrite = None
+
+    def close(self) -> None:
+        """
+        Uzavře úložiště (dočasné úložiště smaže).
+        """
+        self.finish()
+        self._close_reader()
+        if self.is_temporary and self.fpath and os.path.exists(self.fpath):
+            os.remove(self.fpath)
+
+    def _open_writer(self) -> None:
+        if self.fpath is None:
+            fd, self.fpath = tempfile.mkstemp(prefix=".pages_", suffix=".store", dir=self.tmp_dir)
+            os.close(fd)
+        if self.compress:
+            self._compressor = _import_zstandard().ZstdCompressor(level=ZSTD_LEVEL)
+        self._fwrite = open(self.fpath, "wb")
+        self._fwrite.write(HEADER.pack(MAGIC, FLAG_ZSTD if self.compress else 0))
+
+    def _write_block(self, block_end: int) -> None:
+        data = self._compressor.compress(b"".join(self._block))
+        self._blocks.append((self._block_start, self._fwrite.tell(), len(data)))
+        self._fwrite.write(data)
+        self._block = []
+        self._block_start = block_end
+
+    def _open_reader(self) -> None:
+        self._fread = open(self.fpath, "rb")
+        self._mm = mmap.mmap(self._fread.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, flags = HEADER.unpack_from(self._mm, 0)
+        index_offset, n_blocks, n_pages, titles_size, magic_end = FOOTER.unpack_from(
+            self._mm, len(self._mm) - FOOTER.size
+        )
+        if magic != MAGIC or magic_end != MAGIC:
+            raise ValueError('File "{}" is not a valid page store.'.format(self.fpath))
+        self.compress = bool(flags & FLAG_ZSTD)
+        self._index = (index_offset, n_blocks, n_pages, titles_size)
+        self._blocks = list(
+            BLOCK_RECORD.iter_unpack(
+                self._mm[index_offset : index_offset + n_blocks * BLOCK_RECORD.size]
+            )
+        )
+        self._block_starts = [block[0] for block in self._blocks]
+        if self.compress:
+            self._decompressor = _import_zstandard().ZstdDecompressor()
+
+    def _load_index(self) -> None:
+        if self._mm is None:
+            self._open_reader()
+        if self._records:
+            return
+        index_offset, n_blocks, n_pages, titles_size = self._index
+        records_offset = index_offset + n_blocks * BLOCK_RECORD.size
+        titles_offset = records_offset + n_pages * PAGE_RECORD.size
+        self._records = list(
+            PAGE_RECORD.iter_unpack(self._mm[records_offset:titles_offset])
+        )
+        self._titles = (
+            self._mm[titles_offset : titles_offset + titles_size].decode("utf-8").split("\n")
+            if n_pages
+            else []
+        )
+        self.size = sum(record[2] for record in self._records)
+
+    def _get_title_index(self) -> dict:
+        if self._title_index is None:
+            self._load_index()
+            self._title_index = {title: i for i, title in enumerate(self._titles)}
+        return self._title_index
+
+    def _get_page(self, i_page: int) -> Tuple[Page, Tuple[int, int]]:
+        page_id, offset, length, ns, redirect = self._records[i_page]
+        text = self.get(offset, length)
+        return Page(ns, self._titles[i_page], bool(redirect), text, page_id), (offset, length)
+
+    def _get_block(self, i_block: int) -> bytes:
+        data = self._block_cache.get(i_block)
+        if data is not None:
+            self._block_cache.move_to_end(i_block)
+            return data
+        _, start, size = self._blocks[i_block]
+        data = self._decompressor.decompress(self._mm[start : start + size])
+        self._block_cache[i_block] = data
+        if len(self._block_cache) > BLOCK_CACHE_SIZE:
+            self._block_cache.popitem(last=False)
+        return data
+
+    def _reset_reader(self) -> None:
+        self._fread = None
+        self._mm = None
+        self._index = None
+        self._block_starts = []
+        self._block_cache = OrderedDict()
+        self._decompressor = None
+        self._title_index = None
+
+    def _close_reader(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        if self._fread is not None:
+            self._fread.close()
+        self._reset_reader()
+
+    def __getstate__(self):
+        # do jiného procesu se předává jen cesta k souboru (čtení se otevře v daném procesu)
+        return {"fpath": self.fpath, "is_temporary": False, "compress": self.compress}
+
+    def __setstate__(self, state):
+        self.__init__(state["fpath"], state["compress"])
+        self.is_temporary = state["is_temporary"]
+
+
+if __name__ == "__main__":
+    # výpis informací o úložišti nebo textu zadaných stránek (spouštět z kořenového adresáře projektu:
+    # python3 -m libs.PageStore STORE [NÁZEV_STRÁNKY ...])
+    store = PageStore.open(sys.argv[1])
+    if len(sys.argv) > 2:
+        for title in sys.argv[2:]:
+            page = store.get_page(title)
+            if page is None:
+                print('Page "{}" not found.'.format(title), file=sys.stderr)
+                continue
+            print(
+                "{}\tid={}\tns={}\tredirect={}\n{}".format(
+                    page.title, page.id, page.ns, page.redirect, page.text
+                )
+            )
+    else:
+        store._load_index()
+        print(
+            "{} pages, {:.1f} MB of text in {:.1f} MB file{}".format(
+                len(store),
+                store.size / 1024 / 1024,
+                os.path.getsize(store.fpath) / 1024 / 1024,
+                " (zstd, {} blocks)".format(len(store._blocks)) if store.compress else "",
+            )
+        )
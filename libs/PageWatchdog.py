@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje časový limit zpracování jedné stránky ('time_budget') - po jeho vypršení je ve zpracování stránky
+vyvolána výjimka 'PageTimeout' (přeruší i dlouho běžící regulární výraz).
+
+Poznámky:
+- využívá signál SIGALRM, funguje tedy jen v hlavním vlákně procesu (což platí i pro procesy multiprocessing.Pool)
+- není-li SIGALRM k dispozici (Windows), limit se neuplatňuje
+- 'PageTimeout' nedědí z 'Exception', aby ji nezachytily obecné obsluhy výjimek v kódu entit; zachytí-li ji přesto
+  holé "except:", je po krátkém intervalu vyvolána znovu
+"""
+
+import signal
+from contextlib import contextmanager
+from typing import Iterator
+
+
+TIMEOUT_REPEAT_INTERVAL = 0.1  # interval opakovaného vyvolání výjimky po vypršení limitu (v sekundách)
+
+
+class PageTimeout(BaseException):
+    """
+    Vypršel časový limit zpracování stránky.
+    """
+
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeout()
+
+
+@contextmanager
+def time_budget(seconds: float) -> Iterator[None]:
+    """
+    Omezí dobu běhu bloku - po vypršení limitu je v bloku vyvolána výjimka PageTimeout.
+
+    Parametry:
+    seconds - časový limit v sekundách; 0 limit vypíná (float)
+    """
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    handler_previous = signal.signal(signal.SIGALRM, _raise_page_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds, TIMEOUT_REPEAT_INTERVAL)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, handler_previous)
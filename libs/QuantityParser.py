@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'QuantityParser', jež z hodnot infoboxů získává číselné údaje (rozlohy, počty obyvatel,
+délky, průtoky, výšky) v jednotném formátu - textovém (desetinná čárka, bez oddělovačů tisíců) i typovaném
+(int, Decimal).
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+from typing import NamedTuple, Optional, Union
+
+from libs.LRUCache import lru_cache
+
+
+RE_PARENTHESES = re.compile(r"\(.*?\)")
+RE_BRACKETS = re.compile(r"\[.*?\]")
+RE_TAGS = re.compile(r"<.*?>")
+RE_TEMPLATES = re.compile(r"{{.*?}}")
+RE_DIGIT = re.compile(r"\d")
+# mezery mezi číslicemi (oddělovače tisíců) se odstraňují, desetinné tečky se převádějí na čárky
+RE_DECIMAL_SEPARATORS = re.compile(r"(?<=\d)(?:\s|(\.))(?=\d)")
+RE_DECIMAL_TAIL = re.compile(r"(\d+(?:,\d+)?)[^\d,]+.*$")
+RE_COUNT_SEPARATORS = re.compile(r"(?<=\d)[,.\s](?=\d)")
+RE_COUNT_TAIL = re.compile(r"(\d+)\D.*$")
+# údaje v jednotném formátu, které jsou čistým číslem (převod z hektarů může vést k exponentu, např. "1,5e-05")
+RE_DECIMAL = re.compile(r"\d+(?:,\d+)?(?:e-?\d+)?")
+RE_COUNT = re.compile(r"\d+")
+RE_HECTARES = re.compile(r"\d\s*(?:ha|hektar)", flags=re.I)
+RE_MILLIONS = re.compile(r"mil\.|mili[oó]n", flags=re.I)
+RE_THOUSANDS = re.compile(r"tis\.|tis[ií]c", flags=re.I)
+RE_UNINHABITED = re.compile(r"neobydlen|bez.+?obyvatel", flags=re.I)
+
+
+class Quantity(NamedTuple):
+    """
+    Číselný údaj - text v jednotném formátu a typovaná hodnota (None, není-li text čistým číslem).
+    """
+
+    text: str
+    value: Optional[Union[int, Decimal]]
+
+
+EMPTY_QUANTITY = Quantity("", None)
+
+
+class QuantityParser:
+    """
+    Převádí číselné údaje z hodnot infoboxů do jednotného formátu.
+
+    Metody:
+    parse_decimal(text, hectares) - desetinný údaj (rozloha, délka, průtok, výška), volitelně převod z hektarů na km²
+    parse_count(text, uninhabited) - celočíselný údaj (počet obyvatel) včetně jednotek "tis." a "mil."
+    decimal_value(text) - typovaná hodnota desetinného údaje v jednotném formátu
+    count_value(text) - typovaná hodnota celočíselného údaje v jednotném formátu
+    """
+
+    @staticmethod
+    def _strip_markup(text: str) -> str:
+        """
+        Odstraňuje závorky, poznámky, HTML značky a šablony, které v číselných údajích nenesou hodnotu.
+
+        Parametry:
+        text - hodnota z infoboxu (str)
+        """
+        if "(" in text:
+            text = RE_PARENTHESES.sub("", text)
+        if "[" in text:
+            text = RE_BRACKETS.sub("", text)
+        if "<" in text:
+            text = RE_TAGS.sub("", text)
+        if "{" in text or "}" in text:
+            text = RE_TEMPLATES.sub("", text).replace("{", "").replace("}", "")
+        return text
+
+    @staticmethod
+    def decimal_value(text: str) -> Optional[Decimal]:
+        """
+        Převede desetinný údaj v jednotném formátu (viz parse_decimal) na typovanou hodnotu.
+
+        Parametry:
+        text - údaj v jednotném formátu (str)
+
+        Návratové hodnoty:
+        Hodnota údaje; None, není-li údaj čistým číslem. (Optional[Decimal])
+        """
+        if not RE_DECIMAL.fullmatch(text):
+            return None
+        try:
+            return Decimal(text.replace(",", "."))
+        except InvalidOperation:
+            return None
+
+    @staticmethod
+    def count_value(text: str) -> Optional[int]:
+        """
+        Převede celočíselný údaj v jednotném formátu (viz parse_count) na typovanou hodnotu.
+
+        Parametry:
+        text - údaj v jednotném formátu (str)
+
+        Návratové hodnoty:
+        Hodnota údaje; None, není-li údaj čistým číslem. (Optional[int])
+        """
+        return int(text) if RE_COUNT.fullmatch(text) else None
+
+    @staticmethod
+    @lru_cache
+    def parse_decimal(text: str, hectares: bool = False) -> Quantity:
+        """
+        Získá desetinný údaj (v jednotném formátu s desetinnou čárkou).
+
+        Parametry:
+        text - hodnota z infoboxu (str)
+        hectares - je-li údaj uveden v hektarech, převede jej na kilometry čtvereční (bool)
+
+        Návratové hodnoty:
+        Text v jednotném formátu (prázdný, neobsahuje-li hodnota číslo) a typovaná hodnota. (Quantity)
+        """
+        is_ha = hectares and RE_HECTARES.search(text)
+
+        text = QuantityParser._strip_markup(text)
+        text = RE_DECIMAL_SEPARATORS.sub(
+            lambda m: "," if m.group(1) else "", text
+        ).strip()
+        first_digit = RE_DIGIT.search(text)
+        if not first_digit:
+            return EMPTY_QUANTITY
+        text = text[first_digit.start() :]
+        tail = RE_DECIMAL_TAIL.match(text)
+        if tail:
+            text = tail.group(1)
+
+        if (
+            is_ha
+        ):  # je-li údaj uveden v hektarech, dojde k převodu na kilometry čtvereční
+            try:
+                text = str(float(text.replace(",", ".")) / 100).replace(".", ",")
+            except ValueError:
+                pass
+
+        return Quantity(text, QuantityParser.decimal_value(text))
+
+    @staticmethod
+    @lru_cache
+    def parse_count(text: str, uninhabited: bool = False) -> Quantity:
+        """
+        Získá celočíselný údaj (např. počet obyvatel) včetně převodu jednotek "tis." a "mil.".
+
+        Parametry:
+        text - hodnota z infoboxu (str)
+        uninhabited - údaj typu "neobydleno" převede na 0 (bool)
+
+        Návratové hodnoty:
+        Text v jednotném formátu (prázdný, neobsahuje-li hodnota číslo) a typovaná hodnota. (Quantity)
+        """
+        coef = (
+            1000000
+            if RE_MILLIONS.search(text)
+            else 1000
+            if RE_THOUSANDS.search(text)
+            else 0
+        )
+
+        text = QuantityParser._strip_markup(text)
+        text = RE_COUNT_SEPARATORS.sub("", text).strip()
+        first_digit = RE_DIGIT.search(text)
+        if first_digit:
+            text = text[first_digit.start() :]
+            tail = RE_COUNT_TAIL.match(text)
+            if tail:
+                text = tail.group(1)
+        if uninhabited and RE_UNINHABITED.search(text):
+            text = "0"
+        elif not first_digit:
+            return EMPTY_QUANTITY
+
+        if coef:
+            text = str(int(text) * coef)
+
+        return Quantity(text, QuantityParser.count_value(text))
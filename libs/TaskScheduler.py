@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Soubor obsahuje třídu 'TaskScheduler', jež rozděluje úlohy s odhadnutou cenou (např. velikostí stránky) mezi procesy
+multiprocessing.Pool - nejdražší úlohy nejdříve (LPT), levné úlohy sdružuje do dávek a velikost dávek přizpůsobuje
+naměřené rychlosti zpracování.
+
+Poznámky:
+- počet současně rozdělených dávek je omezen (dávky se sestavují až podle naměřené rychlosti, ne všechny předem)
+- ke konci běhu se dávky zmenšují, aby se zbývající práce rozložila rovnoměrně mezi všechny procesy
+- výsledky se vrací v pořadí zadaných úloh
+"""
+
+import queue
+import time
+from typing import Any, Callable, List, Sequence, Tuple
+
+
+DEFAULT_BATCH_TIME = 0.5  # cílová doba zpracování jedné dávky (v sekundách)
+IN_FLIGHT_PER_WORKER = 2  # počet současně rozdělených dávek na jeden proces
+
+
+def _run_batch(func: Callable[[List[Any]], List[Any]], batch: List[Any]) -> Tuple[List[Any], float]:
+    time_start = time.perf_counter()
+    results = func(batch)
+    return results, time.perf_counter() - time_start
+
+
+class TaskScheduler:
+    """
+    Rozděluje úlohy mezi procesy multiprocessing.Pool podle jejich odhadnuté ceny.
+
+    Instanční atributy:
+    pool - pool procesů (multiprocessing.Pool)
+    n_workers - počet procesů poolu (int)
+    batch_time - cílová doba zpracování jedné dávky v sekundách (float)
+    rate - naměřená rychlost zpracování jednoho procesu (cena za sekundu; None před prvním měřením) (Optional[float])
+    busy_time - součet dob zpracování všech dávek (float)
+    wall_time - doba běhu posledního volání map (float)
+    n_batches - počet dávek posledního volání map (int)
+    """
+
+    def __init__(self, pool, n_workers: int, batch_time: float = DEFAULT_BATCH_TIME):
+        self.pool = pool
+        self.n_workers = n_workers
+        self.batch_time = batch_time
+        self.rate = None
+        self.busy_time = 0.0
+        self.wall_time = 0.0
+        self.n_batches = 0
+
+    def map(
+        self,
+        func: Callable[[List[Any]], List[Any]],
+        items: Sequence[Any],
+        costs: Sequence[float],
+    ) -> List[Any]:
+        """
+        Zpracuje úlohy v procesech poolu.
+
+        Parametry:
+        func - funkce zpracovávající dávku úloh, vrací seznam výsledků v pořadí úloh dávky; musí být serializovatelná (na úrovni modulu) (Callable[[List[Any]], List[Any]])
+        items - úlohy (Sequence[Any])
+        costs - odhadnuté ceny úloh (např. velikost stránky) (Sequence[float])
+
+        Návratové hodnoty:
+        Výsledky úloh v pořadí zadaných úloh. (List[Any])
+        """
+        time_start = time.perf_counter()
+        order = sorted(range(len(items)), key=costs.__getitem__, reverse=True)
+        results = [None] * len(items)
+        done = queue.SimpleQueue()
+        n_slots = self.n_workers * IN_FLIGHT_PER_WORKER
+        i_next = 0
+        remaining_cost = sum(costs)
+        done_cost = 0.0
+        in_flight = 0
+        self.busy_time = 0.0
+        self.n_batches = 0
+
+        while i_next < len(order) or in_flight:
+            while i_next < len(order) and in_flight < n_slots:
+                # cena dávky - podle naměřené rychlosti, ke konci běhu nejvýše podíl zbývající práce
+                target_cost = 0.0
+                if self.rate:
+                    target_cost = min(self.rate * self.batch_time, remaining_cost / n_slots)
+                batch = [order[i_next]]
+                batch_cost = costs[order[i_next]]
+                i_next += 1
+                while i_next < len(order) and batch_cost + costs[order[i_next]] <= target_cost:
+                    batch.append(order[i_next])
+                    batch_cost += costs[order[i_next]]
+                    i_next += 1
+                remaining_cost -= batch_cost
+
+                self.pool.apply_async(
+                    _run_batch,
+                    (func, [items[i] for i in batch]),
+                    callback=lambda result, batch=batch, batch_cost=batch_cost: done.put(
+                        (batch, batch_cost, result)
+                    ),
+                    error_callback=lambda e: done.put((None, 0.0, e)),
+                )
+                in_flight += 1
+                self.n_batches += 1
+
+            batch, batch_cost, result = done.get()
+            in_flight -= 1
+            if batch is None:
+                raise result
+            batch_results, elapsed = result
+            for i, batch_result in zip(batch, batch_results):
+                results[i] = batch_result
+            self.busy_time += elapsed
+            done_cost += batch_cost
+            if self.busy_time > 0:
+                self.rate = done_cost / self.busy_time
+
+        self.wall_time = time.perf_counter() - time_start
+        return results
+
+    def utilization(self) -> float:
+        """
+        Vytížení procesů posledním voláním map (podíl doby zpracování dávek a celkové doby všech procesů).
+        """
+        if not self.wall_time:
+            return 0.0
+        return self.busy_time / (self.wall_time * self.n_workers)
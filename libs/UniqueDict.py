@@ -7,19 +7,26 @@ KEY_LANG = "lang"
 LANG_ORIG = "orig"
 LANG_UNKNOWN = "???"
 
+# tuples (not sets) - membership is tested by equality, so unhashable values (lists, dicts) may be stored as well
+EMPTY_VALUES = (None, "")
+WEAK_LANGS = (LANG_ORIG, LANG_UNKNOWN)
+
+_MISSING = object()
+
 
 class UniqueDict(dict):
+    __slots__ = ()
+
     VALUE_CONFLICTED = "!!!"
 
     def __setitem__(self, key, value):
-        if key not in self:
+        current = self.get(key, _MISSING)
+        if current is _MISSING:
             dict.__setitem__(self, key, value if value != "" else None)
-        elif self[key] in [None, ""] or (
-            key == KEY_LANG and self[key] in [LANG_ORIG, LANG_UNKNOWN]
-        ):
+        elif current in EMPTY_VALUES or (key == KEY_LANG and current in WEAK_LANGS):
             dict.__setitem__(self, key, value)
-        elif not value in [None, ""] and self[key] != value:
-            if key != KEY_LANG or value not in [LANG_ORIG, LANG_UNKNOWN]:
+        elif value not in EMPTY_VALUES and current != value:
+            if key != KEY_LANG or value not in WEAK_LANGS:
                 # if value not empty and dict[key] is not empty also
                 # => CONFLICT of values
                 dict.__setitem__(self, key, self.VALUE_CONFLICTED)
@@ -8,15 +8,19 @@ Autor: Michal Planička (xplani02)
 Popis souboru:
 Soubor obsahuje parser XML dumpu Wikipedie.
 Identifikuje a extrahuje typy infoboxu související s osobami a zapíše je do zvláštního souboru.
+
+Poznámky:
+Typy infoboxů zjišťuje i samotná extrakce (wiki_cs_extract.py) v rámci hlavního průchodu dumpem - tento skript
+slouží jen k samostatnému (pře)vytvoření mezipaměti person_infoboxes.
 """
 
 import xml.etree.cElementTree as CElTree
 import re
-from os import remove
+import os
 import argparse
 
+from ent_person import EntPerson
 
-ib_types = set()
 
 # parsuje argumenty zadané při spuštění
 console_args_parser = argparse.ArgumentParser()
@@ -29,6 +33,8 @@ console_args_parser.add_argument(
 )
 console_args = console_args_parser.parse_args()
 
+ib_types = set()
+
 # parsuje XML dump Wikipedie a prochází jednotlivé stránky
 # založeno na: http://effbot.org/zone/element-iterparse.htm
 context = CElTree.iterparse(console_args.src_file, events=("start", "end"))
@@ -36,49 +42,27 @@ context = iter(context)
 event, root = next(context)
 
 for event, elem in context:
-    if event == "end":
-        if "page" in elem.tag:
-            ib_title = ""
-
-            for child in elem:
-                if "title" in child.tag:
-                    if not child.text.startswith("Šablona:"):
-                        continue
-                    ib_title = child.text
-
-                if ib_title:
-                    if "revision" in child.tag:
-                        for grandchild in child:
-                            if "text" in grandchild.tag:
-                                if re.search(
-                                    r"\[\[\s*Kategorie:\s*Infoboxy\s+lidí",
-                                    grandchild.text,
-                                ):
-                                    ib_re = re.search(
-                                        r"^Šablona:Infobox[\-–—−\s]+(.+)$", ib_title
-                                    )
-                                    if ib_re:
-                                        ib_type = (
-                                            ib_re.group(1)
-                                            .replace("/doc", "")
-                                            .strip()
-                                            .lower()
-                                        )
-                                        if (
-                                            "etnická skupina" in ib_type
-                                            or "předkové" in ib_type
-                                        ):  # nesouvisí s osobami
-                                            continue
-                                        ib_types.add(ib_type)
+    if event == "end" and "page" in elem.tag:
+        ib_title = ""
+        for child in elem:
+            if "title" in child.tag:
+                ib_title = child.text or ""
+                if not ib_title.startswith("Šablona:"):
+                    break
+            elif "revision" in child.tag:
+                for grandchild in child:
+                    if "text" in grandchild.tag:
+                        ib_type = EntPerson.get_infobox_type(ib_title, grandchild.text)
+                        if ib_type:
+                            ib_types.add(ib_type)
         root.clear()
 
-# odstraní soubor před začátkem extrakce, pokud nějaká existuje
-try:
-    remove("person_infoboxes")
-except OSError:
-    pass
+# verze dumpu (z cíle symbolického odkazu, jinak z názvu souboru)
+src_file = os.path.realpath(console_args.src_file)
+version = re.search(r"(\w+)wiki-([0-9]{8})-", os.path.basename(src_file))
 
 # zápis typů infoboxu do souboru
-with open("person_infoboxes", "a", encoding="utf-8") as fl:
-    for ib in ib_types:
-        fl.write(ib + "\n")
+EntPerson.ib_types = ib_types
+EntPerson.save_infobox_types(
+    "person_infoboxes", "{}_{}".format(*version.groups()) if version else ""
+)
@@ -132,6 +132,14 @@ done
 # zmena spousteci cesty na tu, ve ktere se nachazi start.sh
 cd `dirname "${LAUNCHED}"`
 
+# Stats and metrics columns of KB+stats.tsv are computed by wikipedia_stats submodule - checked before the (long) extraction
+F_STATS_TO_KB="wikipedia_stats/stats_to_kb.py"
+if test ! -f "${F_STATS_TO_KB}"
+then
+    >&2 echo "ERROR: \"${F_STATS_TO_KB}\" not found - initialize wikipedia_stats submodule (git submodule update --init)"
+    exit 4
+fi
+
 if $LOG; then
 	rm -f start.sh.fifo.stdout start.sh.fifo.stderr start.sh.fifo.stdmix
 	mkfifo start.sh.fifo.stdout start.sh.fifo.stderr start.sh.fifo.stdmix
@@ -195,14 +203,13 @@ OUTDIR="outputs"
 mkdir -p "${OUTDIR}"
 
 # Convert Wikipedia KB format to Generic KB format
-CMD="python3 kbwiki2gkb.py --inkb \"kb_cs\" --outdir \"${OUTDIR}\""
+CMD="python3 kbwiki2gkb.py --inkb \"kb_cs\" --outdir \"${OUTDIR}\" ${MULTIPROC_PARAMS}"
 echo "[`date`] RUNNING COMMAND: ${CMD}"
 eval $CMD
 echo "Exited with status code $? (${CMD})"
 
 # Add stats to KB and compute metrics
-mkdir -p outputs
-CMD="python3 wikipedia_stats/stats_to_kb.py --input \"outputs/KB.tsv\" --output \"outputs/KB+stats.tsv\" -pw \"$STATS_PATH/pageviews/latest_cs_pageviews.tsv\" -bps \"$STATS_PATH/bps/latest_cs_bps.tsv\""
+CMD="python3 ${F_STATS_TO_KB} --input \"${OUTDIR}/KB.tsv\" --output \"${OUTDIR}/KB+stats.tsv\" -pw \"$STATS_PATH/pageviews/latest_cs_pageviews.tsv\" -bps \"$STATS_PATH/bps/latest_cs_bps.tsv\""
 echo "[`date`] RUNNING COMMAND: ${CMD}"
 eval $CMD
 echo "Exited with status code $? (${CMD})"
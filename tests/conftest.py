@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Společná nastavení testů (pytest) - moduly projektu se importují z kořenového adresáře projektu
+(stejně jako při spuštění skriptů), testovací data jsou ve složce tests/data.
+"""
+
+import os
+import sys
+
+import pytest
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "tests", "data")
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture(scope="session")
+def data_dir():
+    return DATA_DIR
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Testy sloupcového formátu KB (třída 'ColumnarKB') - převod KB do sloupcového formátu a zpět musí zachovat hodnoty
+i pořadí řádků, takže kbwiki2gkb.py --incolumnar vytvoří KB.tsv shodný (bajt po bajtu) s převodem z TSV KB.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from ent_registry import HEAD_KB_STATS, get_types
+from libs.ColumnarKB import ROW_NUMBER_COLUMN, VALUE_COLUMN_SUFFIX, ColumnarKB
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# hodnoty, které převod na float64/int64 nezachová (zápis desetinných míst, přesnost, nečíselný text)
+ENTITIES = [
+    ("settlement", {"NAME": "Brno", "AREA": "230,18", "POPULATION": "380000", "LATITUDE": "49.1925", "LONGITUDE": "16.608333"}),
+    ("person", {"NAME": "Karel Novák", "ALIASES": "Kája#lang=cs#ntype=nick|Kajetán#lang=orig#ntype=quoted", "JOBS": "herec|zpěvák"}),
+    ("settlement", {"NAME": "Ves", "AREA": "12,50", "POPULATION": "12 000"}),
+    ("geo:island", {"NAME": "Ostrov", "AREA": "45,000", "POPULATION": "-5", "CONTINENT": "Evropa||Asie"}),
+    ("country", {"NAME": "Stát", "AREA": "1234567890123456789", "POPULATION": "0", "LATITUDE": "-0.0"}),
+    ("watercourse", {"NAME": "Potok", "LENGTH": "0,00001", "STREAMFLOW": "1,10", "AREA": "", "REDIRECTS": "|"}),
+    ("person", {"NAME": "Jan z Pomuku", "DATE OF BIRTH": "1345-??-??", "IMAGE": "a.jpg|b.jpg"}),
+    ("geo:relief", {"NAME": "Sněžka", "LATITUDE": "50.736", "LONGITUDE": "15.74"}),
+]
+
+
+@pytest.fixture
+def kb_dir(tmp_path):
+    heads = dict()
+    with open(tmp_path / "HEAD-KB", "w", encoding="utf-8") as fl:
+        for ent_type in get_types():
+            fl.writelines(ent_type.head_kb_lines())
+    head = ColumnarKB.parse_head(str(tmp_path / "HEAD-KB"))
+    rows = []
+    for i_entity, (prefix, values) in enumerate(ENTITIES):
+        values = dict(values, ID="{:010x}".format(i_entity), TYPE=prefix)
+        # řádky KB z wiki_cs_extract.py neobsahují sloupce se statistikami
+        columns = [column.name for column in head[prefix] if column.name not in HEAD_KB_STATS]
+        rows.append("\t".join(values.get(name, "") for name in columns))
+    with open(tmp_path / "kb_cs", "w", encoding="utf-8") as fl:
+        fl.write("\n".join(rows))
+    with open(tmp_path / "VERSION", "w", encoding="utf-8") as fl:
+        fl.write("cs_20260101-1")
+    return tmp_path, rows
+
+
+def test_round_trip(kb_dir):
+    tmp_path, rows = kb_dir
+    counts = ColumnarKB.write(rows, str(tmp_path / "HEAD-KB"), str(tmp_path / "columnar"))
+    assert sum(counts.values()) == len(rows)
+
+    restored = []
+    for ent_type in counts:
+        table = ColumnarKB.read(str(tmp_path / "columnar" / ColumnarKB.type_fname(ent_type)))
+        restored.extend(zip(ColumnarKB.row_numbers(table), ColumnarKB.iter_rows(table)))
+    restored = [values for _, values in sorted(restored)]
+    assert len(restored) == len(rows)
+    for row, values in zip(rows, restored):
+        n_values = len(row.split("\t"))
+        assert "\t".join(values[:n_values]) == row
+        assert not any(values[n_values:])
+
+
+def test_typed_columns(kb_dir):
+    tmp_path, rows = kb_dir
+    ColumnarKB.write(rows, str(tmp_path / "HEAD-KB"), str(tmp_path / "columnar"))
+
+    def read(ent_type):
+        table = ColumnarKB.read(str(tmp_path / "columnar" / ColumnarKB.type_fname(ent_type)))
+        return table, {name: table.column(name).to_pylist() for name in table.column_names}
+
+    table, settlement = read("settlement")
+    # typovaný sloupec následuje za textovým
+    names = table.column_names
+    assert names[names.index("AREA") + 1] == "AREA" + VALUE_COLUMN_SUFFIX
+    assert str(table.schema.field("AREA" + VALUE_COLUMN_SUFFIX).type) == "double"
+    assert str(table.schema.field("POPULATION" + VALUE_COLUMN_SUFFIX).type) == "int64"
+    assert settlement["AREA"] == ["230,18", "12,50"]
+    assert settlement["AREA" + VALUE_COLUMN_SUFFIX] == [230.18, 12.5]
+    assert settlement["POPULATION" + VALUE_COLUMN_SUFFIX] == [380000, None]  # "12 000"
+    assert settlement["LATITUDE" + VALUE_COLUMN_SUFFIX] == [49.1925, None]
+    assert ColumnarKB.kb_columns(table) == [c for c in names if not c.endswith(VALUE_COLUMN_SUFFIX) and c != ROW_NUMBER_COLUMN]
+
+    _, island = read("geo:island")
+    assert island["AREA" + VALUE_COLUMN_SUFFIX] == [45.0]
+    assert island["POPULATION" + VALUE_COLUMN_SUFFIX] == [None]  # "-5"
+
+    _, country = read("country")
+    assert country["POPULATION" + VALUE_COLUMN_SUFFIX] == [0]
+    assert country["LATITUDE" + VALUE_COLUMN_SUFFIX] == [-0.0]
+    assert country["WIKI HITS" + VALUE_COLUMN_SUFFIX] == [None]
+
+    _, watercourse = read("watercourse")
+    assert watercourse["LENGTH" + VALUE_COLUMN_SUFFIX] == [0.00001]
+    assert watercourse["AREA" + VALUE_COLUMN_SUFFIX] == [None]
+
+    # text bez typovaného sloupce
+    _, person = read("person")
+    assert "NAME" + VALUE_COLUMN_SUFFIX not in person
+
+
+@pytest.mark.parametrize("args", [[], ["--stats"]])
+def test_kbwiki2gkb_columnar_matches_tsv(kb_dir, args):
+    tmp_path, rows = kb_dir
+    ColumnarKB.write(rows, str(tmp_path / "HEAD-KB"), str(tmp_path / "columnar"))
+    outputs = []
+    sources = [
+        (["--inkb", "kb_cs"], "KB-tsv.tsv"),
+        (["--incolumnar", str(tmp_path / "columnar")], "KB-columnar.tsv"),
+    ]
+    for source, out_kb in sources:
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, "kbwiki2gkb.py"), "--indir", str(tmp_path)]
+            + ["--outdir", str(tmp_path), "--outkb", out_kb]
+            + source
+            + args,
+            check=True,
+            stderr=subprocess.DEVNULL,
+        )
+        with open(tmp_path / out_kb, "rb") as fl:
+            outputs.append(fl.read())
+    assert outputs[0].count(b"\n") > len(rows)
+    assert outputs[0] == outputs[1]
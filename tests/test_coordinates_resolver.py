@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Testy třídy 'CoordinatesResolver' a doplňování souřadnic (WikiExtract.resolve_coordinates) proti lokálnímu
+náhradnímu serveru API Wikipedie (bez přístupu k síti).
+
+Poznámky:
+- náhradní server vrací v jedné odpovědi souřadnice nejvýše jedné stránky (zbytek přes "continue"), normalizuje
+  názvy stránek s malým počátečním písmenem ("normalized") a na prvních N dotazů odpovídá 429 Too Many Requests
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import libs.CoordinatesResolver
+from ent_registry import HEAD_KB_STATS
+from libs.ColumnarKB import ColumnarKB
+from libs.CoordinatesResolver import CoordinatesResolver
+from wiki_cs_extract import WikiExtract
+
+
+COORDINATES = {
+    "Brno": (49.195, 16.608),
+    "Sněžka": (50.736, 15.74),
+    "Svitava": (49.7, 16.4),
+    "Máchovo jezero": (50.58, 14.65),
+}
+
+
+class StandInApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        with self.server.lock:
+            self.server.requests.append(params)
+            too_many = self.server.n_too_many > 0
+            self.server.n_too_many -= 1
+        if too_many:
+            self.send_response(429)
+            self.end_headers()
+            return
+
+        normalized = []
+        pages = dict()
+        for i_title, title in enumerate(params["titles"].split("|")):
+            to = title[:1].upper() + title[1:]
+            if to != title:
+                normalized.append({"from": title, "to": to})
+            if to in COORDINATES:
+                pages[str(i_title + 1)] = {"pageid": i_title + 1, "title": to}
+            else:
+                pages[str(-i_title - 1)] = {"title": to, "missing": ""}
+
+        with_coordinates = sorted(
+            (page for page in pages.values() if page["title"] in COORDINATES),
+            key=lambda page: page["title"],
+        )
+        offset = int(params.get("cocontinue", 0))
+        if offset < len(with_coordinates):
+            lat, lon = COORDINATES[with_coordinates[offset]["title"]]
+            with_coordinates[offset]["coordinates"] = [{"lat": lat, "lon": lon, "primary": ""}]
+        result = {"batchcomplete": "", "query": {"pages": pages}}
+        if normalized:
+            result["query"]["normalized"] = normalized
+        if offset + 1 < len(with_coordinates):
+            result["continue"] = {"cocontinue": str(offset + 1), "continue": "||"}
+
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_server(monkeypatch):
+    # bez čekání mezi opakovanými pokusy
+    monkeypatch.setattr(libs.CoordinatesResolver, "WIKI_API_DELAY_MIN", 0)
+    monkeypatch.setattr(libs.CoordinatesResolver, "WIKI_API_DELAY_MAX", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInApiHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.n_too_many = 0
+    server.url = "http://127.0.0.1:{}/w/api.php".format(server.server_address[1])
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_batches(api_server):
+    resolver = CoordinatesResolver(api_url=api_server.url, workers=2, rate=0, batch_size=2)
+    coordinates = resolver.resolve(["Svitava", "Brno", "Praha", "Sněžka", "Brno"])
+
+    assert coordinates == {title: COORDINATES[title] for title in ("Brno", "Sněžka", "Svitava")}
+    queried = [params["titles"].split("|") for params in api_server.requests if "cocontinue" not in params]
+    # každý název je dotazován jednou, v dávkách nejvýše po batch_size názvech
+    assert sorted(title for titles in queried for title in titles) == ["Brno", "Praha", "Sněžka", "Svitava"]
+    assert all(len(titles) <= 2 for titles in queried)
+    assert all(params["prop"] == "coordinates" for params in api_server.requests)
+
+
+def test_normalized(api_server):
+    resolver = CoordinatesResolver(api_url=api_server.url, rate=0)
+    coordinates = resolver.resolve(["brno", "Brno", "máchovo jezero"])
+
+    # souřadnice jsou vráceny pod zadanými (nenormalizovanými) názvy
+    assert coordinates == {
+        "brno": COORDINATES["Brno"],
+        "Brno": COORDINATES["Brno"],
+        "máchovo jezero": COORDINATES["Máchovo jezero"],
+    }
+
+
+def test_continue(api_server):
+    resolver = CoordinatesResolver(api_url=api_server.url, rate=0)
+    coordinates = resolver.resolve(COORDINATES)
+
+    assert coordinates == COORDINATES
+    # jedna dávka, souřadnice po jedné stránce v odpovědi
+    assert len(api_server.requests) == len(COORDINATES)
+    assert [params.get("cocontinue") for params in api_server.requests] == [None, "1", "2", "3"]
+
+
+def test_too_many_requests(api_server):
+    api_server.n_too_many = 2
+    resolver = CoordinatesResolver(api_url=api_server.url, rate=0, attempts=3)
+    assert resolver.resolve(["Brno"]) == {"Brno": COORDINATES["Brno"]}
+    assert len(api_server.requests) == 3
+
+
+def test_too_many_requests_attempts_exceeded(api_server):
+    api_server.n_too_many = 3
+    resolver = CoordinatesResolver(api_url=api_server.url, rate=0, attempts=3)
+    assert resolver.resolve(["Brno"]) == {}
+    assert len(api_server.requests) == 3
+
+
+def test_resolve_coordinates(api_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    wiki_extract = WikiExtract()
+    wiki_extract.console_args = argparse.Namespace(api_url=api_server.url, api_workers=2, api_rate=0)
+    wiki_extract.create_head_kb()
+    head = ColumnarKB.parse_head("HEAD-KB")
+
+    def serialize(ent_type, **values):
+        values = dict(ID="0000000001", TYPE=ent_type, **values)
+        # řádky KB z wiki_cs_extract.py neobsahují sloupce se statistikami
+        return "\t".join(
+            values.get(column.name, "") for column in head[ent_type] if column.name not in HEAD_KB_STATS
+        )
+
+    serialized_entities = [
+        serialize("settlement", NAME="Brno", ORIGINAL_WIKINAME="Brno", POPULATION="380000"),
+        serialize("geo:relief", NAME="Sněžka", ORIGINAL_WIKINAME="Sněžka", LATITUDE="50.7"),
+        serialize("watercourse", NAME="Svitava", ORIGINAL_WIKINAME="Svitava", LATITUDE="49.1", LONGITUDE="16.1"),
+        serialize("waterarea", NAME="Jezero", ORIGINAL_WIKINAME="Jezero"),
+        serialize("person", NAME="Karel Novák", ORIGINAL_WIKINAME="Karel Novák"),
+        "",
+    ]
+    resolved = wiki_extract.resolve_coordinates(serialized_entities)
+
+    assert resolved == [
+        # chybějící souřadnice jsou doplněny
+        serialize(
+            "settlement",
+            NAME="Brno",
+            ORIGINAL_WIKINAME="Brno",
+            POPULATION="380000",
+            LATITUDE="49.195",
+            LONGITUDE="16.608",
+        ),
+        # vyplněná souřadnice je zachována, doplněna je jen chybějící
+        serialize("geo:relief", NAME="Sněžka", ORIGINAL_WIKINAME="Sněžka", LATITUDE="50.7", LONGITUDE="15.74"),
+        # entity se souřadnicemi, bez souřadnic v API a bez sloupců souřadnic zůstávají beze změny
+        serialized_entities[2],
+        serialized_entities[3],
+        serialized_entities[4],
+        "",
+    ]
+    # dotazovány jsou jen entity, jimž některá souřadnice chybí
+    queried = {title for params in api_server.requests for title in params["titles"].split("|")}
+    assert queried == {"Brno", "Sněžka", "Jezero"}
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Regresní testy třídy 'DateParser' - výsledky se porovnávají s výstupy původní kaskády re.sub volání
+(EntPerson._convert_date a převod šablon v EntPerson.get_first_sentence před zavedením DateParser).
+
+Poznámky:
+- korpus tests/data/dates.tsv obsahuje reálné zápisy dat z infoboxů a náhodné kombinace jejich částí (měsíce,
+  staletí, rozsahy, šablony, př. n. l., poznámky apod.); hodnoty jsou uloženy jako řetězce JSON (vstupy obsahují
+  i tabulátory)
+- sloupce: vstup, datum narození, datum úmrtí, text po převodu šablon s daty
+"""
+
+import json
+import os
+
+import pytest
+
+from libs.DateParser import DateParser
+
+
+def load_corpus(fpath):
+    with open(fpath, "r", encoding="utf-8") as fl:
+        next(fl)  # hlavička
+        return [tuple(json.loads(value) for value in line.rstrip("\n").split("\t")) for line in fl]
+
+
+@pytest.fixture(scope="module")
+def corpus(data_dir):
+    return load_corpus(os.path.join(data_dir, "dates.tsv"))
+
+
+def test_corpus_is_not_trivial(corpus):
+    assert len(corpus) >= 1000
+    assert sum(1 for _, birth, _, _ in corpus if birth) > len(corpus) // 2
+
+
+@pytest.mark.parametrize(
+    "i_expected, parse",
+    [
+        (1, lambda text: DateParser.parse(text, True)),
+        (2, lambda text: DateParser.parse(text, False)),
+        (3, DateParser.parse_templates),
+    ],
+    ids=["birth", "death", "templates"],
+)
+def test_corpus(corpus, i_expected, parse):
+    diffs = []
+    for row in corpus:
+        result = parse(row[0])
+        if result != row[i_expected]:
+            diffs.append((row[0], row[i_expected], result))
+    assert diffs == []
+
+
+@pytest.mark.parametrize(
+    "text, is_birth, expected",
+    [
+        ("15. ledna 1900", True, "1900-01-15"),
+        ("{{Datum narození|1900|1|15}}", True, "1900-01-15"),
+        ("{{JULGREGDATUM|3|3|1700}}", False, "1700-03-03"),
+        ("44 př. n. l.", True, "-0043-??-??"),
+        ("neznámo", True, ""),
+    ],
+)
+def test_parse_examples(text, is_birth, expected):
+    assert DateParser.parse(text, is_birth) == expected
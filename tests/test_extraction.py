@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Regresní test extrakce - znalostní báze vytvořená skriptem wiki_cs_extract.py z malého testovacího dumpu se porovnává
+s referenční KB vytvořenou původní verzí projektu.
+
+Poznámky:
+- testovací dump tests/data/cswiki-20260101-pages-articles.xml obsahuje osoby, země, sídla, vodní toky a plochy
+  a geografické entity (včetně zápisů nadmořské výšky, nezlomitelných mezer, nejednoznačných dat apod.) a osobu
+  rozpoznatelnou jen podle typu infoboxu (typy infoboxů osob se zjišťují ze šablon v dumpu)
+- referenční KB tests/data/kb_cs-20260101 - případné změny výstupu musí být záměrné (a referenční KB aktualizována)
+- pořadí alternativních jmen a přesměrování vychází z iterace přes množinu, proto se porovnává bez ohledu na něj
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DUMP_VERSION = "20260101"
+# sloupce KB společné pro všechny typy entit, jejichž hodnoty jsou seznamy bez daného pořadí
+UNORDERED_COLUMNS = (3, 4)  # ALIASES, REDIRECTS
+
+
+def normalize(line):
+    columns = line.rstrip("\n").split("\t")
+    for idx in UNORDERED_COLUMNS:
+        if idx < len(columns):
+            columns[idx] = "|".join(sorted(columns[idx].split("|")))
+    return columns
+
+
+def read_kb(fpath):
+    with open(fpath, "r", encoding="utf-8") as fl:
+        return [normalize(line) for line in fl]
+
+
+def run_extraction(data_dir, cwd, *args, start_method=None):
+    """
+    Spustí wiki_cs_extract.py nad testovacím dumpem; start_method - metoda vytváření pracovních procesů
+    (multiprocessing.set_start_method, None pro výchozí). Vrací chybový výstup (str).
+    """
+    shutil.copy(os.path.join(ROOT_DIR, "person_infoboxes"), cwd)
+    argv = ["-I", data_dir, "-d", DUMP_VERSION, "--no-api", *args]
+    if start_method is None:
+        cmd = [sys.executable, os.path.join(ROOT_DIR, "wiki_cs_extract.py"), *argv]
+    else:
+        # skript je spuštěn jako __main__ (runpy), aby procesy spawn / forkserver našly funkce pracovních procesů
+        cmd = [
+            sys.executable,
+            "-c",
+            "import multiprocessing, runpy, sys\n"
+            "sys.path.insert(0, {root!r})\n"
+            "multiprocessing.set_start_method({method!r})\n"
+            "sys.argv[0] = {script!r}\n"
+            "runpy.run_path({script!r}, run_name='__main__')".format(
+                root=ROOT_DIR,
+                method=start_method,
+                script=os.path.join(ROOT_DIR, "wiki_cs_extract.py"),
+            ),
+            *argv,
+        ]
+    process = subprocess.run(
+        cmd,
+        cwd=cwd,
+        env=dict(os.environ, PYTHONHASHSEED="0"),
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+    )
+    return process.stderr
+
+
+def test_kb_matches_reference(data_dir, tmp_path):
+    run_extraction(data_dir, tmp_path, "-m", "1")
+
+    expected = read_kb(os.path.join(data_dir, "kb_cs-{}".format(DUMP_VERSION)))
+    assert read_kb(os.path.join(tmp_path, "kb_cs")) == expected
+
+
+def test_workers_spawn(data_dir, tmp_path):
+    stderr = run_extraction(data_dir, tmp_path, "-m", "2", "--cache-size", "100", start_method="spawn")
+
+    # nastavení z argumentů platí i v pracovních procesech
+    cache_stats = [line for line in stderr.splitlines() if "cache EntCore._clean_redundant_text" in line]
+    assert len(cache_stats) == 2
+    assert all(line.endswith("/100") for line in cache_stats)
+    # osoby rozpoznávané podle typu infoboxu (např. "Václav Král") - typy infoboxů jsou známy i pracovním procesům;
+    # identifikátory entit jsou odvozeny z čítače v rámci procesu, proto se neporovnávají
+    expected = read_kb(os.path.join(data_dir, "kb_cs-{}".format(DUMP_VERSION)))
+    extracted = read_kb(os.path.join(tmp_path, "kb_cs"))
+    assert sorted(columns[1:] for columns in extracted) == sorted(columns[1:] for columns in expected)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Testy převodu KB do generického formátu (kbwiki2gkb.py) - prázdný vstup a prázdné řádky na vstupu.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ent_registry import get_types
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KB_LINES = [
+    "0000000001\tperson\tKarel Novák\t\t\tKarel Novák byl český herec.\tKarel Novák\t\thttps://cs.wikipedia.org/wiki/Karel_Novák\tM\n",
+    "0000000002\tsettlement\tBrno\tBrünn#lang=orig\tBrünn\tBrno je město.\tBrno\t\thttps://cs.wikipedia.org/wiki/Brno\tČesko\t\t\t230,18\t380000\n",
+]
+
+
+@pytest.fixture
+def in_dir(tmp_path):
+    with open(tmp_path / "HEAD-KB", "w", encoding="utf-8") as fl:
+        for ent_type in get_types():
+            fl.writelines(ent_type.head_kb_lines())
+    with open(tmp_path / "VERSION", "w", encoding="utf-8") as fl:
+        fl.write("cs_20260101-1")
+    return tmp_path
+
+
+def convert(in_dir, kb_data, *args):
+    """
+    Převede KB předanou na standardní vstup; vrací výstupní KB (str).
+    """
+    process = subprocess.run(
+        [sys.executable, os.path.join(ROOT_DIR, "kbwiki2gkb.py"), "--indir", str(in_dir)]
+        + ["--inkb", "-", "--outkb", "-"]
+        + list(args),
+        input=kb_data,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        encoding="utf-8",
+    )
+    return process.stdout
+
+
+@pytest.mark.parametrize("args", [[], ["-m", "2"]])
+def test_empty_input(in_dir, args):
+    out_kb = convert(in_dir, "", *args)
+    # výstupem je jen hlavička KB (verze a popis sloupců)
+    full_kb = convert(in_dir, "".join(KB_LINES), *args)
+    assert out_kb
+    assert full_kb.startswith(out_kb)
+    assert len(full_kb.splitlines()) == len(out_kb.splitlines()) + len(KB_LINES)
+
+
+@pytest.mark.parametrize("args", [[], ["-m", "2"]])
+def test_empty_lines(in_dir, args):
+    expected = convert(in_dir, "".join(KB_LINES), *args)
+    assert convert(in_dir, "\n" + "\n".join(line.rstrip("\n") for line in KB_LINES) + "\n\n", *args) == expected
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Testy třídy 'MultistreamReader' nad malým vygenerovaným multistream dumpem (proudy bz2 a index ve formátu Wikimedia).
+"""
+
+import bz2
+from xml.sax.saxutils import escape
+
+import pytest
+
+from libs.MultistreamReader import MultistreamReader
+
+
+DUMP_HEAD = '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" version="0.10" xml:lang="cs">\n'
+PAGES_PER_STREAM = 2
+# názvy se znaky, jež jsou v XML dumpu i v indexu zapsány jako entity
+TITLES = [
+    "Brno",
+    "Tom & Jerry",
+    'Pat "a" Mat',
+    "Rock'n'roll",
+    "Šablona:Infobox - osoba",
+    "Praha",
+    "A&amp;B",
+]
+
+
+def page_xml(page_id, title):
+    return (
+        "  <page>\n"
+        "    <title>{}</title>\n"
+        "    <ns>{}</ns>\n"
+        "    <id>{}</id>\n"
+        "    <revision>\n"
+        "      <id>{}</id>\n"
+        '      <text xml:space="preserve">{}</text>\n'
+        "    </revision>\n"
+        "  </page>\n"
+    ).format(
+        escape(title, {'"': "&quot;"}),
+        10 if title.startswith("Šablona:") else 0,
+        page_id,
+        1000 + page_id,
+        escape("Text stránky " + title),
+    )
+
+
+def index_title(title):
+    # Wikimedia zapisuje názvy do indexu s entitami &amp;, &quot; a &#039;
+    return escape(title, {'"': "&quot;", "'": "&#039;"})
+
+
+@pytest.fixture
+def multistream(tmp_path):
+    dump_fpath = str(tmp_path / "cswiki-20260101-pages-articles-multistream.xml.bz2")
+    index_fpath = str(tmp_path / "cswiki-20260101-pages-articles-multistream-index.txt.bz2")
+    index = []
+    with open(dump_fpath, "wb") as fout:
+        fout.write(bz2.compress(DUMP_HEAD.encode("utf-8")))
+        for i_page in range(0, len(TITLES), PAGES_PER_STREAM):
+            offset = fout.tell()
+            stream = []
+            for page_id, title in enumerate(TITLES[i_page : i_page + PAGES_PER_STREAM], start=i_page + 1):
+                stream.append(page_xml(page_id, title))
+                index.append("{}:{}:{}\n".format(offset, page_id, index_title(title)))
+            fout.write(bz2.compress("".join(stream).encode("utf-8")))
+        fout.write(bz2.compress(b"</mediawiki>\n"))
+    with bz2.open(index_fpath, "wt", encoding="utf-8") as fout:
+        fout.writelines(index)
+    return MultistreamReader(dump_fpath, index_fpath)
+
+
+def test_read(multistream):
+    wanted = ["Praha", "Brno", "Šablona:Infobox - osoba"]
+    pages = list(multistream.read(wanted))
+
+    # stránky jsou vráceny v pořadí dumpu
+    assert [page.title for page in pages] == ["Brno", "Šablona:Infobox - osoba", "Praha"]
+    assert [page.id for page in pages] == [1, 5, 6]
+    assert pages[1].ns == 10
+    assert pages[0].text == "Text stránky Brno"
+    assert multistream.missing == set()
+    assert multistream.n_streams == 2
+
+
+@pytest.mark.parametrize("title", ["Tom & Jerry", 'Pat "a" Mat', "Rock'n'roll", "A&amp;B"])
+def test_escaped_titles(multistream, title):
+    pages = list(multistream.read([title]))
+
+    assert [page.title for page in pages] == [title]
+    assert pages[0].text == "Text stránky " + title
+    assert multistream.missing == set()
+
+
+def test_missing(multistream):
+    pages = list(multistream.read(["Brno", "Ostrava", "Tom &amp; Jerry"]))
+
+    assert [page.title for page in pages] == ["Brno"]
+    assert multistream.missing == {"Ostrava", "Tom &amp; Jerry"}
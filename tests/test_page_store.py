@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Testy třídy 'PageStore' - umístění dočasného úložiště stránek.
+"""
+
+import argparse
+import os
+
+from libs.PageReader import Page
+from libs.PageStore import PageStore
+from wiki_cs_extract import WikiExtract
+
+
+def test_temporary_store_in_tmp_dir(tmp_path):
+    store = PageStore(tmp_dir=str(tmp_path))
+    span = store.append(Page(0, "Brno", False, "Brno je statutární město.", 1))
+    store.finish()
+
+    assert os.path.dirname(store.fpath) == str(tmp_path)
+    assert store.get(*span) == "Brno je statutární město."
+    store.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_store_tmpdir_defaults_to_kb_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    wiki_extract = WikiExtract()
+
+    wiki_extract.console_args = argparse.Namespace(store_tmpdir=None, kb=str(tmp_path / "out" / "kb_cs"))
+    assert wiki_extract.get_store_tmpdir() == str(tmp_path / "out")
+    wiki_extract.console_args = argparse.Namespace(store_tmpdir=None, kb="-")
+    assert wiki_extract.get_store_tmpdir() == str(tmp_path)
+    wiki_extract.console_args = argparse.Namespace(store_tmpdir="/data/tmp", kb="kb_cs")
+    assert wiki_extract.get_store_tmpdir() == "/data/tmp"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Testy třídy 'QuantityParser' - text v jednotném formátu a typovaná hodnota číselných údajů.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from libs.QuantityParser import EMPTY_QUANTITY, Quantity, QuantityParser
+
+
+@pytest.mark.parametrize(
+    "text, hectares, expected",
+    [
+        ("230,18 km²", False, Quantity("230,18", Decimal("230.18"))),
+        ("1 234.5<ref>x</ref>", False, Quantity("1234,5", Decimal("1234.5"))),
+        ("12,50", False, Quantity("12,50", Decimal("12.50"))),
+        ("150 ha", True, Quantity("1,5", Decimal("1.5"))),
+        ("0,15 ha", True, Quantity("0,0015", Decimal("0.0015"))),
+        ("{{formatnum:78871}}", False, EMPTY_QUANTITY),
+        ("neznámá", False, EMPTY_QUANTITY),
+    ],
+)
+def test_parse_decimal(text, hectares, expected):
+    assert QuantityParser.parse_decimal(text, hectares=hectares) == expected
+
+
+@pytest.mark.parametrize(
+    "text, uninhabited, expected",
+    [
+        ("380 000 (2020)", False, Quantity("380000", 380000)),
+        ("2 mil.", False, Quantity("2000000", 2000000)),
+        ("12 tis.", False, Quantity("12000", 12000)),
+        ("neobydleno", True, Quantity("0", 0)),
+        ("neobydleno", False, EMPTY_QUANTITY),
+    ],
+)
+def test_parse_count(text, uninhabited, expected):
+    assert QuantityParser.parse_count(text, uninhabited=uninhabited) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("12,50", Decimal("12.50")), ("1,5e-05", Decimal("0.000015")), ("", None), ("12 000", None), ("-5", None)],
+)
+def test_decimal_value(text, expected):
+    assert QuantityParser.decimal_value(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("1234567890123456789", 1234567890123456789), ("", None), ("12,5", None), ("-5", None)],
+)
+def test_count_value(text, expected):
+    assert QuantityParser.count_value(text) == expected
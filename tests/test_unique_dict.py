@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*
+
+"""
+Projekt: entity_kb_czech3 (https://knot.fit.vutbr.cz/wiki/index.php/Entity_kb_czech3)
+
+Popis souboru:
+Testy sémantiky konfliktů třídy 'UniqueDict' (hodnota "!!!") a třídy 'DictOfUniqueDict'.
+
+Poznámky:
+- ReferenceUniqueDict je původní implementace UniqueDict (před optimalizací); náhodné posloupnosti přiřazení musí
+  vést ke stejnému obsahu i pořadí klíčů
+"""
+
+import random
+
+import pytest
+
+from libs.DictOfUniqueDict import DictOfUniqueDict
+from libs.UniqueDict import KEY_LANG, LANG_ORIG, LANG_UNKNOWN, UniqueDict
+
+
+CONFLICT = UniqueDict.VALUE_CONFLICTED
+
+
+class ReferenceUniqueDict(dict):
+    VALUE_CONFLICTED = "!!!"
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            dict.__setitem__(self, key, value if value != "" else None)
+        elif self[key] in [None, ""] or (
+            key == KEY_LANG and self[key] in [LANG_ORIG, LANG_UNKNOWN]
+        ):
+            dict.__setitem__(self, key, value)
+        elif not value in [None, ""] and self[key] != value:
+            if key != KEY_LANG or value not in [LANG_ORIG, LANG_UNKNOWN]:
+                dict.__setitem__(self, key, self.VALUE_CONFLICTED)
+
+
+def assign(mapping, items):
+    for key, value in items:
+        mapping[key] = value
+    return mapping
+
+
+@pytest.mark.parametrize(
+    "items, expected",
+    [
+        # první přiřazení - prázdný řetězec je uložen jako None
+        ([("ntype", "")], {"ntype": None}),
+        ([("ntype", "nick")], {"ntype": "nick"}),
+        # prázdnou hodnotu nahradí jakákoli hodnota
+        ([("ntype", None), ("ntype", "nick")], {"ntype": "nick"}),
+        ([("ntype", ""), ("ntype", "")], {"ntype": ""}),
+        # stejná nebo prázdná nová hodnota nic nemění
+        ([("ntype", "nick"), ("ntype", "nick")], {"ntype": "nick"}),
+        ([("ntype", "nick"), ("ntype", None)], {"ntype": "nick"}),
+        ([("ntype", "nick"), ("ntype", "")], {"ntype": "nick"}),
+        # různé neprázdné hodnoty => konflikt, který již trvá
+        ([("ntype", "nick"), ("ntype", "quoted")], {"ntype": CONFLICT}),
+        ([("ntype", "nick"), ("ntype", "quoted"), ("ntype", "nick")], {"ntype": CONFLICT}),
+        ([("ntype", "nick"), ("ntype", "quoted"), ("ntype", None)], {"ntype": CONFLICT}),
+        # slabý jazyk (orig, ???) je nahrazen konkrétním jazykem a sám konkrétní jazyk nenahradí
+        ([(KEY_LANG, LANG_ORIG), (KEY_LANG, "cs")], {KEY_LANG: "cs"}),
+        ([(KEY_LANG, LANG_UNKNOWN), (KEY_LANG, "de")], {KEY_LANG: "de"}),
+        ([(KEY_LANG, "cs"), (KEY_LANG, LANG_ORIG)], {KEY_LANG: "cs"}),
+        ([(KEY_LANG, "cs"), (KEY_LANG, LANG_UNKNOWN)], {KEY_LANG: "cs"}),
+        ([(KEY_LANG, LANG_ORIG), (KEY_LANG, LANG_UNKNOWN)], {KEY_LANG: LANG_UNKNOWN}),
+        ([(KEY_LANG, "cs"), (KEY_LANG, "de")], {KEY_LANG: CONFLICT}),
+        # slabé hodnoty jazyka nejsou slabé pro ostatní klíče
+        ([("ntype", LANG_ORIG), ("ntype", "nick")], {"ntype": CONFLICT}),
+        ([("ntype", "nick"), ("ntype", LANG_UNKNOWN)], {"ntype": CONFLICT}),
+        # klíče jsou nezávislé
+        ([(KEY_LANG, "cs"), ("ntype", "nick"), (KEY_LANG, "de")], {KEY_LANG: CONFLICT, "ntype": "nick"}),
+    ],
+)
+def test_conflict_semantics(items, expected):
+    result = assign(UniqueDict(), items)
+    assert result == expected
+    assert result == assign(ReferenceUniqueDict(), items)
+
+
+def test_unhashable_values():
+    result = assign(UniqueDict(), [("images", ["a"]), ("images", ["a"]), ("images", {"b": 1})])
+    assert result == {"images": CONFLICT}
+    result = assign(UniqueDict(), [(KEY_LANG, ["cs"]), (KEY_LANG, LANG_ORIG)])
+    assert result == {KEY_LANG: ["cs"]}
+
+
+def test_random_sequences_match_reference():
+    rnd = random.Random(31)
+    keys = [KEY_LANG, "ntype", "x"]
+    values = [None, "", LANG_ORIG, LANG_UNKNOWN, "cs", "de", "nick", CONFLICT, ["cs"]]
+    for _ in range(20000):
+        items = [(rnd.choice(keys), rnd.choice(values)) for _ in range(rnd.randint(1, 6))]
+        result = assign(UniqueDict(), items)
+        reference = assign(ReferenceUniqueDict(), items)
+        assert list(result.items()) == list(reference.items()), items
+
+
+def test_dict_of_unique_dict():
+    aliases = DictOfUniqueDict()
+    aliases["Brno"][KEY_LANG] = LANG_ORIG
+    aliases["Brno"][KEY_LANG] = "cs"
+    aliases["Brünn"][KEY_LANG] = "de"
+    aliases["Brünn"][KEY_LANG] = "cs"
+    assert isinstance(aliases["Brno"], UniqueDict)
+    assert aliases == {"Brno": {KEY_LANG: "cs"}, "Brünn": {KEY_LANG: CONFLICT}}
+    # update nahrazuje vlastnosti celého aliasu (bez řešení konfliktů)
+    aliases.update({"Brünn": {KEY_LANG: "de"}})
+    assert aliases["Brünn"] == {KEY_LANG: "de"}
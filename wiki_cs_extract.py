@@ -17,14 +17,29 @@ Poznámky:
 
 import json
 import os
+import random
 import sys
 import argparse
 import datetime
 import time
-import xml.etree.cElementTree as CElTree
 
 from multiprocessing import Pool
-from itertools import repeat, tee
+from itertools import repeat
+from libs.ColumnarKB import ColumnarKB
+from libs.Gazetteer import Gazetteer
+from libs.CoordinatesResolver import (
+    DEFAULT_RATE,
+    DEFAULT_WORKERS,
+    WIKI_API_URL,
+    CoordinatesResolver,
+)
+from libs.LRUCache import DEFAULT_MAX_SIZE, LRUCache
+from libs.MultistreamReader import MultistreamReader
+from libs.PageReader import PageReader
+from libs.PageSlicer import slice_lead, slice_page
+from libs.PageStore import PageStore
+from libs.PageWatchdog import PageTimeout, time_budget
+from libs.TaskScheduler import TaskScheduler
 
 from ent_person import *
 from ent_country import *
@@ -32,10 +47,18 @@ from ent_settlement import *
 from ent_watercourse import *
 from ent_waterarea import *
 from ent_geo import *
+from ent_registry import ENTITY_TYPES, classify, get_types
 
 
 LANG_MAP = {"cz": "cs"}
 WIKI_LANG_FILE = "languages.json"
+# zpracovávané jmenné prostory stránek dumpu (0 - články, 10 - šablony kvůli typům infoboxů osob)
+PAGE_NAMESPACES = {0, 10}
+LANGMAP_PAGE_TITLE = "Seznam kódů ISO 639-2"
+PERSON_INFOBOXES_FILE = "person_infoboxes"
+DEFAULT_PAGE_TIMEOUT = 60  # časový limit zpracování jedné stránky (v sekundách)
+CLASSES_HEADER = "TITLE\tPAGE_ID\tTYPE\tLEVEL\tSUBTYPE"  # hlavička tabulky typů stránek (--classify-only)
+PAGE_BASE_COST = 2048  # odhad ceny zpracování stránky nezávislé na její velikosti (v bajtech obsahu stránky)
 LANG_TRANSFORMATIONS = {
     "aština": "ašsky",
     "ština": "sky",
@@ -51,17 +74,20 @@ class WikiExtract(object):
 
     Instanční atributy:
     console_args - jmenný prostor s argumenty zadanými v konzoli (Namespace)
-    entities - seznam entit, u nichž mají být získány údaje; prozatím nevyužito (dict)
+    stage - právě probíhající fáze zpracování stránky (str)
+    ent_titles - názvy stránek entit (list)
+    page_store - úložiště textů stránek entit (PageStore)
+    titles - názvy stránek vybraných ke zpracování; None pro všechny stránky (Optional[set])
 
     Metody:
-    create_head_kb() - vytváří hlavičkový soubor HEAD-KB
+    create_head_kb(ent_type_names) - vytváří hlavičkový soubor HEAD-KB
     del_knowledge_base(kb_name) - odstraní zadanou znalostní bázi
     parse_args() - parsuje argumenty zadané při spuštění skriptu
     parse_xml_dump() - parsuje XML dump Wikipedie, prochází jednotlivé stránky a vyhledává entity
 
     _get_url(title) - vygeneruje URL stránky
     _is_entity(title) - z názvu stránky určuje, zda stránka pojednává o entitě, či nikoliv
-    _load_entities() - načte entity ze složky, jež byla zadána jako argument při spuštění skriptu; prozatím nevyužito
+    _load_entities() - načte názvy stránek vybraných ke zpracování (zadané argumenty --titles a --titles-file)
     """
 
     def __init__(self):
@@ -71,34 +97,23 @@ class WikiExtract(object):
         self.console_args = None
         self.langmap = dict()
         self.redirects = dict()
-        # self.entities = dict()
+        self.stage = ""
+        self.ent_titles = []
+        self.page_store = None
+        self.titles = None
 
     @staticmethod
-    def create_head_kb():
+    def create_head_kb(ent_type_names=None):
         """
         Vytváří hlavičkový soubor HEAD-KB, který upřesňuje množinu záznamů znalostní báze.
-        """
-        entities = [
-            "<person>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tGENDER\t{e}DATE OF BIRTH\tPLACE OF BIRTH\t{e}DATE OF DEATH\tPLACE OF DEATH\t{m}JOBS\t{m}NATIONALITY\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<person:fictional>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tGENDER\t{e}DATE OF BIRTH\tPLACE OF BIRTH\t{e}DATE OF DEATH\tPLACE OF DEATH\t{m}JOBS\t{m}NATIONALITY\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<person:group>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tGENDER\t{e}DATE OF BIRTH\tPLACE OF BIRTH\t{e}DATE OF DEATH\tPLACE OF DEATH\t{m}JOBS\t{m}NATIONALITY\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<country>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tLATITUDE\tLONGITUDE\tAREA\tPOPULATION\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<country:former>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tLATITUDE\tLONGITUDE\tAREA\tPOPULATION\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<settlement>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tCOUNTRY\tLATITUDE\tLONGITUDE\tAREA\tPOPULATION\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<watercourse>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\t{m}CONTINENT\tLATITUDE\tLONGITUDE\tLENGTH\tAREA\tSTREAMFLOW\tSOURCE_LOC\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<waterarea>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\t{m}CONTINENT\tLATITUDE\tLONGITUDE\tAREA\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<geo:relief>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\t{m}CONTINENT\tLATITUDE\tLONGITUDE\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<geo:waterfall>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\t{m}CONTINENT\tLATITUDE\tLONGITUDE\tTOTAL HEIGHT\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<geo:island>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\t{m}CONTINENT\tLATITUDE\tLONGITUDE\tAREA\tPOPULATION\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<geo:peninsula>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tLATITUDE\tLONGITUDE\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            "<geo:continent>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tLATITUDE\tLONGITUDE\tAREA\tPOPULATION\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            # <organisation>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tFOUNDED\tCANCELLED\tORGANIZATION TYPE\tLOCATION\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n",
-            # "<event>ID\tTYPE\tNAME\t{m}ALIASES\t{m}REDIRECTS\tSTART\tEND\tLOCATION\tDESCRIPTION\tORIGINAL_WIKINAME\t{gm[http://athena3.fit.vutbr.cz/kb/images/]}IMAGE\t{ui}WIKIPEDIA LINK\tWIKI BACKLINKS\tWIKI HITS\tWIKI PRIMARY SENSE\tSCORE WIKI\tSCORE METRICS\tCONFIDENCE\n"
-        ]
 
+        Parametry:
+        ent_type_names - názvy typů entit (viz ent_registry), jejichž schéma má HEAD-KB obsahovat; None pro všechny typy (Optional[Iterable[str]])
+        """
+        ent_types = get_types(ent_type_names)
         with open("HEAD-KB", "w", encoding="utf-8") as fl:
-            for entity in entities:
-                fl.write(entity)
+            for ent_type in ent_types:
+                fl.writelines(ent_type.head_kb_lines())
 
     @staticmethod
     def del_knowledge_base(kb_name):
@@ -166,31 +181,44 @@ class WikiExtract(object):
         # ostatní stránky mohou pojednávat o entitách
         return True
 
-    # def _load_entities(self):
-    #     """
-    #     Načte entity ze složky, jež byla zadána jako argument při spuštění skriptu.
-    #     """
-    #     try:
-    #         with open(self.console_args.dir + "people/wp_list") as fl:
-    #             self.entities["people"] = fl.read().splitlines()
-    #
-    #         with open(self.console_args.dir + "countries/wp_list") as fl:
-    #             self.entities["countries"] = fl.read().splitlines()
-    #
-    #         with open(self.console_args.dir + "settlements/wp_list") as fl:
-    #             self.entities["settlements"] = fl.read().splitlines()
-    #
-    #         with open(self.console_args.dir + "watercourses/wp_list") as fl:
-    #             self.entities["watercourses"] = fl.read().splitlines()
-    #
-    #         with open(self.console_args.dir + "waterareas/wp_list") as fl:
-    #             self.entities["waterareas"] = fl.read().splitlines()
-    #
-    #         with open(self.console_args.dir + "geos/wp_list") as fl:
-    #             self.entities["geos"] = fl.read().splitlines()
-    #     except FileNotFoundError:
-    #         print("[[ CHYBA ]] Zadaná složka s entitami je neplatná nebo některé soubory v ní neexistují")
-    #         exit(1)
+    def _load_entities(self):
+        """
+        Načte názvy stránek vybraných ke zpracování - zadané argumentem --titles a ze souborů zadaných argumentem
+        --titles-file (jeden název na řádek, prázdné řádky jsou vynechány; u tabulky TSV, např. z --classify-only,
+        se bere první sloupec a hlavička je vynechána).
+
+        Návratové hodnoty:
+        Množina názvů stránek, nebo None, nebyly-li stránky vybrány (zpracovávají se všechny stránky). (Optional[set])
+        """
+        if not self.console_args.titles and not self.console_args.titles_file:
+            return None
+
+        titles = set(self.console_args.titles or [])
+        for fpath in self.console_args.titles_file or []:
+            try:
+                with open(fpath, "r", encoding="utf-8") as fl:
+                    for line in fl:
+                        line = line.rstrip("\n")
+                        if line == CLASSES_HEADER:
+                            continue
+                        title = line.split("\t", 1)[0].strip()
+                        if title:
+                            titles.add(title)
+            except OSError:
+                print(f'File "{fpath}" with page titles was not found.', file=sys.stderr)
+                exit(1)
+        return titles
+
+    def get_store_tmpdir(self):
+        """
+        Vrací adresář dočasného úložiště stránek - zadaný, jinak adresář výstupní KB (pracovní adresář při výstupu
+        na standardní výstup), nikoliv adresář pro dočasné soubory systému (bývá v paměti).
+        """
+        if self.console_args.store_tmpdir:
+            return self.console_args.store_tmpdir
+        if self.console_args.kb == "-":
+            return os.getcwd()
+        return os.path.dirname(os.path.abspath(self.console_args.kb))
 
     def get_dump_fpath(self, dump_file, dump_file_mask):
         if dump_file is None:
@@ -257,6 +285,135 @@ class WikiExtract(object):
             type=str,
             help="Source file of wiki redirects dump.",
         )
+        parser.add_argument(
+            "--titles",
+            metavar="TITLE",
+            nargs="+",
+            help="Process only pages of given titles (read from multistream XML dump via its index, or from page store given by --from-store).",
+        )
+        parser.add_argument(
+            "--titles-file",
+            metavar="FILE",
+            action="append",
+            help="Process only pages of titles listed in given file (one title per line, or TSV with title in the first column like output of --classify-only; can be repeated and combined with --titles).",
+        )
+        parser.add_argument(
+            "--multistream",
+            action="store",
+            type=str,
+            help="Source file of multistream wiki pages dump for --titles and --titles-file (default: {lang}wiki-{dump}-pages-articles-multistream.xml.bz2).",
+        )
+        parser.add_argument(
+            "--multistream-index",
+            action="store",
+            type=str,
+            help="Index file of multistream wiki pages dump (default: {lang}wiki-{dump}-pages-articles-multistream-index.txt.bz2).",
+        )
+        parser.add_argument(
+            "--store-pages",
+            metavar="STORE",
+            type=str,
+            help="Also save pages needed for extraction (entity pages, person infobox templates and language map page) into page store file for later re-extraction without reading XML dump (see --from-store).",
+        )
+        parser.add_argument(
+            "--store-tmpdir",
+            metavar="DIR",
+            type=str,
+            help="Directory of temporary page store used without --store-pages - it holds texts of all processed pages, so it should be on disk rather than in tmpfs (default: directory of --kb output).",
+        )
+        parser.add_argument(
+            "--store-compress",
+            action="store_true",
+            help="Compress page store by blocks (requires zstandard).",
+        )
+        parser.add_argument(
+            "--from-store",
+            metavar="STORE",
+            type=str,
+            help="Read pages from page store file (created by --store-pages) instead of XML dump.",
+        )
+        parser.add_argument(
+            "--sample",
+            type=int,
+            help="Process only random sample of given number of entity pages (the same sample for the same pages).",
+        )
+        parser.add_argument(
+            "--kb",
+            default="kb_cs",
+            type=str,
+            help='Output KB file, "-" for standard output (e.g. to pipe it into kbwiki2gkb.py --inkb -; default: %(default)s).',
+        )
+        parser.add_argument(
+            "--columnar",
+            metavar="DIR",
+            type=str,
+            help="Also write KB in columnar typed format (Arrow IPC, one file per entity type) into given directory (requires pyarrow).",
+        )
+        parser.add_argument(
+            "--gazetteer",
+            metavar="FILE",
+            type=str,
+            help="Also write alias gazetteer (normalized names, aliases and redirects -> entity IDs with language and name type flags; memory-mappable binary) into given file.",
+        )
+        parser.add_argument(
+            "--cache-size",
+            default=DEFAULT_MAX_SIZE,
+            type=int,
+            help="Maximal number of memoized results per normalizing function and process (0 disables memoization; default: %(default)s).",
+        )
+        parser.add_argument(
+            "--types",
+            type=lambda types: [ent_type.strip() for ent_type in types.split(",")],
+            help="Extract only entities of given comma-separated types (e.g. person,settlement; default: all types - {}).".format(
+                ",".join(ENTITY_TYPES)
+            ),
+        )
+        parser.add_argument(
+            "--classify-only",
+            metavar="TSV",
+            type=str,
+            help="Only classify entity pages (without extraction of their data) and write table of page titles and IDs with entity types, levels and subtypes of classification into given file (usable by --titles-file as prefilter of later extraction).",
+        )
+        parser.add_argument(
+            "--full-page",
+            action="store_true",
+            help="Classify entities and extract their data from the full page (by default only from the lead section, category and image lines and the closing block of the page).",
+        )
+        parser.add_argument(
+            "--page-timeout",
+            default=DEFAULT_PAGE_TIMEOUT,
+            type=float,
+            help="Time limit for processing of one page in seconds - pages exceeding it are processed again in degraded mode (lead section only, without first sentence; 0 disables the limit; default: %(default)s).",
+        )
+        parser.add_argument(
+            "--stragglers",
+            default="stragglers.tsv",
+            type=str,
+            help="Output file with pages exceeding the time limit of processing, written only if there are any (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--no-api",
+            action="store_true",
+            help="Do not resolve missing coordinates of geographical entities via Wikipedia API.",
+        )
+        parser.add_argument(
+            "--api-url",
+            default=WIKI_API_URL,
+            type=str,
+            help="Wikipedia API URL for resolving missing coordinates (e.g. local stand-in server for testing; default: %(default)s).",
+        )
+        parser.add_argument(
+            "--api-workers",
+            default=DEFAULT_WORKERS,
+            type=int,
+            help="Maximal number of concurrent Wikipedia API requests (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--api-rate",
+            default=DEFAULT_RATE,
+            type=float,
+            help="Maximal number of Wikipedia API requests per second (default: %(default)s).",
+        )
         parser.add_argument(
             "--dev",
             action="store_true",
@@ -272,6 +429,14 @@ class WikiExtract(object):
         if self.console_args.m < 1:
             self.console_args.m = 1
 
+        if self.console_args.types is not None:
+            try:
+                get_types(self.console_args.types)
+            except ValueError as e:
+                parser.error(str(e))
+
+        LRUCache.set_max_size(self.console_args.cache_size)
+
         self.console_args.lang = self.console_args.lang.lower()
         if self.console_args.lang in LANG_MAP:
             self.console_args.lang = LANG_MAP[self.console_args.lang]
@@ -285,6 +450,13 @@ class WikiExtract(object):
         self.redirects_dump_fpath = self.get_dump_fpath(
             self.console_args.redirects, "redirects_from_{}wiki-{}-pages-articles.xml"
         )
+        self.multistream_dump_fpath = self.get_dump_fpath(
+            self.console_args.multistream, "{}wiki-{}-pages-articles-multistream.xml.bz2"
+        )
+        self.multistream_index_fpath = self.get_dump_fpath(
+            self.console_args.multistream_index,
+            "{}wiki-{}-pages-articles-multistream-index.txt.bz2",
+        )
         if self.console_args.dev:
             self.console_args._kb_stability = "dev"
         elif self.console_args.test:
@@ -292,15 +464,85 @@ class WikiExtract(object):
         else:
             self.console_args._kb_stability = ""
 
+    def parse_langmap(self, pg_languages):
+        """
+        Vytvoří mapování názvů jazyků na jejich kódy z tabulky stránky "Seznam kódů ISO 639-2" a uloží jej do souboru.
+
+        Parametry:
+        pg_languages - obsah stránky se seznamem kódů jazyků (str)
+        """
+        tbl_languages = re.search(r"{\|(.*?)\|}", pg_languages, flags=re.S)
+        if tbl_languages:
+            tbl_languages = tbl_languages.group(1)
+            tbl_lang_header = re.search(
+                r"^\s*!([^!]+(?:!![^!]+)+)$", tbl_languages, flags=re.M
+            )
+            if tbl_lang_header:
+                tbl_lang_header = tbl_lang_header.group(1).split("!!")
+                i_639_1 = tbl_lang_header.index("ISO 639-1")
+                i_639_2 = tbl_lang_header.index("ISO 639-2")
+                i_langname = tbl_lang_header.index("Název jazyka")
+
+                for lang_row in re.findall(
+                    r"^\s*\|(.+?(?:\|\|.+?)+)$", tbl_languages, flags=re.M
+                ):
+                    i_lang_col = None
+                    lang_cols = lang_row.split("||")
+                    langnames = re.sub(r"\(.*?\)", "", lang_cols[i_langname])
+                    if (
+                        lang_cols[i_639_1].strip()
+                        and lang_cols[i_639_1].strip() != "&nbsp;"
+                    ):
+                        i_lang_col = i_639_1
+                    else:
+                        i_lang_col = i_639_2
+
+                    for langnames2 in langnames.split(","):
+                        for langname in langnames2.split(" a "):
+                            langname_normalized = None
+                            langname = (
+                                re.sub(r"\[\[(.*?)\]\]", r"\1", langname)
+                                .strip()
+                                .lower()
+                            )
+                            if not langname:
+                                continue
+                            for langname in langname.split("|"):
+                                for (
+                                    suffix,
+                                    replacement,
+                                ) in LANG_TRANSFORMATIONS.items():
+                                    if langname.endswith(suffix):
+                                        langname_normalized = (
+                                            langname[: -len(suffix)]
+                                            + replacement
+                                        )
+                                        break
+
+                                lang_abbr = re.sub(
+                                    r"{{.*?}}", "", lang_cols[i_lang_col]
+                                ).strip()
+                                self.langmap[langname] = lang_abbr
+                                if langname_normalized:
+                                    self.langmap[langname_normalized] = lang_abbr
+
+                if len(self.langmap):
+                    self.langmap["krymskotatarština"] = "crh"
+                    with open(WIKI_LANG_FILE, "w", encoding="utf8") as f:
+                        json.dump(self.langmap, f, ensure_ascii=False)
+
     def parse_xml_dump(self):
         """
         Parsuje XML dump Wikipedie, prochází jednotlivé stránky a vyhledává entity.
 
         Poznámky:
-        - založeno na: http://effbot.org/zone/element-iterparse.htm
+        - stránky čte PageReader (parser expat) - jen ze zpracovávaných jmenných prostorů a bez přesměrování
+        - jsou-li vybrány stránky ke zpracování (--titles, --titles-file), čtou se jen tyto stránky - z úložiště
+          (--from-store), nebo z multistream dumpu (dekomprimovány jsou jen proudy obsahující vybrané stránky);
+          typy infoboxů osob se pak načtou z mezipaměti
         """
-        # # načtení entit
-        # self._load_entities()
+        # načtení názvů stránek vybraných ke zpracování
+        self.titles = self._load_entities()
 
         try:
             with open(self.redirects_dump_fpath, "r") as f:
@@ -310,7 +552,10 @@ class WikiExtract(object):
                         self.redirects[redirect_to] = set()
                     self.redirects[redirect_to].add(redirect_from)
         except OSError:
-            print(f'File "{self.redirects_dump_fpath}" was not found - skipping...')
+            print(
+                f'File "{self.redirects_dump_fpath}" was not found - skipping...',
+                file=sys.stderr,
+            )
 
         try:
             with open(WIKI_LANG_FILE, "r", encoding="utf8") as f:
@@ -321,149 +566,376 @@ class WikiExtract(object):
         except OSError:
             pass  # Do nothing - it does not matter, because in this case we generate new one
 
-        # parsování XML souboru
-        context = CElTree.iterparse(self.pages_dump_fpath, events=("start", "end"))
-
-        it_context_langmap, it_context_pages = tee(context)
-        event, root = next(it_context_langmap)
-
-        if len(self.langmap) == 0:
-            pg_languages = None
-            found_639_2 = False
-            for event, elem in it_context_langmap:
-                if event == "end" and "page" in elem.tag:
-                    for child in elem:
-                        if (
-                            "title" in child.tag
-                            and child.text == "Seznam kódů ISO 639-2"
-                        ):
-                            found_639_2 = True
-                        if found_639_2 and "revision" in child.tag:
-                            for grandchild in child:
-                                if "text" in grandchild.tag:
-                                    pg_languages = grandchild.text
-                                    break
-                            break
-                    if found_639_2:
-                        break
-            if found_639_2:
-                tbl_languages = re.search(r"{\|(.*?)\|}", pg_languages, flags=re.S)
-                if tbl_languages:
-                    tbl_languages = tbl_languages.group(1)
-                    tbl_lang_header = re.search(
-                        r"^\s*!([^!]+(?:!![^!]+)+)$", tbl_languages, flags=re.M
+        ent_titles = []
+        ent_ids = []
+        # texty stránek entit jsou ukládány do úložiště (UTF-8, mmap) - procesům se předává jen jejich pozice a délka
+        ent_spans = []
+        titles = self.titles
+        if titles is not None and len(self.langmap) == 0:
+            # mapování jazyků se vytváří ze stránky, jež mezi vybranými být nemusí
+            titles = titles | {LANGMAP_PAGE_TITLE}
+        titles_missing = set()
+        if self.console_args.from_store:
+            # stránky jsou čteny z dříve uloženého úložiště (bez čtení XML dumpu)
+            self.page_store = PageStore.open(self.console_args.from_store)
+            pages = self.page_store.iter_pages(titles)
+            if titles is not None:
+                titles_missing = {title for title in titles if title not in self.page_store}
+        elif titles is not None:
+            # vybrané stránky jsou čteny z multistream dumpu a ukládány do (zadaného) úložiště
+            self.page_store = PageStore(
+                self.console_args.store_pages,
+                compress=self.console_args.store_compress,
+                tmp_dir=self.get_store_tmpdir(),
+            )
+            multistream = MultistreamReader(
+                self.multistream_dump_fpath, self.multistream_index_fpath
+            )
+            pages = ((page, None) for page in multistream.read(titles))
+        else:
+            # do (zadaného) úložiště se ukládají stránky potřebné pro pozdější extrakci - stránky entit,
+            # šablony infoboxů osob a stránka mapování jazyků
+            self.page_store = PageStore(
+                self.console_args.store_pages,
+                compress=self.console_args.store_compress,
+                tmp_dir=self.get_store_tmpdir(),
+            )
+            # stránky mimo zpracovávané jmenné prostory a přesměrování jsou přeskočeny již při čtení dumpu (bez sestavení textu)
+            pages = (
+                (page, None)
+                for page in PageReader(
+                    self.pages_dump_fpath, namespaces=PAGE_NAMESPACES, skip_redirects=True
+                )
+            )
+        ib_types = set()
+        # mapování jazyků se (nebylo-li načteno ze souboru) vytváří v rámci téhož průchodu dumpem
+        is_langmap_missing = len(self.langmap) == 0
+        for page, span in pages:
+            et_full_title = page.title
+            if et_full_title == LANGMAP_PAGE_TITLE and page.text:
+                if span is None:
+                    self.page_store.append(page)
+                if is_langmap_missing:
+                    self.parse_langmap(page.text)
+                    is_langmap_missing = False
+
+            # na základě názvu stránky rozhodne, zda se jedná o entitu, či nikoliv
+            is_entity = self._is_entity(et_full_title)
+
+            # typy infoboxů osob se zjišťují ze šablon (nejsou entitami) v rámci téhož průchodu
+            if not is_entity and et_full_title.startswith("Šablona:"):
+                ib_type = EntPerson.get_infobox_type(et_full_title, page.text)
+                if ib_type:
+                    ib_types.add(ib_type)
+                    if span is None:
+                        self.page_store.append(page)
+            elif is_entity and page.text:
+                # přeskakuje stránky s přesměrováním a rozcestníkové stránky
+                if re.search(
+                    r"#(?:redirect|přesměruj)|{{\s*Rozcestník",
+                    page.text,
+                    flags=re.I,
+                ):
+                    print(
+                        "[{}] skipping {}".format(
+                            str(datetime.datetime.now().time()),
+                            et_full_title,
+                        ),
+                        file=sys.stderr,
+                        flush=True,
                     )
-                    if tbl_lang_header:
-                        tbl_lang_header = tbl_lang_header.group(1).split("!!")
-                        i_639_1 = tbl_lang_header.index("ISO 639-1")
-                        i_639_2 = tbl_lang_header.index("ISO 639-2")
-                        i_langname = tbl_lang_header.index("Název jazyka")
-
-                        for lang_row in re.findall(
-                            r"^\s*\|(.+?(?:\|\|.+?)+)$", tbl_languages, flags=re.M
-                        ):
-                            i_lang_col = None
-                            lang_cols = lang_row.split("||")
-                            langnames = re.sub(r"\(.*?\)", "", lang_cols[i_langname])
-                            if (
-                                lang_cols[i_639_1].strip()
-                                and lang_cols[i_639_1].strip() != "&nbsp;"
-                            ):
-                                i_lang_col = i_639_1
-                            else:
-                                i_lang_col = i_639_2
-
-                            for langnames2 in langnames.split(","):
-                                for langname in langnames2.split(" a "):
-                                    langname_normalized = None
-                                    langname = (
-                                        re.sub(r"\[\[(.*?)\]\]", r"\1", langname)
-                                        .strip()
-                                        .lower()
-                                    )
-                                    if not langname:
-                                        continue
-                                    for langname in langname.split("|"):
-                                        for (
-                                            suffix,
-                                            replacement,
-                                        ) in LANG_TRANSFORMATIONS.items():
-                                            if langname.endswith(suffix):
-                                                langname_normalized = (
-                                                    langname[: -len(suffix)]
-                                                    + replacement
-                                                )
-                                                break
-
-                                        lang_abbr = re.sub(
-                                            r"{{.*?}}", "", lang_cols[i_lang_col]
-                                        ).strip()
-                                        self.langmap[langname] = lang_abbr
-                                        if langname_normalized:
-                                            self.langmap[langname_normalized] = lang_abbr
-
-                        if len(self.langmap):
-                            self.langmap["krymskotatarština"] = "crh"
-                            with open(WIKI_LANG_FILE, "w", encoding="utf8") as f:
-                                json.dump(self.langmap, f, ensure_ascii=False)
+                    continue
+
+                ent_titles.append(et_full_title)
+                ent_ids.append(page.id)
+                ent_spans.append(span or self.page_store.append(page))
+
+        if titles is not None and not self.console_args.from_store:
+            titles_missing = multistream.missing
+            print(
+                "[{}] {} pages read from {} streams of multistream dump".format(
+                    str(datetime.datetime.now().time()),
+                    len(titles) - len(titles_missing),
+                    multistream.n_streams,
+                ),
+                file=sys.stderr,
+                flush=True,
+            )
+        for title in sorted(titles_missing - {LANGMAP_PAGE_TITLE}):
+            print(f'Page "{title}" was not found - skipping...', file=sys.stderr)
 
-        ent_titles = []
-        ent_pages = []
-        # context = CElTree.iterparse(self.pages_dump_fpath, events=("start", "end"))
-        event, root = next(it_context_pages)
-        for event, elem in it_context_pages:
-            if event == "end" and "page" in elem.tag:
-                is_entity = True
-                et_full_title = ""
-
-                for child in elem:
-                    # na základě názvu stránky rozhodne, zda se jedná o entitu, či nikoliv
-                    if "title" in child.tag:
-                        is_entity = self._is_entity(child.text)
-                        et_full_title = child.text
-
-                    # získá obsah stránky
-                    elif "revision" in child.tag:
-                        for grandchild in child:
-                            if "text" in grandchild.tag:
-                                if is_entity and grandchild.text:
-                                    # přeskakuje stránky s přesměrováním a rozcestníkové stránky
-                                    if re.search(
-                                        r"#(?:redirect|přesměruj)|{{\s*Rozcestník",
-                                        grandchild.text,
-                                        flags=re.I,
-                                    ):
-                                        print(
-                                            "[{}] skipping {}".format(
-                                                str(datetime.datetime.now().time()),
-                                                et_full_title,
-                                            ),
-                                            file=sys.stderr,
-                                            flush=True,
-                                        )
-                                        continue
+        self.set_person_infoboxes(ib_types)
+        self.page_store.finish()
 
-                                    ent_titles.append(et_full_title)
-                                    ent_pages.append(grandchild.text)
-                root.clear()
+        # zpracování jen náhodného vzorku stránek entit (např. pro ověření úpravy pravidel extrakce)
+        if self.console_args.sample and self.console_args.sample < len(ent_titles):
+            sample = sorted(
+                random.Random(0).sample(range(len(ent_titles)), self.console_args.sample)
+            )
+            ent_titles = [ent_titles[i] for i in sample]
+            ent_ids = [ent_ids[i] for i in sample]
+            ent_spans = [ent_spans[i] for i in sample]
+        self.ent_titles = ent_titles
 
         if len(ent_titles) > 0:
-            if self.console_args.m != 1:
-                pool = Pool(processes=self.console_args.m)
-                serialized_entities = pool.starmap(
-                    self.process_entity,
-                    zip(ent_titles, ent_pages),
-                )
-                pool.close()
-                pool.join()
+            try:
+                if self.console_args.m != 1:
+                    pool = Pool(
+                        processes=self.console_args.m,
+                        initializer=_init_worker,
+                        initargs=(self, LRUCache.max_size, EntPerson.ib_types),
+                    )
+                    # největší stránky jsou zpracovány nejdříve, malé stránky jsou sdružovány do dávek
+                    scheduler = TaskScheduler(pool, self.console_args.m)
+                    results = scheduler.map(
+                        _process_pages,
+                        [
+                            (i_title, offset, length)
+                            for i_title, (offset, length) in enumerate(ent_spans)
+                        ],
+                        [length + PAGE_BASE_COST for _, length in ent_spans],
+                    )
+                    pool.close()
+                    pool.join()
+                    print(
+                        "[{}] {} pages processed in {} batches by {} processes in {:.1f} s (utilization {:.1%})".format(
+                            str(datetime.datetime.now().time()),
+                            len(ent_titles),
+                            scheduler.n_batches,
+                            self.console_args.m,
+                            scheduler.wall_time,
+                            scheduler.utilization(),
+                        ),
+                        file=sys.stderr,
+                        flush=True,
+                    )
+                else:
+                    results = []
+                    for i_title, (offset, length) in enumerate(ent_spans):
+                        results.append(
+                            self.process_page(
+                                ent_titles[i_title], self.page_store.get(offset, length)
+                            )
+                        )
+                    LRUCache.log_stats()
+            finally:
+                self.page_store.close()
+            serialized_entities = [serialized for serialized, _ in results]
+            self.write_stragglers(
+                [straggler for _, stragglers in results for straggler in stragglers]
+            )
+            if self.console_args.classify_only:
+                self.write_classes(ent_ids, serialized_entities)
+                return
+            if not self.console_args.no_api:
+                serialized_entities = self.resolve_coordinates(serialized_entities)
+            if self.console_args.kb == "-":
+                sys.stdout.write("\n".join(filter(None, serialized_entities)))
+                sys.stdout.flush()
             else:
-                serialized_entities = []
-                for i, ent_title in enumerate(ent_titles):
-                    serialized_entities.append(self.process_entity(ent_title, ent_pages[i]))
-            with open("kb_cs", "a", encoding="utf-8") as fl:
-                fl.write("\n".join(filter(None, serialized_entities)))
+                with open(self.console_args.kb, "a", encoding="utf-8") as fl:
+                    fl.write("\n".join(filter(None, serialized_entities)))
+
+            if self.console_args.columnar:
+                counts = ColumnarKB.write(
+                    serialized_entities, "HEAD-KB", self.console_args.columnar
+                )
+                print(
+                    "[{}] columnar KB written to {}: {}".format(
+                        str(datetime.datetime.now().time()),
+                        self.console_args.columnar,
+                        ", ".join("{}={}".format(k, v) for k, v in counts.items()),
+                    ),
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+            if self.console_args.gazetteer:
+                counts = Gazetteer.build(
+                    serialized_entities, "HEAD-KB", self.console_args.gazetteer
+                )
+                print(
+                    "[{}] gazetteer written to {}: {}".format(
+                        str(datetime.datetime.now().time()),
+                        self.console_args.gazetteer,
+                        ", ".join("{}={}".format(k, v) for k, v in counts.items()),
+                    ),
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+    def write_classes(self, ent_ids, classes):
+        """
+        Zapíše typy stránek entit určené v režimu --classify-only do tabulky (TSV) - jen stránky, u nichž byl typ
+        (z vybraných typů) určen.
+
+        Parametry:
+        ent_ids - ID stránek entit v pořadí self.ent_titles (List[int])
+        classes - typy stránek v pořadí self.ent_titles - trojice (typ entity, úroveň určení typu, podtyp z určení typu), nebo None (List[Optional[Tuple[str, int, str]]])
+        """
+        counts = dict()
+        with open(self.console_args.classify_only, "w", encoding="utf-8") as f:
+            f.write(CLASSES_HEADER + "\n")
+            for title, page_id, classified in zip(self.ent_titles, ent_ids, classes):
+                if classified is None:
+                    continue
+                f.write("\t".join(map(str, (title, page_id) + tuple(classified))) + "\n")
+                counts[classified[0]] = counts.get(classified[0], 0) + 1
+        print(
+            '[{}] types of {} pages written to "{}": {}'.format(
+                str(datetime.datetime.now().time()),
+                sum(counts.values()),
+                self.console_args.classify_only,
+                ", ".join("{}={}".format(k, v) for k, v in counts.items()),
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def write_stragglers(self, stragglers):
+        """
+        Zapíše stránky, jejichž zpracování překročilo časový limit, do souboru (viz process_page).
+        Soubor vzniká jen tehdy, pokud nějaké takové stránky jsou - případný soubor z předchozího běhu je odstraněn, aby nebyl zaměněn za výsledek aktuálního běhu.
+
+        Parametry:
+        stragglers - záznamy o vypršení limitu - název stránky, fáze zpracování, režim, doba zpracování (List[Tuple[str, str, str, float]])
+        """
+        if not stragglers:
+            if os.path.isfile(self.console_args.stragglers):
+                os.remove(self.console_args.stragglers)
+            return
+        with open(self.console_args.stragglers, "w", encoding="utf-8") as f:
+            f.write("TITLE\tSTAGE\tMODE\tSECONDS\n")
+            for straggler in stragglers:
+                f.write("\t".join(map(str, straggler)) + "\n")
+        print(
+            '[{}] {} page timeouts (of {} pages) written to "{}"'.format(
+                str(datetime.datetime.now().time()),
+                len(stragglers),
+                len({straggler[0] for straggler in stragglers}),
+                self.console_args.stragglers,
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def resolve_coordinates(self, serialized_entities):
+        """
+        Doplní chybějící souřadnice geografických entit z API Wikipedie.
+
+        Parametry:
+        serialized_entities - serializované entity (List[str])
+
+        Návratové hodnoty:
+        Serializované entity s doplněnými souřadnicemi. (List[str])
+
+        Poznámky:
+        - dotazy probíhají souběžně až po zpracování všech entit (čekání na API neblokuje procesy zpracovávající entity)
+        - dotazuje se jen na entity, jimž souřadnice (z infoboxu) chybí
+        """
+        head = {
+            ent_type: [column.name for column in columns]
+            for ent_type, columns in ColumnarKB.parse_head("HEAD-KB").items()
+        }
+        i_type = next(iter(head.values())).index("TYPE")
+
+        missing = []
+        for i_entity, serialized in enumerate(serialized_entities):
+            if not serialized:
+                continue
+            values = serialized.split("\t")
+            columns = head.get(values[i_type])
+            if not columns or "LATITUDE" not in columns:
+                continue
+            i_lat = columns.index("LATITUDE")
+            i_long = columns.index("LONGITUDE")
+            if not values[i_lat] or not values[i_long]:
+                missing.append(
+                    (i_entity, values, columns.index("ORIGINAL_WIKINAME"), i_lat, i_long)
+                )
+        if not missing:
+            return serialized_entities
+
+        resolver = CoordinatesResolver(
+            api_url=self.console_args.api_url,
+            workers=self.console_args.api_workers,
+            rate=self.console_args.api_rate,
+        )
+        coordinates = resolver.resolve(values[i_title] for _, values, i_title, _, _ in missing)
+        print(
+            "[{}] coordinates resolved for {} of {} entities without coordinates".format(
+                str(datetime.datetime.now().time()), len(coordinates), len(missing)
+            ),
+            file=sys.stderr,
+            flush=True,
+        )
+
+        serialized_entities = list(serialized_entities)
+        for i_entity, values, i_title, i_lat, i_long in missing:
+            if values[i_title] not in coordinates:
+                continue
+            for i_col, column, value in zip(
+                (i_lat, i_long), ("LATITUDE", "LONGITUDE"), coordinates[values[i_title]]
+            ):
+                value = EntCore._unify_lat_long(latlong=value)
+                if values[i_col]:
+                    EntCore.report_inconsistence(
+                        values[i_title],
+                        values[i_type],
+                        column,
+                        values[i_col],
+                        value,
+                        origin=" (new value came from api)",
+                    )
+                else:
+                    values[i_col] = value
+            serialized_entities[i_entity] = "\t".join(values)
+        return serialized_entities
+
+    def process_page(self, et_full_title, page_content):
+        """
+        Zpracuje stránku s časovým limitem - při jeho vypršení zpracování zopakuje v omezeném režimu
+        (jen úvodní část stránky, bez zpracování první věty).
+
+        Parametry:
+        et_full_title - název stránky (str)
+        page_content - obsah stránky (str)
+
+        Návratové hodnoty:
+        Dvojice (serializovaná entita nebo None, záznamy o vypršení limitu - název stránky, fáze zpracování, režim, doba zpracování). (Tuple[Optional[str], List[Tuple[str, str, str, float]]])
+        """
+        stragglers = []
+        for degraded in (False, True):
+            time_start = time.time()
+            try:
+                with time_budget(self.console_args.page_timeout):
+                    return (
+                        self.process_entity(et_full_title, page_content, degraded),
+                        stragglers,
+                    )
+            except PageTimeout:
+                mode = "degraded" if degraded else "full"
+                stragglers.append(
+                    (et_full_title, self.stage, mode, round(time.time() - time_start, 3))
+                )
+                print(
+                    "[{}] page timeout: {} (stage: {}, mode: {}){}".format(
+                        str(datetime.datetime.now().time()),
+                        et_full_title,
+                        self.stage,
+                        mode,
+                        "" if degraded else " - retrying in degraded mode",
+                    ),
+                    file=sys.stderr,
+                    flush=True,
+                )
+        return None, stragglers
 
-    def process_entity(self, et_full_title, page_content):
+    def process_entity(self, et_full_title, page_content, degraded=False):
+        self.stage = "cleaning"
+        # v omezeném režimu se zpracovává jen úvodní část stránky (a kategorie)
+        if degraded:
+            page_content = slice_lead(page_content)
         # odstraňuje citace, reference a HTML poznámky
         print(
             "[{}] processing {}".format(
@@ -525,89 +997,39 @@ class WikiExtract(object):
         et_cont = re.sub(
             r"{\|(?!\s+class=(?:\"|')infobox(?:\"|')).*?\|}", "", et_cont, flags=re.S
         )
+        # určení typu i extrakce údajů probíhá jen nad částmi stránky, z nichž se údaje získávají
+        self.stage = "slicing"
+        if not self.console_args.full_page and not degraded:
+            et_cont = slice_page(et_cont)
         ent_redirects = self.redirects[et_full_title] if et_full_title in self.redirects else []
 
-        # stránka pojednává o osobě
-        if EntPerson.is_person(et_cont) >= 2:
-            et_url = self._get_url(et_full_title)
-            et_person = EntPerson(
-                et_full_title, "person", et_url, ent_redirects, self.langmap
-            )
-            return et_person.get_data(et_cont)
-
-        # stránka pojednává o státu
-        if EntCountry.is_country(et_cont):
-            et_url = self._get_url(et_full_title)
-            et_country = EntCountry(
-                et_full_title, "country", et_url, ent_redirects, self.langmap
-            )
-            return et_country.get_data(et_cont)
-
-        min_level = None
-        ent_type = None
-
-        # kontrola pojednávání o sídle
-        id_level, id_subtype = EntSettlement.is_settlement(et_full_title, et_cont)
-        if id_level:
-            ent_type = "settlement"
-            min_level = id_level
-
-        # kontrola pojednávání o vodním toku
-        id_level, tmp_subtype = EntWatercourse.is_watercourse(et_full_title, et_cont)
-        if id_level and (min_level == None or id_level < min_level):
-            ent_type = "watercourse"
-            min_level = id_level
-            id_subtype = tmp_subtype
-
-        # kontrola pojednávání o vodní ploše
-        id_level, tmp_subtype = EntWaterArea.is_water_area(et_full_title, et_cont)
-        if id_level and (min_level == None or id_level < min_level):
-            ent_type = "waterarea"
-            min_level = id_level
-            id_subtype = tmp_subtype
-
-        # kontrola pojednávání o geografické entitě
-        id_level, tmp_subtype = EntGeo.is_geo(et_full_title, et_cont)
-        if id_level and (min_level == None or id_level < min_level):
-            ent_type = "geo"
-            min_level = id_level
-            id_subtype = tmp_subtype
-
-        # stránka pojednává o sídle
-        if ent_type == "settlement":
-            et_url = self._get_url(et_full_title)
-            et_settlement = EntSettlement(
-                et_full_title, ent_type, et_url, ent_redirects, self.langmap
-            )
-            return et_settlement.get_data(et_cont)
-
-        # stránka pojednává o vodním toku
-        if ent_type == "watercourse":
-            et_url = self._get_url(et_full_title)
-            et_watercourse = EntWatercourse(
-                et_full_title, ent_type, et_url, ent_redirects, self.langmap
-            )
-            return et_watercourse.get_data(et_cont)
-
-        # stránka pojednává o vodní ploše
-        if ent_type == "waterarea":
-            et_url = self._get_url(et_full_title)
-            et_water_area = EntWaterArea(
-                et_full_title, ent_type, et_url, ent_redirects, self.langmap
-            )
-            return et_water_area.get_data(et_cont)
+        self.stage = "classification"
+        # typ entity se určuje podle registru typů (ent_registry) - jen dokud ho může ovlivnit některý z vybraných typů
+        classified = classify(et_full_title, et_cont, self.console_args.types)
+        if classified is None:
+            return None
+        ent_type, id_level, id_subtype = classified
+        # v režimu určení typu (--classify-only) se entita nevytváří ani se nezískávají její údaje
+        if self.console_args.classify_only:
+            return ent_type.name, id_level, id_subtype
+
+        et_url = self._get_url(et_full_title)
+        entity = ent_type.ent_class(
+            et_full_title, ent_type.name, et_url, ent_redirects, self.langmap
+        )
+        if ent_type.subtyped:
+            entity.set_entity_subtype(id_subtype)
+        self.stage = "extraction"
+        return entity.get_data(et_cont, first_sentence=not degraded)
 
-        # stránka pojednává o geografické entitě
-        if ent_type == "geo":
-            et_url = self._get_url(et_full_title)
-            et_geo = EntGeo(et_full_title, ent_type, et_url, ent_redirects, self.langmap)
-            et_geo.set_entity_subtype(id_subtype)
-            return et_geo.get_data(et_cont)
+    def get_dump_version(self):
+        """
+        Zjistí verzi zpracovávaného dumpu (z cíle symbolického odkazu na dump, jinak ze zadané verze).
 
-    def assign_version(self):
-        str_kb_stability = ""
-        if self.console_args._kb_stability:
-            str_kb_stability = f"-{self.console_args._kb_stability}"
+        Návratové hodnoty:
+        Verze dumpu (např. "20210101" nebo "latest"). (str)
+        """
+        dump_version = self.console_args.dump
         try:
             target = os.readlink(self.pages_dump_fpath)
             matches = re.search(self.console_args.lang + r"wiki-([0-9]{8})-", target)
@@ -622,24 +1044,85 @@ class WikiExtract(object):
                 if matches:
                     dump_version = matches[1]
             except OSError:
-                dump_version = self.console_args.dump
+                pass
+        return dump_version
+
+    def set_person_infoboxes(self, ib_types):
+        """
+        Nastaví typy infoboxů osob nalezené v dumpu a uloží je do mezipaměti pro danou verzi dumpu.
+        Nebyly-li v dumpu nalezeny (např. při zpracování jen části dumpu), načtou se z mezipaměti.
+
+        Parametry:
+        ib_types - typy infoboxů osob nalezené v dumpu (set)
+        """
+        dump_version = "{}_{}".format(self.console_args.lang, self.get_dump_version())
+        if ib_types:
+            EntPerson.ib_types = ib_types
+            EntPerson.save_infobox_types(PERSON_INFOBOXES_FILE, dump_version)
+            return
+
+        cached_version = EntPerson.load_infobox_types(PERSON_INFOBOXES_FILE)
+        if cached_version != dump_version:
+            print(
+                '[{}] person infoboxes not found in dump - using {} cached in "{}" (dump version: {})'.format(
+                    str(datetime.datetime.now().time()),
+                    len(EntPerson.ib_types),
+                    PERSON_INFOBOXES_FILE,
+                    cached_version or "unknown",
+                ),
+                file=sys.stderr,
+                flush=True,
+            )
+
+    def assign_version(self):
+        str_kb_stability = ""
+        if self.console_args._kb_stability:
+            str_kb_stability = f"-{self.console_args._kb_stability}"
         with open("VERSION", "w") as f:
             f.write(
                 "{}_{}-{}{}".format(
                     self.console_args.lang,
-                    dump_version,
+                    self.get_dump_version(),
                     int(round(time.time())),
                     str_kb_stability,
                 )
             )
 
 
+_worker_state = dict()
+
+
+def _init_worker(wiki_extract, cache_size, person_ib_types):
+    _worker_state["wiki_extract"] = wiki_extract
+    # nastavení z parse_args a typy infoboxů osob (viz set_person_infoboxes) se do procesů vytvořených metodou
+    # spawn / forkserver nepřenáší (moduly jsou importovány znovu)
+    LRUCache.set_max_size(cache_size)
+    EntPerson.ib_types = person_ib_types
+    LRUCache.log_stats_at_exit()
+
+
+def _process_pages(pages):
+    wiki_extract = _worker_state["wiki_extract"]
+    return [
+        wiki_extract.process_page(
+            wiki_extract.ent_titles[i_title], wiki_extract.page_store.get(offset, length)
+        )
+        for i_title, offset, length in pages
+    ]
+
+
 # hlavní část programu
 if __name__ == "__main__":
     wiki_extract = WikiExtract()
 
     wiki_extract.parse_args()
-    wiki_extract.create_head_kb()
-    wiki_extract.del_knowledge_base("kb_cs")
-    wiki_extract.parse_xml_dump()
+    wiki_extract.create_head_kb(wiki_extract.console_args.types)
+    # verze je přiřazena před extrakcí, aby byla k dispozici i při předávání KB rourou (--kb -)
     wiki_extract.assign_version()
+    # v režimu určení typu se znalostní báze nevytváří (ani neodstraňuje)
+    if (
+        wiki_extract.console_args.kb != "-"
+        and not wiki_extract.console_args.classify_only
+    ):
+        wiki_extract.del_knowledge_base(wiki_extract.console_args.kb)
+    wiki_extract.parse_xml_dump()